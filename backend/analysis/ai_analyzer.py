@@ -1,12 +1,22 @@
 import json
 import requests
-import numpy as np
+import threading
 from datetime import datetime
 from typing import Dict, List, Any, Optional
-from sentence_transformers import SentenceTransformer
-from sklearn.cluster import DBSCAN
-from sklearn.metrics.pairwise import cosine_similarity
-import os
+from storage.catalog import get_catalog
+from storage.document_store import get_document_store
+from api.events import get_event_bus
+from api.metrics import get_metrics
+from analysis.profiling import ProfileSession, StageProfiler
+from contextlib import nullcontext
+import time
+
+EMBED_SECONDS = get_metrics().histogram('embedding_encode_seconds', 'Time to embed one analysis batch')
+EMBED_ITEMS = get_metrics().counter('embedding_items_total', 'Texts embedded; divide by the encode time for throughput')
+CLUSTER_SECONDS = get_metrics().histogram('clustering_seconds', 'DBSCAN time per analysis')
+OLLAMA_SECONDS = get_metrics().histogram('ollama_request_seconds', 'Ollama generate request latency', ('model', 'status'))
+OLLAMA_TOKENS = get_metrics().counter('ollama_tokens_total', 'Tokens processed by Ollama', ('model', 'kind'))
+ANALYSIS_STAGE_SECONDS = get_metrics().histogram('analysis_stage_seconds', 'Time per analysis stage', ('stage',))
 
 class AIAnalyzer:
     def __init__(self, embedding_model='nomic-ai/nomic-embed-text-v1.5'):
@@ -14,20 +24,34 @@ class AIAnalyzer:
         self.embedding_model_name = embedding_model
         self.embedding_model = None
         self.ollama_base_url = 'http://localhost:11434'
+        self.events = get_event_bus()
+        self._model_lock = threading.Lock()
         
     def _load_embedding_model(self):
         """Lazy load the embedding model to avoid startup delays"""
-        if self.embedding_model is None:
-            try:
-                self.embedding_model = SentenceTransformer(
-                    self.embedding_model_name, 
-                    trust_remote_code=True
-                )
-                print(f"✅ Loaded embedding model: {self.embedding_model_name}")
-            except Exception as e:
-                print(f"Warning: Could not load embedding model {self.embedding_model_name}: {e}")
-                self.embedding_model = None
-        return self.embedding_model is not None
+        # The warm-up thread and a first analysis may race to load it
+        with self._model_lock:
+            if self.embedding_model is None:
+                try:
+                    # sentence_transformers pulls in torch; only pay for it once an analysis needs it
+                    from sentence_transformers import SentenceTransformer
+                    self.embedding_model = SentenceTransformer(
+                        self.embedding_model_name, 
+                        trust_remote_code=True
+                    )
+                    print(f"✅ Loaded embedding model: {self.embedding_model_name}")
+                except Exception as e:
+                    print(f"Warning: Could not load embedding model {self.embedding_model_name}: {e}")
+                    self.embedding_model = None
+            return self.embedding_model is not None
+    
+    def warm_up(self):
+        """Import the ML stack and load the embedding model in the background"""
+        def load():
+            self._load_embedding_model()
+            # sklearn takes about a second to import on its own
+            from sklearn.cluster import DBSCAN  # noqa: F401
+        threading.Thread(target=load, name='analysis-warmup', daemon=True).start()
 
     def extract_text_content(self, batch_data: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Extract all text from different sources into uniform format"""
@@ -118,8 +142,10 @@ class AIAnalyzer:
 
         return texts
 
-    def cluster_similar_content(self, texts: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    def cluster_similar_content(self, texts: List[Dict[str, Any]],
+                                profiler: StageProfiler = None) -> Dict[str, List[Dict[str, Any]]]:
         """Group similar content using embeddings + DBSCAN clustering"""
+        profiler = profiler or StageProfiler()
         if not texts:
             return {}
             
@@ -132,24 +158,32 @@ class AIAnalyzer:
             text_only = [t['text'] for t in texts]
             
             # Generate embeddings
-            embeddings = self.embedding_model.encode(text_only, show_progress_bar=False)
-            
-            # DBSCAN clustering with cosine distance
-            # eps=0.4 works well for text similarity, min_samples=2 for meaningful clusters
-            clustering = DBSCAN(eps=0.4, min_samples=2, metric='cosine')
-            labels = clustering.fit_predict(embeddings)
+            with profiler.stage('encode') as details, EMBED_SECONDS.time():
+                embeddings = self.embedding_model.encode(text_only, show_progress_bar=False)
+                details['items'] = len(text_only)
+            EMBED_ITEMS.inc(len(text_only))
             
-            # Group texts by cluster
-            clusters = {}
-            for idx, label in enumerate(labels):
-                if label == -1:  # Noise/outliers
-                    cluster_key = f"unique_{idx}"
-                else:
-                    cluster_key = f"cluster_{label}"
-                    
-                if cluster_key not in clusters:
-                    clusters[cluster_key] = []
-                clusters[cluster_key].append(texts[idx])
+            with profiler.stage('cluster') as details:
+                from sklearn.cluster import DBSCAN
+                
+                # DBSCAN clustering with cosine distance
+                # eps=0.4 works well for text similarity, min_samples=2 for meaningful clusters
+                clustering = DBSCAN(eps=0.4, min_samples=2, metric='cosine')
+                with CLUSTER_SECONDS.time():
+                    labels = clustering.fit_predict(embeddings)
+                
+                # Group texts by cluster
+                clusters = {}
+                for idx, label in enumerate(labels):
+                    if label == -1:  # Noise/outliers
+                        cluster_key = f"unique_{idx}"
+                    else:
+                        cluster_key = f"cluster_{label}"
+                        
+                    if cluster_key not in clusters:
+                        clusters[cluster_key] = []
+                    clusters[cluster_key].append(texts[idx])
+                details['clusters'] = len(clusters)
             
             return clusters
             
@@ -251,6 +285,8 @@ Analyze these patterns and return JSON:
 
 Focus on actionable opportunities and clear trends. Confidence should reflect how strong the evidence is."""
 
+        started = time.perf_counter()
+        status = 'error'
         try:
             # Call Ollama API
             response = requests.post(f'{self.ollama_base_url}/api/generate', 
@@ -264,8 +300,11 @@ Focus on actionable opportunities and clear trends. Confidence should reflect ho
                 timeout=120  # 2 minute timeout
             )
             
+            status = str(response.status_code)
             if response.status_code == 200:
                 result = response.json()
+                OLLAMA_TOKENS.inc(result.get('prompt_eval_count', 0), model=model_name, kind='prompt')
+                OLLAMA_TOKENS.inc(result.get('eval_count', 0), model=model_name, kind='completion')
                 analysis = json.loads(result['response'])
                 return analysis
             else:
@@ -277,6 +316,8 @@ Focus on actionable opportunities and clear trends. Confidence should reflect ho
         except Exception as e:
             print(f"Ollama analysis failed: {e}")
             return {"opportunities": [], "trends": [], "pain_points": [], "error": str(e)}
+        finally:
+            OLLAMA_SECONDS.observe(time.perf_counter() - started, model=model_name, status=status)
 
     def get_available_models(self) -> List[Dict[str, Any]]:
         """Get list of available Ollama models suitable for analysis"""
@@ -318,25 +359,51 @@ Focus on actionable opportunities and clear trends. Confidence should reflect ho
             print(f"Failed to get Ollama models: {e}")
             return []
 
-    def analyze_batch_file(self, filename: str, model_name: str = 'qwen2.5:14b') -> Dict[str, Any]:
-        """Complete analysis pipeline for a batch file"""
+    def _stage_finished(self, filename: str, stage: str, seconds: float, **details):
+        ANALYSIS_STAGE_SECONDS.observe(seconds, stage=stage)
+        self.events.publish(
+            'analysis_stage', filename=filename, stage=stage,
+            duration_s=round(seconds, 3), **details
+        )
+    
+    def analyze_batch_file(self, filename: str, model_name: str = 'qwen2.5:14b', profile: bool = False) -> Dict[str, Any]:
+        """Complete analysis pipeline for a batch file
+        
+        The saved stats break the run down by stage (time and memory). With
+        ``profile`` a cProfile dump and a memory snapshot are written next to
+        the analysis as well.
+        """
+        self.events.publish('analysis_started', filename=filename, model=model_name)
         try:
-            # Load batch file
-            filepath = f"data/{filename}"
-            if not os.path.exists(filepath):
-                raise Exception(f"File not found: {filename}")
-            
-            with open(filepath, 'r', encoding='utf-8') as f:
-                batch_data = json.load(f)
-            
-            # Run analysis pipeline
-            texts = self.extract_text_content(batch_data)
-            if not texts:
-                raise Exception("No text content found in batch file")
+            profiler = StageProfiler(
+                on_finish=lambda stage, seconds, details: self._stage_finished(filename, stage, seconds, **details),
+                trace_python=profile
+            )
+            with ProfileSession() if profile else nullcontext() as session:
+                # Load batch file
+                with profiler.stage('load'):
+                    store = get_document_store()
+                    if not store.exists(filename):
+                        raise Exception(f"File not found: {filename}")
+                    batch_data = store.read(filename)
+                
+                # Run analysis pipeline
+                with profiler.stage('extract') as details:
+                    texts = self.extract_text_content(batch_data)
+                    details['items'] = len(texts)
+                if not texts:
+                    raise Exception("No text content found in batch file")
                 
-            clusters = self.cluster_similar_content(texts)
-            summaries = self.summarize_clusters(clusters)
-            insights = self.analyze_with_ollama(summaries, model_name)
+                with profiler.stage('model_load'):
+                    self._load_embedding_model()
+                clusters = self.cluster_similar_content(texts, profiler)
+                
+                with profiler.stage('summarize') as details:
+                    summaries = self.summarize_clusters(clusters)
+                    details['summaries'] = len(summaries)
+                
+                with profiler.stage('llm'):
+                    insights = self.analyze_with_ollama(summaries, model_name)
             
             # Create analysis result
             analysis_result = {
@@ -347,7 +414,8 @@ Focus on actionable opportunities and clear trends. Confidence should reflect ho
                     'total_items': len(texts),
                     'clusters_found': len(clusters),
                     'meaningful_clusters': len(summaries),
-                    'sources': list(set(item['source'] for item in texts))
+                    'sources': list(set(item['source'] for item in texts)),
+                    **profiler.report()
                 },
                 'insights': insights
             }
@@ -356,9 +424,20 @@ Focus on actionable opportunities and clear trends. Confidence should reflect ho
             analysis_filename = filename.replace('.json', '_analysis.json')
             analysis_filepath = f"data/{analysis_filename}"
             
+            if session:
+                analysis_result['stats']['profile'] = session.write(analysis_filepath[:-len('.json')], profiler)
+            
             with open(analysis_filepath, 'w', encoding='utf-8') as f:
                 json.dump(analysis_result, f, indent=2, ensure_ascii=False)
+            get_catalog().record(analysis_filename)
+            if session:
+                for profile_filename in analysis_result['stats']['profile'].values():
+                    get_catalog().record(profile_filename)
             
+            self.events.publish(
+                'analysis_finished', filename=filename,
+                analysis_filename=analysis_filename, stats=analysis_result['stats']
+            )
             return {
                 'success': True,
                 'analysis': insights,
@@ -367,6 +446,7 @@ Focus on actionable opportunities and clear trends. Confidence should reflect ho
             }
             
         except Exception as e:
+            self.events.publish('analysis_failed', filename=filename, error=str(e))
             return {
                 'success': False,
                 'error': str(e),
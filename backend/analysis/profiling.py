@@ -0,0 +1,134 @@
+import cProfile
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Dict, List, Any, Iterator, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+PROFILE_TOP_FUNCTIONS = 40
+
+
+def current_rss_mb() -> Optional[float]:
+    """Resident set size right now; None where /proc is unavailable"""
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            pages = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return round(pages * os.sysconf('SC_PAGE_SIZE') / 1048576, 1)
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Highest resident set size the process has reached so far"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return round(peak / (1048576 if sys.platform == 'darwin' else 1024), 1)
+
+
+class StageProfiler:
+    """Wall time and process memory of each stage of one analysis run
+
+    Stages are flat and listed in the order they finish, so their seconds
+    add up to the run. ``trace_python`` also records each stage's peak of
+    Python allocations with tracemalloc (which must already be tracing); it
+    slows allocation-heavy code down, so only profile runs use it.
+    """
+
+    def __init__(self, on_finish: Callable[[str, float, Dict[str, Any]], None] = None, trace_python: bool = False):
+        self.on_finish = on_finish
+        self.trace_python = trace_python
+        self.stages: List[Dict[str, Any]] = []
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[Dict[str, Any]]:
+        """Time the block; counts the caller adds to the yielded dict are kept with the stage"""
+        details: Dict[str, Any] = {}
+        rss_before = current_rss_mb()
+        if self.trace_python:
+            tracemalloc.reset_peak()
+        started = time.perf_counter()
+        yield details
+        seconds = time.perf_counter() - started
+
+        rss_after = current_rss_mb()
+        entry = {
+            'stage': name,
+            'seconds': round(seconds, 3),
+            'rss_mb': rss_after,
+            'rss_delta_mb': round(rss_after - rss_before, 1) if rss_after is not None and rss_before is not None else None,
+            'peak_rss_mb': peak_rss_mb(),
+            **details
+        }
+        if self.trace_python:
+            entry['python_peak_mb'] = round(tracemalloc.get_traced_memory()[1] / 1048576, 1)
+        self.stages.append(entry)
+        if self.on_finish:
+            self.on_finish(name, seconds, details)
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            'duration_s': round(sum(stage['seconds'] for stage in self.stages), 3),
+            'peak_rss_mb': peak_rss_mb(),
+            'stages': self.stages
+        }
+
+
+class ProfileSession:
+    """cProfile and tracemalloc around one analysis run
+
+    Both are process-wide, so concurrent profile runs take turns.
+    """
+
+    _lock = threading.Lock()
+
+    def __enter__(self) -> 'ProfileSession':
+        self._lock.acquire()
+        tracemalloc.start()
+        self.profile = cProfile.Profile()
+        self.profile.enable()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            self.profile.disable()
+            tracemalloc.stop()
+        finally:
+            self._lock.release()
+
+    def write(self, prefix: str, profiler: StageProfiler) -> Dict[str, str]:
+        """Write ``<prefix>.prof`` (pstats) and ``<prefix>_profile.json`` (memory and hottest functions)"""
+        stats_path = f"{prefix}.prof"
+        snapshot_path = f"{prefix}_profile.json"
+        self.profile.dump_stats(stats_path)
+
+        stats = pstats.Stats(self.profile).sort_stats('cumulative')
+        top_functions = []
+        for func in stats.fcn_list[:PROFILE_TOP_FUNCTIONS]:
+            primitive_calls, calls, own_seconds, cumulative_seconds, _ = stats.stats[func]
+            top_functions.append({
+                'function': pstats.func_std_string(func),
+                'calls': calls,
+                'own_s': round(own_seconds, 4),
+                'cumulative_s': round(cumulative_seconds, 4)
+            })
+
+        with open(snapshot_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'created_at': datetime.now().isoformat(),
+                'rss_mb': current_rss_mb(),
+                **profiler.report(),
+                'top_functions': top_functions
+            }, f, indent=2)
+        return {'pstats': os.path.basename(stats_path), 'snapshot': os.path.basename(snapshot_path)}
@@ -0,0 +1,108 @@
+import gzip
+import hashlib
+import zlib
+from datetime import datetime, timezone
+from typing import Callable, Iterable, Iterator, Optional
+
+from flask import Response, request
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+COMPRESSIBLE_TYPES = {'application/json', 'text/plain'}
+MIN_COMPRESS_SIZE = 1024
+
+
+def make_etag(*parts) -> str:
+    """Entity tag from anything that changes with the representation (sent as a weak validator)"""
+    return hashlib.blake2b(repr(parts).encode('utf-8'), digest_size=12).hexdigest()
+
+
+def conditional(etag: str, last_modified: Optional[datetime], build: Callable[[], Response]):
+    """Answer 304 when the client's validators still match, otherwise build and tag the response
+
+    ``build`` is only called on a miss, so unchanged payloads are never re-serialised.
+    """
+    if last_modified is not None:
+        if last_modified.tzinfo is None:
+            last_modified = last_modified.astimezone(timezone.utc)
+        last_modified = last_modified.replace(microsecond=0)
+
+    if request.if_none_match:
+        not_modified = request.if_none_match.contains_weak(etag)
+    else:
+        since = request.if_modified_since
+        not_modified = bool(since and last_modified and last_modified <= since)
+
+    if not_modified:
+        response = Response(status=304)
+    else:
+        response = build()
+        if isinstance(response, tuple):
+            return response  # Errors are returned untagged
+    if response.status_code in (200, 304):
+        # Weak, because the body may be re-encoded (gzip/br) on the way out
+        response.set_etag(etag, weak=True)
+        if last_modified is not None:
+            response.last_modified = last_modified
+        # Cache, but revalidate on every use
+        response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+
+def _choose_encoding() -> Optional[str]:
+    accepted = request.accept_encodings
+    if brotli is not None and accepted['br']:
+        return 'br'
+    if accepted['gzip']:
+        return 'gzip'
+    return None
+
+
+def _compress_stream(chunks: Iterable[bytes], encoding: str) -> Iterator[bytes]:
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=5)
+        for chunk in chunks:
+            data = compressor.process(chunk)
+            if data:
+                yield data
+        yield compressor.finish()
+        return
+
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode('utf-8') if isinstance(chunk, str) else chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def compress_response(response: Response) -> Response:
+    """after_request hook: gzip/brotli-encode JSON bodies, streaming ones included"""
+    if (response.status_code < 200 or response.status_code in (204, 304)
+            or response.direct_passthrough
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE_TYPES):
+        return response
+
+    response.vary.add('Accept-Encoding')
+    encoding = _choose_encoding()
+    if encoding is None:
+        return response
+
+    if response.is_streamed:
+        response.response = _compress_stream(response.response, encoding)
+        response.headers.pop('Content-Length', None)
+    else:
+        body = response.get_data()
+        if len(body) < MIN_COMPRESS_SIZE:
+            return response
+        if encoding == 'br':
+            response.set_data(brotli.compress(body, quality=5))
+        else:
+            response.set_data(gzip.compress(body, compresslevel=6))
+
+    response.headers['Content-Encoding'] = encoding
+    return response
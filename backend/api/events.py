@@ -0,0 +1,167 @@
+import json
+import queue
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Dict, List, Any, Callable, Iterator, Optional
+
+
+class Subscription:
+    """One client's bounded queue of pending events"""
+
+    def __init__(self, bus: 'EventBus', max_pending: int):
+        self.bus = bus
+        self.queue = queue.Queue(maxsize=max_pending)
+        self.dropped = 0
+
+    def put(self, event: Dict[str, Any]):
+        try:
+            self.queue.put_nowait(event)
+        except queue.Full:
+            # A stalled client loses its oldest events rather than blocking publishers
+            try:
+                self.queue.get_nowait()
+            except queue.Empty:
+                pass
+            self.dropped += 1
+            self.queue.put_nowait(event)
+
+    def get(self, timeout: float) -> Optional[Dict[str, Any]]:
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        self.bus.unsubscribe(self)
+
+
+class EventBus:
+    """In-process publish/subscribe of state changes for the /api/events stream
+
+    Recent events are kept so a reconnecting client can resume from the
+    Last-Event-ID it last saw.
+    """
+
+    def __init__(self, history_size: int = 500, max_pending: int = 1000):
+        self.lock = threading.Lock()
+        self.subscribers: List[Subscription] = []
+        self.listeners: List[Callable[[Dict[str, Any]], None]] = []
+        self.history = deque(maxlen=history_size)
+        self.max_pending = max_pending
+        self.next_id = 1
+
+    def publish(self, event_type: str, **data) -> Dict[str, Any]:
+        with self.lock:
+            event = {
+                'id': self.next_id,
+                'type': event_type,
+                'timestamp': datetime.now().isoformat(),
+                'data': data
+            }
+            self.next_id += 1
+            self.history.append(event)
+            subscribers = list(self.subscribers)
+            listeners = list(self.listeners)
+        for subscription in subscribers:
+            subscription.put(event)
+        for listener in listeners:
+            # In-process consumers such as the job queue; one failing must not break publishing
+            try:
+                listener(event)
+            except Exception as e:
+                print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Event listener error: {str(e)}")
+        return event
+    
+    def add_listener(self, listener: Callable[[Dict[str, Any]], None]):
+        """Call ``listener`` synchronously with every published event"""
+        with self.lock:
+            self.listeners.append(listener)
+
+    def subscribe(self, last_event_id: int = None) -> Subscription:
+        subscription = Subscription(self, self.max_pending)
+        with self.lock:
+            if last_event_id is not None:
+                for event in self.history:
+                    if event['id'] > last_event_id:
+                        subscription.put(event)
+            self.subscribers.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self.lock:
+            if subscription in self.subscribers:
+                self.subscribers.remove(subscription)
+
+    def subscriber_count(self) -> int:
+        with self.lock:
+            return len(self.subscribers)
+
+
+def format_sse(event: Dict[str, Any]) -> str:
+    payload = json.dumps({'timestamp': event['timestamp'], **event['data']}, default=str)
+    return f"id: {event['id']}\nevent: {event['type']}\ndata: {payload}\n\n"
+
+
+def iter_sse(subscription: Subscription, heartbeat: float = 15, max_duration: float = None) -> Iterator[str]:
+    """Server-sent event frames for one subscriber, with comment heartbeats to keep proxies open"""
+    started = time.monotonic()
+    try:
+        # Tell EventSource how long to wait before reconnecting
+        yield "retry: 3000\n\n"
+        while max_duration is None or time.monotonic() - started < max_duration:
+            event = subscription.get(timeout=heartbeat)
+            yield format_sse(event) if event else ": keep-alive\n\n"
+    finally:
+        subscription.close()
+
+
+def persist_events(bus: EventBus, store):
+    """Copy every event published on ``bus`` into the shared state store (worker processes)"""
+    bus.add_listener(lambda event: store.add_event(event['type'], event['data'], event['timestamp']))
+
+
+class EventRelay:
+    """Republishes events that worker processes wrote to the state store on this process's bus
+
+    Lets the API process serve /api/events for work it no longer runs itself.
+    Only events written after the relay starts are forwarded.
+    """
+
+    def __init__(self, bus: EventBus, store, interval: float = 0.5):
+        self.bus = bus
+        self.store = store
+        self.interval = interval
+        self.last_id = store.last_event_id()
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def start(self):
+        self.thread = threading.Thread(target=self._loop, name='event-relay', daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+
+    def _loop(self):
+        while not self.stop_event.wait(self.interval):
+            try:
+                for event in self.store.events_after(self.last_id):
+                    self.last_id = event['id']
+                    self.bus.publish(event['type'], **event['data'])
+            except Exception as e:
+                print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Event relay error: {str(e)}")
+
+
+_bus = None
+_bus_lock = threading.Lock()
+
+
+def get_event_bus() -> EventBus:
+    """Return the process-wide event bus"""
+    global _bus
+    with _bus_lock:
+        if _bus is None:
+            _bus = EventBus()
+        return _bus
@@ -0,0 +1,323 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Any, Callable, Optional, Tuple
+
+from api.events import EventBus
+from storage.state_store import StateStore
+
+# A job action runs one kind of work for a target: action(target, params) -> result
+JobAction = Callable[[str, Dict[str, Any]], Any]
+
+
+class JobQueueFull(Exception):
+    pass
+
+
+class Job:
+    """One queued unit of work (a scrape run or an analysis) and what is known about its progress"""
+
+    ACTIVE = ('queued', 'running')
+
+    def __init__(self, kind: str, target: str, params: Dict[str, Any] = None):
+        self.id = uuid.uuid4().hex[:12]
+        self.kind = kind
+        self.target = target
+        self.params = params or {}
+        self.status = 'queued'
+        self.created_at = datetime.now()
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self.progress: Dict[str, Any] = {}
+        self.stages: List[Dict[str, Any]] = []
+        self.result = None
+        self.error: Optional[str] = None
+
+    @classmethod
+    def from_record(cls, record: Dict[str, Any]) -> 'Job':
+        """Rebuild a job from its row in the shared state store"""
+        job = cls(record['kind'], record['target'], record['params'])
+        job.id = record['id']
+        job.status = record['status']
+        job.created_at = datetime.fromisoformat(record['created_at'])
+        job.started_at = datetime.fromisoformat(record['started_at']) if record.get('started_at') else None
+        job.finished_at = datetime.fromisoformat(record['finished_at']) if record.get('finished_at') else None
+        job.progress = record.get('progress') or {}
+        job.stages = record.get('stages') or []
+        job.result = record.get('result')
+        job.error = record.get('error')
+        return job
+
+    @property
+    def key(self) -> Tuple[str, str]:
+        return (self.kind, self.target)
+
+    def watches(self, event: Dict[str, Any]) -> bool:
+        data = event['data']
+        if self.kind == 'analyze':
+            return event['type'].startswith('analysis_') and data.get('filename') == self.target
+        if event['type'] in ('scraper_started', 'scraper_progress'):
+            return self.kind == 'run_all' or data.get('scraper') == self.target
+        if event['type'] == 'scraper_finished':
+            return self.kind == 'run_all' or data['result'].get('scraper') == self.target
+        return False
+
+    def observe(self, event: Dict[str, Any]):
+        """Fold a progress event published by the scrapers or the analyzer into this job"""
+        data = event['data']
+        if event['type'] == 'analysis_stage':
+            details = {key: value for key, value in data.items() if key != 'filename'}
+            self.stages.append(details)
+            self.progress['stage'] = data['stage']
+        elif event['type'] in ('scraper_started', 'scraper_progress'):
+            self.progress.setdefault('scrapers', {})[data['scraper']] = {
+                'status': 'running',
+                'new_count': data.get('new_count', 0),
+                'skipped_count': data.get('skipped_count', 0)
+            }
+        elif event['type'] == 'scraper_finished':
+            result = data['result']
+            self.progress.setdefault('scrapers', {})[result['scraper']] = {
+                'status': result['status'],
+                'new_count': result.get('new_count', 0),
+                'skipped_count': result.get('skipped_count', 0)
+            }
+            self.stages.append({'stage': result['scraper'], 'duration_s': result.get('duration'),
+                                'status': result['status']})
+
+    def to_dict(self) -> Dict[str, Any]:
+        finished = self.finished_at or datetime.now()
+        return {
+            'id': self.id,
+            'kind': self.kind,
+            'target': self.target,
+            'params': self.params,
+            'status': self.status,
+            'created_at': self.created_at.isoformat(),
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+            'queued_s': round(((self.started_at or finished) - self.created_at).total_seconds(), 3),
+            'duration_s': round((finished - self.started_at).total_seconds(), 3) if self.started_at else None,
+            'progress': self.progress,
+            'stages': self.stages,
+            'result': self.result,
+            'error': self.error
+        }
+
+
+def build_job_actions(scraper_manager, ai_analyzer) -> Dict[str, JobAction]:
+    """The work behind each job kind, shared by the in-process queue and worker processes"""
+    return {
+        'run_all': lambda target, params: {"results": scraper_manager.run_all_scrapers()},
+        'run_scraper': lambda target, params: scraper_manager.run_single_scraper(target),
+        'analyze': lambda target, params: ai_analyzer.analyze_batch_file(
+            target, params.get('model', 'qwen2.5:14b'), profile=params.get('profile', False)
+        )
+    }
+
+
+def execute_job(action: JobAction, job: Job) -> Tuple[str, Any, Optional[str]]:
+    """Run a job's action and return its final (status, result, error)"""
+    try:
+        result = action(job.target, job.params)
+    except Exception as e:
+        return 'failed', None, str(e)
+    # The analyzer reports failure in its result rather than raising
+    if isinstance(result, dict) and result.get('success') is False:
+        return 'failed', result, result.get('error')
+    return 'succeeded', result, None
+
+
+class JobQueue:
+    """Runs long requests (scrapes, analyses) on a bounded worker pool instead of inside the request
+
+    Submitting work that is already queued or running for the same target
+    returns the existing job. At most ``max_queued`` jobs may wait for a
+    worker; finished jobs are kept for ``/api/jobs/<id>`` until
+    ``history_size`` newer ones push them out.
+    """
+
+    def __init__(self, events: EventBus, actions: Dict[str, JobAction], max_workers: int = 2,
+                 max_queued: int = 50, history_size: int = 200):
+        self.events = events
+        self.actions = actions
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='job')
+        self.max_queued = max_queued
+        self.history_size = history_size
+        self.lock = threading.Lock()
+        self.jobs: 'OrderedDict[str, Job]' = OrderedDict()
+        self.active: Dict[Tuple[str, str], Job] = {}
+        events.add_listener(self._on_event)
+
+    def submit(self, kind: str, target: str, params: Dict[str, Any] = None) -> Tuple[Job, bool]:
+        """Queue a job and return (job, created); created is False when an active job was reused"""
+        with self.lock:
+            existing = self.active.get((kind, target))
+            if existing:
+                return existing, False
+            queued = sum(1 for job in self.active.values() if job.status == 'queued')
+            if queued >= self.max_queued:
+                raise JobQueueFull(f"{queued} jobs are already waiting")
+
+            job = Job(kind, target, params)
+            self.jobs[job.id] = job
+            self.active[job.key] = job
+            self._trim()
+
+        self.events.publish('job_queued', job_id=job.id, kind=kind, target=target)
+        self.executor.submit(self._run, job)
+        return job, True
+
+    def _trim(self):
+        finished = [job_id for job_id, job in self.jobs.items() if job.status not in Job.ACTIVE]
+        for job_id in finished[:max(0, len(self.jobs) - self.history_size)]:
+            del self.jobs[job_id]
+
+    def _run(self, job: Job):
+        with self.lock:
+            job.status = 'running'
+            job.started_at = datetime.now()
+        self.events.publish('job_started', job_id=job.id, kind=job.kind, target=job.target)
+
+        status, result, error = execute_job(self.actions[job.kind], job)
+        with self.lock:
+            job.status, job.result, job.error = status, result, error
+            job.finished_at = datetime.now()
+            self.active.pop(job.key, None)
+        self.events.publish('job_finished', job_id=job.id, kind=job.kind, target=job.target,
+                                status=job.status, error=job.error)
+
+    def _on_event(self, event: Dict[str, Any]):
+        if event['type'].startswith('job_'):
+            return
+        with self.lock:
+            for job in self.active.values():
+                if job.status == 'running' and job.watches(event):
+                    job.observe(event)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self.lock:
+            job = self.jobs.get(job_id)
+            return job.to_dict() if job else None
+
+    def list(self, status: str = None) -> List[Dict[str, Any]]:
+        """Jobs newest first, without their (possibly large) results"""
+        with self.lock:
+            jobs = [job.to_dict() for job in reversed(self.jobs.values()) if status is None or job.status == status]
+        for job in jobs:
+            job.pop('result')
+        return jobs
+
+
+class SharedJobQueue:
+    """JobQueue interface over the shared state store, for an API process whose jobs run in workers
+
+    Jobs are only recorded here; ``worker.py`` processes claim and run them.
+    """
+
+    def __init__(self, store: StateStore, events: EventBus, max_queued: int = 50):
+        self.store = store
+        self.events = events
+        self.max_queued = max_queued
+
+    def submit(self, kind: str, target: str, params: Dict[str, Any] = None) -> Tuple[Job, bool]:
+        job = Job(kind, target, params)
+        try:
+            record = self.store.insert_job(job.to_dict(), self.max_queued)
+        except OverflowError as e:
+            raise JobQueueFull(str(e))
+        if record['id'] != job.id:
+            return Job.from_record(record), False
+        self.events.publish('job_queued', job_id=job.id, kind=kind, target=target)
+        return job, True
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        record = self.store.get_job(job_id)
+        return Job.from_record(record).to_dict() if record else None
+
+    def list(self, status: str = None) -> List[Dict[str, Any]]:
+        jobs = [Job.from_record(record).to_dict() for record in self.store.list_jobs(status)]
+        for job in jobs:
+            job.pop('result')
+        return jobs
+
+
+class JobWorker:
+    """Claims jobs from the shared state store and runs them in this process
+
+    ``poll()`` is called from the worker's main loop: it heartbeats the jobs
+    this worker is running, fails jobs whose worker stopped heartbeating,
+    and claims queued jobs up to ``concurrency``. Progress events seen on
+    the local bus are written back to the job rows as they arrive.
+    """
+
+    def __init__(self, store: StateStore, events: EventBus, actions: Dict[str, JobAction], worker_id: str,
+                 concurrency: int = 2, heartbeat_timeout: float = 60, history_size: int = 200):
+        self.store = store
+        self.events = events
+        self.actions = actions
+        self.worker_id = worker_id
+        self.concurrency = concurrency
+        self.heartbeat_timeout = heartbeat_timeout
+        self.history_size = history_size
+        self.executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='job')
+        self.lock = threading.Lock()
+        self.running: Dict[str, Job] = {}
+        self.last_pruned = 0.0
+        events.add_listener(self._on_event)
+
+    def poll(self) -> int:
+        """Heartbeat, reap and claim; returns the number of newly claimed jobs"""
+        with self.lock:
+            running = list(self.running)
+        for job_id in running:
+            self.store.update_job(job_id, worker=self.worker_id)
+
+        stale = self.store.fail_stale_jobs(self.heartbeat_timeout)
+        if stale:
+            print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Failed {stale} job(s) abandoned by a stopped worker")
+        if time.monotonic() - self.last_pruned > 300:
+            self.store.prune_jobs(self.history_size)
+            self.last_pruned = time.monotonic()
+
+        claimed = 0
+        while len(running) + claimed < self.concurrency:
+            record = self.store.claim_job(self.worker_id, list(self.actions))
+            if record is None:
+                break
+            job = Job.from_record(record)
+            with self.lock:
+                self.running[job.id] = job
+            self.executor.submit(self._run, job)
+            claimed += 1
+        return claimed
+
+    def _run(self, job: Job):
+        self.events.publish('job_started', job_id=job.id, kind=job.kind, target=job.target)
+        status, result, error = execute_job(self.actions[job.kind], job)
+        with self.lock:
+            job.status, job.result, job.error = status, result, error
+            job.finished_at = datetime.now()
+            self.running.pop(job.id, None)
+        self.store.update_job(job.id, status=status, result=result, error=error,
+                              finished_at=job.finished_at.isoformat(),
+                              progress=job.progress, stages=job.stages)
+        self.events.publish('job_finished', job_id=job.id, kind=job.kind, target=job.target,
+                            status=status, error=error)
+
+    def _on_event(self, event: Dict[str, Any]):
+        if event['type'].startswith('job_'):
+            return
+        with self.lock:
+            updated = [job for job in self.running.values() if job.watches(event)]
+            for job in updated:
+                job.observe(event)
+            snapshots = [(job.id, dict(job.progress), list(job.stages)) for job in updated]
+        for job_id, progress, stages in snapshots:
+            self.store.update_job(job_id, progress=progress, stages=stages)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=True)
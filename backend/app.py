@@ -1,66 +1,139 @@
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request, stream_with_context
 from flask_cors import CORS
+from api.caching import conditional, compress_response, make_etag
+from api.events import EventRelay, get_event_bus, iter_sse
+from api.jobs import JobQueue, JobQueueFull, SharedJobQueue, build_job_actions
+from api.metrics import get_metrics, render
 from scrapers.scraper_manager import ScraperManager
-from scrapers.reddit_scraper import RedditScraper
-from scrapers.twitter_scraper import TwitterScraper
+from scrapers.registry import register_default_scrapers
+from scrapers.http_client import get_http_client
 from analysis.ai_analyzer import AIAnalyzer
 from config.settings import settings
+from storage import columnar_export
+from storage.catalog import analysis_filename_for
+from storage.document_store import get_document_store
+from storage.items import iter_document_items
+from storage.json_stream import buffer_chunks, iter_json_chunks
+from storage.state_store import get_state_store
 import os
 import json
+from datetime import datetime
 
-app = Flask(__name__)
-CORS(app, origins=["http://localhost:8936", "http://127.0.0.1:8936"])
+# Largest page /api/results/<filename>?section=... will return
+RESULTS_PAGE_MAX = 1000
 
-scraper_manager = ScraperManager()
-ai_analyzer = AIAnalyzer()
+# Worker metrics snapshots older than this belong to stopped workers and are left out
+WORKER_METRICS_MAX_AGE = 120
+
+app = Flask(__name__)
+CORS(app, origins=["http://localhost:8936", "http://127.0.0.1:8936"], expose_headers=['ETag', 'Last-Modified'])
+app.after_request(compress_response)
 
 os.makedirs('data', exist_ok=True)
 os.makedirs('analysis', exist_ok=True)
 
-# Load default config
-default_config_path = 'config/scrapers.json'
-if os.path.exists(default_config_path):
-    with open(default_config_path, 'r') as f:
-        default_configs = json.load(f)
-        
-    # Register Reddit scraper with config
-    if 'reddit' in default_configs:
-        reddit_scraper = RedditScraper(default_configs['reddit'])
-        scraper_manager.register_scraper(reddit_scraper)
-    
-    # Register Twitter scraper with config
-    if 'twitter' in default_configs:
-        twitter_scraper = TwitterScraper(default_configs['twitter'])
-        scraper_manager.register_scraper(twitter_scraper)
+ai_analyzer = AIAnalyzer()
+
+if settings.process_role == 'api':
+    # Scrapes, analyses and the scheduler run in worker.py processes; this one serves the API
+    scraper_manager = ScraperManager(get_state_store(), role='api')
+    job_queue = SharedJobQueue(get_state_store(), get_event_bus(), max_queued=settings.job_queue_max)
+    EventRelay(get_event_bus(), get_state_store()).start()
+else:
+    scraper_manager = ScraperManager()
+    job_queue = JobQueue(get_event_bus(), build_job_actions(scraper_manager, ai_analyzer),
+                         max_workers=settings.job_workers, max_queued=settings.job_queue_max)
+    if settings.analysis_warmup:
+        ai_analyzer.warm_up()
+
+register_default_scrapers(scraper_manager)
+
+# Pick up the schedule where the last process left it, catching up runs missed while down
+scraper_manager.resume_scheduler()
 
 
 @app.route('/api/status', methods=['GET'])
 def get_status():
-    return jsonify(scraper_manager.get_status())
+    # The timestamp keeps tags from colliding across restarts, when the version starts over
+    version, updated_at = scraper_manager.get_state_version()
+    etag = make_etag('status', version, updated_at.timestamp())
+    return conditional(etag, updated_at, lambda: jsonify(scraper_manager.get_status()))
+
+
+@app.route('/api/events', methods=['GET'])
+def stream_events():
+    """Server-sent events for run, scraper and analysis progress
+    
+    Reconnecting clients send Last-Event-ID and receive the events they missed.
+    """
+    last_event_id = request.headers.get('Last-Event-ID', type=int)
+    subscription = get_event_bus().subscribe(last_event_id)
+    return Response(
+        stream_with_context(iter_sse(subscription)),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+
+@app.route('/api/metrics', methods=['GET'])
+def get_prometheus_metrics():
+    """Prometheus scrape endpoint; in api mode it also reports each live worker's metrics"""
+    sources = [({}, get_metrics().snapshot())]
+    if settings.process_role == 'api':
+        cutoff = datetime.now().timestamp() - WORKER_METRICS_MAX_AGE
+        for key, entry in sorted(get_state_store().get_prefix('metrics:').items()):
+            if entry['updated_at'] >= cutoff:
+                sources.append(({'worker': key[len('metrics:'):]}, entry['value']))
+    return Response(render(sources), mimetype='text/plain; version=0.0.4')
 
 
 @app.route('/api/server/start', methods=['POST'])
 def start_server():
-    success = scraper_manager.start_scheduler()
+    success = scraper_manager.set_scheduler_enabled(True)
     return jsonify({
         "status": "started" if success else "already_running", 
-        "is_running": scraper_manager.is_running
+        "is_running": scraper_manager.scheduler_enabled()
     })
 
 
 @app.route('/api/server/stop', methods=['POST'])
 def stop_server():
-    scraper_manager.stop_scheduler()
+    scraper_manager.set_scheduler_enabled(False)
     return jsonify({
         "status": "stopped", 
-        "is_running": scraper_manager.is_running
+        "is_running": scraper_manager.scheduler_enabled()
     })
 
 
+def _enqueue(kind, target, params=None):
+    """Queue a background job and answer 202 with its id, or 429 when the queue is full"""
+    try:
+        job, created = job_queue.submit(kind, target, params)
+    except JobQueueFull as e:
+        return jsonify({"error": f"Job queue is full: {str(e)}"}), 429
+    response = jsonify({"status": "queued" if created else "already_queued", "job_id": job.id, "job": job.to_dict()})
+    response.headers['Location'] = f"/api/jobs/{job.id}"
+    return response, 202
+
+
 @app.route('/api/server/run-now', methods=['POST'])
 def run_scrapers_now():
-    results = scraper_manager.run_all_scrapers()
-    return jsonify({"status": "completed", "results": results})
+    return _enqueue('run_all', 'all')
+
+
+@app.route('/api/jobs', methods=['GET'])
+def list_jobs():
+    """Recent background jobs, newest first (``?status=running`` to filter)"""
+    return jsonify({"jobs": job_queue.list(request.args.get('status'))})
+
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Status, progress, stage timings and (once finished) the result of one job"""
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(job)
 
 
 @app.route('/api/settings', methods=['GET'])
@@ -68,6 +141,11 @@ def get_settings():
     return jsonify(settings.to_dict())
 
 
+@app.route('/api/http/stats', methods=['GET'])
+def get_http_stats():
+    """Per-host request counts and latencies of the shared scraper HTTP client"""
+    return jsonify({"hosts": get_http_client().get_stats()})
+
 
 @app.route('/api/scrapers', methods=['GET'])
 def get_scrapers():
@@ -87,19 +165,18 @@ def get_scraper_config(scraper_name):
 @app.route('/api/scrapers/<scraper_name>/config', methods=['POST'])
 def update_scraper_config(scraper_name):
     data = request.get_json()
-    scraper_manager.update_scraper_config(scraper_name, data)
+    try:
+        scraper_manager.update_scraper_config(scraper_name, data)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     return jsonify({"status": "updated", "config": data})
 
 
 @app.route('/api/scrapers/<scraper_name>/run', methods=['POST'])
 def run_single_scraper(scraper_name):
-    try:
-        result = scraper_manager.run_single_scraper(scraper_name)
-        return jsonify(result)
-    except ValueError as e:
-        return jsonify({"error": str(e)}), 404
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+    if scraper_name not in scraper_manager.scrapers:
+        return jsonify({"error": f"Scraper '{scraper_name}' not found"}), 404
+    return _enqueue('run_scraper', scraper_name)
 
 
 @app.route('/api/scrapers/<scraper_name>/toggle', methods=['POST'])
@@ -123,32 +200,168 @@ def get_scraper_stats(scraper_name):
     return jsonify({"error": "Scraper not found"}), 404
 
 
+def _parse_time_param(value):
+    """Accept unix seconds or an ISO date/datetime"""
+    if value is None or value == '':
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+
+
+@app.route('/api/items', methods=['GET'])
+def query_items():
+    """Filter, sort and page through indexed scraped items"""
+    item_store = scraper_manager.item_store
+    if not item_store:
+        return jsonify({"error": "Item store is disabled"}), 404
+    
+    args = request.args
+    try:
+        page = item_store.query(
+            source=args.get('source'),
+            channel=args.get('channel') or args.get('subreddit') or args.get('query'),
+            author=args.get('author'),
+            since=_parse_time_param(args.get('since')),
+            until=_parse_time_param(args.get('until')),
+            min_score=args.get('min_score', type=int),
+            max_score=args.get('max_score', type=int),
+            min_comments=args.get('min_comments', type=int),
+            text=args.get('q'),
+            sort=args.get('sort', 'created'),
+            order=args.get('order', 'desc'),
+            limit=args.get('limit', 50, type=int),
+            cursor=args.get('cursor')
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify(page)
+
+
+@app.route('/api/catalog', methods=['GET'])
+def get_catalog_entries():
+    """Metadata for files in the data directory: kind, size, item counts and linked analyses
+    
+    ``?files=a.json,b.json`` restricts the answer to those files and ``?kind=batch``
+    to one kind, so the dashboard can check a whole page of results in one call.
+    """
+    catalog = scraper_manager.catalog
+    catalog.refresh()
+    files = request.args.get('files')
+    kind = request.args.get('kind')
+    
+    def build():
+        entries = catalog.list(kind=kind, filenames=files.split(',') if files else None)
+        return jsonify({"files": entries, "count": len(entries), "stats": catalog.get_stats()})
+    
+    etag = make_etag('catalog', catalog.version, catalog.updated_at.timestamp(), request.query_string)
+    return conditional(etag, catalog.updated_at, build)
+
+
 @app.route('/api/results/<filename>', methods=['GET'])
 def view_results(filename):
-    """View scraped data as JSON"""
-    filepath = f"data/{filename}"
+    """View scraped data as JSON, whole or one page of a section
     
-    if not os.path.exists(filepath):
+    ``?section=chronological&offset=0&limit=100`` reads only the requested items;
+    sections are dotted paths such as ``by_source.reddit``. Responses are streamed.
+    """
+    store = get_document_store()
+    
+    stat = store.stat(filename)
+    if not stat:
         return jsonify({"error": "File not found"}), 404
     
+    # A page is as fresh as its file; the query string selects the representation
+    etag = make_etag(filename, stat['mtime'], stat['stored_size'], request.query_string)
+    return conditional(etag, datetime.fromtimestamp(stat['mtime']), lambda: _results_response(store, filename))
+
+
+def _results_response(store, filename):
+    section = request.args.get('section')
+    if not section:
+        if 'offset' in request.args or 'limit' in request.args:
+            return jsonify({"error": "offset and limit require a section", "sections": store.list_sections(filename)}), 400
+        return Response(stream_with_context(store.iter_json_bytes(filename)), mimetype='application/json')
+    
     try:
-        with open(filepath, 'r') as f:
-            data = json.load(f)
-        return jsonify(data)
+        name = store.resolve_section(filename, section)
+        if not name:
+            return jsonify({"error": f"Unknown section '{section}'", "sections": store.list_sections(filename)}), 400
+        
+        offset = max(request.args.get('offset', 0, type=int), 0)
+        limit = min(max(request.args.get('limit', 100, type=int), 1), RESULTS_PAGE_MAX)
+        total = store.list_sections(filename)[name]
     except Exception as e:
         return jsonify({"error": f"Failed to read file: {str(e)}"}), 500
+    
+    page = {
+        "filename": filename,
+        "section": name,
+        "offset": offset,
+        "limit": limit,
+        "total": total,
+        "next_offset": offset + limit if offset + limit < total else None,
+        "items": []
+    }
+    items = store.iter_section(filename, name, offset, limit)
+    return Response(
+        stream_with_context(buffer_chunks(iter_json_chunks(page, {("items",): items}))),
+        mimetype='application/json'
+    )
 
 
 @app.route('/api/results/<filename>/download', methods=['GET'])
 def download_results(filename):
     """Download scraped data file"""
     from flask import send_file
-    filepath = f"data/{filename}"
+    store = get_document_store()
     
-    if not os.path.exists(filepath):
+    stat = store.stat(filename)
+    if not stat:
         return jsonify({"error": "File not found"}), 404
     
-    return send_file(filepath, as_attachment=True, download_name=filename)
+    fmt = request.args.get('format', 'json').lower()
+    if fmt != 'json':
+        return download_columnar(filename, fmt)
+    
+    if stat['backend'] == 'json':
+        return send_file(f"data/{filename}", as_attachment=True, download_name=filename)
+    
+    # Segment-stored documents are re-serialised on the fly
+    etag = make_etag(filename, stat['mtime'], stat['stored_size'], 'download')
+    return conditional(etag, datetime.fromtimestamp(stat['mtime']), lambda: Response(
+        stream_with_context(store.iter_json_bytes(filename)),
+        mimetype='application/json',
+        headers={'Content-Disposition': f'attachment; filename="{filename}"'}
+    ))
+
+
+def download_columnar(filename, fmt):
+    """Serve a result as a Parquet or Arrow table, converting on the fly if no export was written"""
+    from flask import send_file
+    if fmt not in columnar_export.FORMATS:
+        return jsonify({"error": f"Unsupported format '{fmt}'"}), 400
+    if not columnar_export.is_available():
+        return jsonify({"error": "Columnar downloads require pyarrow on the server"}), 501
+    
+    download_name = columnar_export.columnar_filename(filename, fmt)
+    exported_path = os.path.join('data', download_name)
+    if os.path.exists(exported_path):
+        return send_file(os.path.abspath(exported_path), as_attachment=True,
+                         download_name=download_name, mimetype=columnar_export.MIMETYPES[fmt])
+    
+    try:
+        document = get_document_store().read(filename)
+        payload = columnar_export.to_bytes(iter_document_items(document), fmt)
+    except Exception as e:
+        return jsonify({"error": f"Failed to convert file: {str(e)}"}), 500
+    
+    return Response(
+        payload,
+        mimetype=columnar_export.MIMETYPES[fmt],
+        headers={'Content-Disposition': f'attachment; filename="{download_name}"'}
+    )
 
 
 @app.route('/api/analysis/models', methods=['GET'])
@@ -160,19 +373,18 @@ def get_available_models():
 
 @app.route('/api/analyze/<filename>', methods=['POST'])
 def analyze_batch_file(filename):
-    """Analyze a batch file using AI"""
-    data = request.get_json() or {}
+    """Queue AI analysis of a batch file; poll /api/jobs/<id> for the result
+    
+    ``?profile=1`` also writes a cProfile dump and memory snapshot next to the analysis.
+    """
+    data = request.get_json(silent=True) or {}
     model_name = data.get('model', 'qwen2.5:14b')
+    profile = request.args.get('profile', '').lower() in ('1', 'true', 'yes')
     
-    try:
-        result = ai_analyzer.analyze_batch_file(filename, model_name)
-        return jsonify(result)
-    except Exception as e:
-        return jsonify({
-            'success': False, 
-            'error': str(e),
-            'analysis': {"opportunities": [], "trends": [], "pain_points": []}
-        }), 500
+    if not get_document_store().exists(filename):
+        return jsonify({'success': False, 'error': f"File not found: {filename}"}), 404
+    # Requests for a file already being analysed join the running job
+    return _enqueue('analyze', filename, {'model': model_name, 'profile': profile})
 
 
 @app.route('/api/analysis/<analysis_filename>', methods=['GET'])
@@ -183,40 +395,33 @@ def get_analysis_results(analysis_filename):
     if not os.path.exists(filepath):
         return jsonify({"error": "Analysis file not found"}), 404
     
-    try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            analysis_data = json.load(f)
-        return jsonify(analysis_data)
-    except Exception as e:
-        return jsonify({"error": f"Failed to read analysis file: {str(e)}"}), 500
+    def build():
+        try:
+            with open(filepath, 'r', encoding='utf-8') as f:
+                analysis_data = json.load(f)
+            return jsonify(analysis_data)
+        except Exception as e:
+            return jsonify({"error": f"Failed to read analysis file: {str(e)}"}), 500
+    
+    st = os.stat(filepath)
+    return conditional(make_etag(analysis_filename, st.st_mtime_ns, st.st_size), datetime.fromtimestamp(st.st_mtime), build)
 
 
 @app.route('/api/analysis/status/<filename>', methods=['GET'])
 def check_analysis_status(filename):
     """Check if analysis exists for a given batch file"""
-    analysis_filename = filename.replace('.json', '_analysis.json')
-    analysis_filepath = f"data/{analysis_filename}"
+    catalog = scraper_manager.catalog
+    analysis_filename = analysis_filename_for(filename)
+    entry = catalog.get(analysis_filename)
+    if entry is None:
+        return conditional(make_etag(analysis_filename, 'missing'), None, lambda: jsonify({"exists": False}))
     
-    if os.path.exists(analysis_filepath):
-        try:
-            # Get basic info about the analysis without loading full data
-            with open(analysis_filepath, 'r', encoding='utf-8') as f:
-                analysis_data = json.load(f)
-            
-            return jsonify({
-                "exists": True,
-                "analysis_filename": analysis_filename,
-                "analyzed_at": analysis_data.get('analyzed_at'),
-                "model": analysis_data.get('model'),
-                "stats": analysis_data.get('stats', {})
-            })
-        except Exception as e:
-            return jsonify({
-                "exists": False,
-                "error": f"Failed to read analysis file: {str(e)}"
-            })
-    else:
-        return jsonify({"exists": False})
+    # Answered from the catalog, which reads each analysis file once per change
+    return conditional(
+        make_etag(analysis_filename, entry['mtime'], entry['size']),
+        datetime.fromtimestamp(entry['mtime']),
+        lambda: jsonify(catalog.analysis_status(filename))
+    )
 
 
 if __name__ == '__main__':
@@ -0,0 +1,127 @@
+"""Deterministic local stand-ins for the embedding model and Ollama.
+
+``HashingEmbedder`` replaces the SentenceTransformer: it hashes word and
+bigram counts into a fixed-size unit vector, so identical and near-identical
+texts land close together under cosine distance and DBSCAN still finds real
+clusters, in microseconds per text and with no model download.
+
+``OllamaStub`` answers ``/api/generate`` and ``/api/tags`` like a local Ollama
+server, with a canned JSON analysis and optional latency:
+
+    analyzer.embedding_model = HashingEmbedder()
+    analyzer.ollama_base_url = OllamaStub(latency_ms=200).start()
+"""
+import json
+import re
+import threading
+import time
+import zlib
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, List, Any
+
+import numpy as np
+
+WORD = re.compile(r"[a-z0-9']+")
+
+CANNED_ANALYSIS = {
+    'opportunities': [{
+        'title': 'Synthetic opportunity',
+        'confidence': 0.5,
+        'evidence': 'Generated by the benchmark Ollama stub',
+        'cluster_refs': [1],
+        'sources': ['reddit', 'twitter']
+    }],
+    'trends': [{'topic': 'Synthetic trend', 'momentum': 'steady', 'mentions': 1}],
+    'pain_points': [{'issue': 'Synthetic pain point', 'frequency': 'low'}]
+}
+
+
+class HashingEmbedder:
+    """Drop-in for SentenceTransformer.encode using hashed bag-of-words features"""
+
+    def __init__(self, dimensions: int = 256):
+        self.dimensions = dimensions
+
+    def encode(self, texts: List[str], show_progress_bar: bool = False, **kwargs) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        for row, text in enumerate(texts):
+            words = WORD.findall(text.lower())
+            for token in words + [f"{a} {b}" for a, b in zip(words, words[1:])]:
+                vectors[row, zlib.crc32(token.encode()) % self.dimensions] += 1.0
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+
+class OllamaStub:
+    """Threaded HTTP server imitating the parts of the Ollama API the analyzer calls"""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, latency_ms: float = 0,
+                 model: str = 'qwen2.5:14b'):
+        self.latency_ms = latency_ms
+        self.model = model
+        self.lock = threading.Lock()
+        self.stats = {'requests': 0, 'prompt_chars': 0}
+
+        self.httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> str:
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self.url
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def handle(self, path: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        if path == '/api/tags':
+            return {'models': [{'name': self.model, 'size': 9 * 10 ** 9, 'modified_at': '2024-01-01T00:00:00Z'}]}
+
+        prompt = body.get('prompt', '')
+        with self.lock:
+            self.stats['requests'] += 1
+            self.stats['prompt_chars'] += len(prompt)
+        return {
+            'model': body.get('model', self.model),
+            'response': json.dumps(CANNED_ANALYSIS),
+            'done': True,
+            # Roughly four characters per token, like the real tokenizers
+            'prompt_eval_count': len(prompt) // 4,
+            'eval_count': len(json.dumps(CANNED_ANALYSIS)) // 4
+        }
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, format, *args):
+                pass
+
+            def _respond(self, body: Dict[str, Any]):
+                payload = json.dumps(body).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self):
+                self._respond(server.handle(self.path, {}))
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                self._respond(server.handle(self.path, json.loads(self.rfile.read(length) or b'{}')))
+
+        return Handler
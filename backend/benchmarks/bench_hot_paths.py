@@ -0,0 +1,238 @@
+"""Benchmarks for the batch, analysis and results hot paths on synthetic data.
+
+For each size, writes a synthetic Reddit/Twitter run (see synthetic_data.py)
+into a scratch directory and times create_batch_file, extract_text_content,
+cluster_similar_content, summarize_clusters, a whole analyze_batch_file run,
+and the /api/results and /api/status endpoints. The embedding model and
+Ollama are replaced by the deterministic stubs in analysis_stubs.py, so runs
+are offline and comparable across machines and commits:
+
+    python benchmarks/bench_hot_paths.py --sizes 1000 10000 100000 --output bench.json
+    python benchmarks/bench_hot_paths.py --sizes 1000 10000 --baseline bench.json
+
+With ``--baseline`` the run exits non-zero when a case got slower than
+``--max-slowdown`` times its median in the earlier report.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Dict, List, Any, Callable
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+CASES = ['create_batch_file', 'extract_text_content', 'cluster_similar_content', 'summarize_clusters',
+         'analyze_batch_file', 'api_results', 'api_results_page', 'api_status']
+
+# Cases below this median are dominated by timer noise and never count as regressions
+MIN_COMPARABLE_SECONDS = 0.005
+
+
+def _measure(case: str, size: int, repeat: int, run: Callable[[], Any], items: int = None) -> Dict[str, Any]:
+    """Time ``run`` ``repeat`` times; without ``items``, run returns how many items it processed"""
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        processed = run()
+        times.append(time.perf_counter() - started)
+    items = processed if items is None else items
+    median = statistics.median(times)
+    return {
+        'case': case,
+        'size': size,
+        'items': items,
+        'median_s': round(median, 4),
+        'min_s': round(min(times), 4),
+        'max_s': round(max(times), 4),
+        'items_per_sec': round(items / median, 1) if median else None
+    }
+
+
+def run_size(args, size: int, client, analyzer) -> List[Dict[str, Any]]:
+    from benchmarks.synthetic_data import SyntheticRun, write_run
+    from scrapers.scraper_manager import ScraperManager
+    from storage.document_store import get_document_store
+
+    results = []
+    started = time.perf_counter()
+    files = write_run(SyntheticRun(size, args.reddit_share, args.seed))
+    results.append({'case': 'generate', 'size': size, 'items': size,
+                    'median_s': round(time.perf_counter() - started, 4)})
+
+    cases = set(args.cases)
+    if 'create_batch_file' in cases:
+        manager = ScraperManager()
+        scraper_results = [{'scraper': name, 'status': 'success', 'filename': files[name]}
+                           for name in ('reddit', 'twitter')]
+        results.append(_measure('create_batch_file', size, args.repeat,
+                                lambda: manager.create_batch_file(scraper_results), items=size))
+
+    batch = get_document_store().read(files['batch'])
+    texts = analyzer.extract_text_content(batch)
+    if 'extract_text_content' in cases:
+        results.append(_measure('extract_text_content', size, args.repeat,
+                                lambda: len(analyzer.extract_text_content(batch))))
+    del batch
+
+    # DBSCAN is quadratic in the worst case; the analysis cases stop at --cluster-max items
+    analysable = size <= args.cluster_max
+    if analysable:
+        clusters = analyzer.cluster_similar_content(texts)
+        if 'cluster_similar_content' in cases:
+            results.append(_measure('cluster_similar_content', size, args.repeat,
+                                    lambda: analyzer.cluster_similar_content(texts), items=len(texts)))
+        if 'summarize_clusters' in cases:
+            results.append(_measure('summarize_clusters', size, args.repeat,
+                                    lambda: analyzer.summarize_clusters(clusters), items=len(texts)))
+        if 'analyze_batch_file' in cases:
+            stages = {}
+
+            def analyze() -> int:
+                result = analyzer.analyze_batch_file(files['batch'])
+                if not result['success']:
+                    raise RuntimeError(result['error'])
+                stages.update({stage['stage']: stage['seconds'] for stage in result['stats']['stages']})
+                return result['stats']['total_items']
+
+            results.append({**_measure('analyze_batch_file', size, args.repeat, analyze), 'stages': stages})
+    elif cases & {'cluster_similar_content', 'summarize_clusters', 'analyze_batch_file'}:
+        print(f"Skipping clustering and analysis at {size} items (--cluster-max {args.cluster_max})")
+    del texts
+
+    def get(url: str) -> int:
+        response = client.get(url)
+        # Drain streamed bodies so the whole response is produced
+        body = response.get_data()
+        if response.status_code != 200:
+            raise RuntimeError(f"{url} answered {response.status_code}: {body[:200]!r}")
+        return len(body)
+
+    if 'api_results' in cases:
+        results.append(_measure('api_results', size, args.repeat,
+                                lambda: get(f"/api/results/{files['batch']}"), items=size))
+    if 'api_results_page' in cases:
+        page_url = f"/api/results/{files['batch']}?section=chronological&offset={size // 2}&limit=100"
+        results.append(_measure('api_results_page', size, args.repeat, lambda: get(page_url), items=100))
+    if 'api_status' in cases:
+        results.append(_measure('api_status', size, args.repeat,
+                                lambda: [get('/api/status') for _ in range(args.status_calls)], items=args.status_calls))
+    return results
+
+
+def run_benchmarks(args) -> Dict[str, Any]:
+    workdir = tempfile.mkdtemp(prefix='datasky-bench-')
+    shutil.copytree(os.path.join(BACKEND_DIR, 'config'), os.path.join(workdir, 'config'))
+    os.environ['ANALYSIS_WARMUP'] = 'False'
+    os.environ.pop('PROCESS_ROLE', None)
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        # Imported here so every path the app resolves against the working directory lands in the scratch copy
+        from analysis.profiling import peak_rss_mb
+        from benchmarks.analysis_stubs import HashingEmbedder, OllamaStub
+        from config.settings import settings
+        import app
+
+        analyzer = app.ai_analyzer
+        analyzer.embedding_model = HashingEmbedder(args.embedding_dimensions)
+        ollama = OllamaStub(latency_ms=args.ollama_latency_ms)
+        analyzer.ollama_base_url = ollama.start()
+        # Keep the one-off sklearn import out of the first clustering measurement
+        from sklearn.cluster import DBSCAN  # noqa: F401
+
+        results = []
+        try:
+            client = app.app.test_client()
+            for size in args.sizes:
+                print(f"Benchmarking {size} items...")
+                results.extend(run_size(args, size, client, analyzer))
+        finally:
+            ollama.stop()
+
+        return {
+            'generated_at': datetime.now().isoformat(),
+            'config': vars(args),
+            'environment': {
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'storage_backend': settings.storage_backend
+            },
+            'peak_rss_mb': peak_rss_mb(),
+            'results': results
+        }
+    finally:
+        os.chdir(cwd)
+        if args.keep:
+            print(f"Kept scratch data in {workdir}")
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any], max_slowdown: float) -> List[str]:
+    """Print each case's change against the baseline and return the regressions"""
+    previous = {(result['case'], result['size']): result for result in baseline.get('results', [])}
+    regressions = []
+    print(f"\n{'case':<26}{'size':>9}{'baseline s':>12}{'now s':>10}{'ratio':>8}")
+    for result in report['results']:
+        before = previous.get((result['case'], result['size']))
+        if before is None or result['case'] == 'generate':
+            continue
+        ratio = result['median_s'] / before['median_s'] if before['median_s'] else None
+        print(f"{result['case']:<26}{result['size']:>9}{before['median_s']:>12}{result['median_s']:>10}"
+              f"{round(ratio, 2) if ratio else '-':>8}")
+        if ratio and ratio > max_slowdown and result['median_s'] >= MIN_COMPARABLE_SECONDS:
+            regressions.append(f"{result['case']} at {result['size']} items is {ratio:.2f}x slower "
+                               f"({before['median_s']}s -> {result['median_s']}s)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark batch, analysis and results hot paths on synthetic data')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000], help='Items per synthetic batch')
+    parser.add_argument('--cases', nargs='+', default=CASES, choices=CASES)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--reddit-share', type=float, default=0.6, help='Fraction of items that are Reddit posts')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--cluster-max', type=int, default=20000,
+                        help='Largest size the clustering and analysis cases run at')
+    parser.add_argument('--embedding-dimensions', type=int, default=256)
+    parser.add_argument('--ollama-latency-ms', type=float, default=0, help='Delay added by the Ollama stub')
+    parser.add_argument('--status-calls', type=int, default=100, help='/api/status requests per measurement')
+    parser.add_argument('--output', help='Write the report as JSON to this path')
+    parser.add_argument('--baseline', help='Earlier --output report to compare against')
+    parser.add_argument('--max-slowdown', type=float, default=1.25,
+                        help='Fail when a case is this many times slower than the baseline')
+    parser.add_argument('--keep', action='store_true', help='Keep the scratch data directory')
+    args = parser.parse_args()
+
+    report = run_benchmarks(args)
+
+    print(f"\n{'case':<26}{'size':>9}{'items':>9}{'median s':>11}{'min s':>9}{'items/s':>13}")
+    for result in report['results']:
+        print(f"{result['case']:<26}{result['size']:>9}{result['items']:>9}{result['median_s']:>11}"
+              f"{result.get('min_s', '-'):>9}{result.get('items_per_sec') or '-':>13}")
+        if result.get('stages'):
+            print(f"{'':<26}stages: {', '.join(f'{name} {seconds}s' for name, seconds in result['stages'].items())}")
+    print(f"peak RSS: {report['peak_rss_mb']} MB")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            regressions = compare(report, json.load(f), args.max_slowdown)
+        if regressions:
+            print('\n'.join(f"FAIL: {regression}" for regression in regressions))
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+"""Offline scraper benchmark against the local replay server.
+
+Compares the sequential, thread-pool and asyncio scraping paths on identical
+synthetic (or recorded) data and reports wall time and items/sec:
+
+    python benchmarks/bench_scrapers.py --subreddits 20 --posts 300 --latency-ms 50
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from typing import Dict, List, Any, Callable
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.replay_server import ReplayServer  # noqa: E402
+from scrapers.reddit_scraper import RedditScraper  # noqa: E402
+from scrapers.twitter_scraper import TwitterScraper  # noqa: E402
+
+
+def _time_run(label: str, run: Callable[[], List[Dict[str, Any]]]) -> Dict[str, Any]:
+    started = time.perf_counter()
+    items = run()
+    wall_time = time.perf_counter() - started
+    return {
+        'path': label,
+        'items': len(items),
+        'wall_time_s': round(wall_time, 3),
+        'items_per_sec': round(len(items) / wall_time, 1) if wall_time else None
+    }
+
+
+def run_benchmarks(args) -> Dict[str, Any]:
+    server = ReplayServer(
+        fixtures_dir=args.fixtures,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        rate_limit_every=args.rate_limit_every,
+        rate_limit_reset=args.rate_limit_reset,
+        listing_size=max(args.posts, args.tweets)
+    )
+    base_url = server.start()
+
+    reddit_config = {
+        'base_url': base_url,
+        'subreddits': [f"bench{i}" for i in range(args.subreddits)],
+        'posts_per_subreddit': args.posts,
+        'requests_per_minute': args.requests_per_minute,
+        'incremental': False
+    }
+    twitter_config = {
+        'base_url': base_url,
+        'bearer_token': 'replay',
+        'enabled': True,
+        'search_queries': [f"bench query {i}" for i in range(args.queries)],
+        'max_results_per_query': args.tweets,
+        'requests_per_minute': args.requests_per_minute,
+        'max_rate_limit_wait': args.rate_limit_reset + 1,
+        'incremental': False
+    }
+
+    results = []
+    try:
+        results.append(_time_run('reddit sync', RedditScraper({**reddit_config, 'max_workers': 1}).scrape))
+        results.append(_time_run(
+            f'reddit concurrent ({args.workers} workers)',
+            RedditScraper({**reddit_config, 'max_workers': args.workers}).scrape
+        ))
+        results.append(_time_run('twitter sync', TwitterScraper(twitter_config).scrape))
+
+        try:
+            from scrapers.async_reddit_scraper import AsyncRedditScraper
+            from scrapers.async_twitter_scraper import AsyncTwitterScraper
+        except ImportError as e:
+            print(f"Skipping async paths: {e}")
+        else:
+            async_reddit = AsyncRedditScraper({**reddit_config, 'max_concurrency': args.workers})
+            async_twitter = AsyncTwitterScraper({**twitter_config, 'max_concurrency': args.workers})
+            results.append(_time_run('reddit async', lambda: asyncio.run(async_reddit.scrape())))
+            results.append(_time_run('twitter async', lambda: asyncio.run(async_twitter.scrape())))
+
+            async def both():
+                reddit_posts, tweets = await asyncio.gather(async_reddit.scrape(), async_twitter.scrape())
+                return reddit_posts + tweets
+            results.append(_time_run('reddit + twitter async', lambda: asyncio.run(both())))
+    finally:
+        server.stop()
+
+    return {
+        'config': vars(args),
+        'server': server.stats,
+        'results': results
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark scraping paths against the replay server')
+    parser.add_argument('--fixtures', help='Replay recorded fixtures instead of synthetic data only')
+    parser.add_argument('--subreddits', type=int, default=10)
+    parser.add_argument('--posts', type=int, default=200, help='Posts per subreddit')
+    parser.add_argument('--queries', type=int, default=5)
+    parser.add_argument('--tweets', type=int, default=200, help='Tweet budget per query')
+    parser.add_argument('--workers', type=int, default=8, help='Concurrency for the concurrent and async paths')
+    parser.add_argument('--latency-ms', type=float, default=50)
+    parser.add_argument('--jitter-ms', type=float, default=0)
+    parser.add_argument('--rate-limit-every', type=int, default=0)
+    parser.add_argument('--rate-limit-reset', type=float, default=0.5)
+    parser.add_argument('--requests-per-minute', type=float, default=60000,
+                        help='Client-side limiter rate; keep high to measure the fetch paths themselves')
+    parser.add_argument('--output', help='Write the report as JSON to this path')
+    args = parser.parse_args()
+
+    report = run_benchmarks(args)
+
+    print(f"{'path':<32}{'items':>8}{'wall s':>10}{'items/s':>12}")
+    for result in report['results']:
+        print(f"{result['path']:<32}{result['items']:>8}{result['wall_time_s']:>10}{result['items_per_sec']:>12}")
+    print(f"server: {report['server']}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""Cold-start benchmark for the API and worker entry points.
+
+Imports ``app`` and ``worker`` in fresh interpreters (in a scratch directory
+with a copy of config/, so real data is untouched) and reports import time
+and peak RSS. Exits non-zero when the median import time exceeds the budget
+or when a heavy ML module is imported at startup:
+
+    python benchmarks/bench_startup.py --runs 5 --max-seconds 1.0
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List, Any
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that must only be imported by the first analysis (or the warm-up thread)
+HEAVY_MODULES = ['sentence_transformers', 'torch', 'sklearn', 'scipy', 'pyarrow']
+
+PROBE = """
+import json, sys, time
+sys.path.insert(0, {backend!r})
+started = time.perf_counter()
+__import__({module!r})
+seconds = time.perf_counter() - started
+try:
+    import resource
+    max_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+except ImportError:
+    max_rss_kb = None
+print(json.dumps({{'seconds': seconds, 'max_rss_kb': max_rss_kb,
+                  'heavy': [name for name in {heavy!r} if name in sys.modules]}}))
+"""
+
+
+def measure(module: str, workdir: str) -> Dict[str, Any]:
+    env = dict(os.environ, ANALYSIS_WARMUP='False')
+    env.pop('PROCESS_ROLE', None)
+    probe = PROBE.format(backend=BACKEND_DIR, module=module, heavy=HEAVY_MODULES)
+    output = subprocess.run([sys.executable, '-c', probe], cwd=workdir, env=env,
+                            capture_output=True, text=True, check=True).stdout
+    # Startup logging comes first; the probe's report is the last line
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def run_benchmarks(args) -> Dict[str, Any]:
+    workdir = tempfile.mkdtemp(prefix='datasky-startup-')
+    shutil.copytree(os.path.join(BACKEND_DIR, 'config'), os.path.join(workdir, 'config'))
+    results: List[Dict[str, Any]] = []
+    try:
+        for module in args.modules:
+            runs = [measure(module, workdir) for _ in range(args.runs)]
+            times = [run['seconds'] for run in runs]
+            results.append({
+                'module': module,
+                'median_s': round(statistics.median(times), 3),
+                'min_s': round(min(times), 3),
+                'max_s': round(max(times), 3),
+                'max_rss_mb': round(max(run['max_rss_kb'] or 0 for run in runs) / 1024, 1),
+                'heavy_modules': sorted({name for run in runs for name in run['heavy']})
+            })
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return {'config': vars(args), 'results': results}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure cold-start import time of the API and worker')
+    parser.add_argument('--modules', nargs='+', default=['app', 'worker'])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--max-seconds', type=float, default=1.0, help='Fail when a median import takes longer')
+    parser.add_argument('--output', help='Write the report as JSON to this path')
+    args = parser.parse_args()
+
+    report = run_benchmarks(args)
+
+    failures = []
+    print(f"{'module':<10}{'median s':>10}{'min s':>8}{'max s':>8}{'rss MB':>9}  heavy modules")
+    for result in report['results']:
+        print(f"{result['module']:<10}{result['median_s']:>10}{result['min_s']:>8}{result['max_s']:>8}"
+              f"{result['max_rss_mb']:>9}  {', '.join(result['heavy_modules']) or '-'}")
+        if result['median_s'] > args.max_seconds:
+            failures.append(f"{result['module']} took {result['median_s']}s (budget {args.max_seconds}s)")
+        if result['heavy_modules']:
+            failures.append(f"{result['module']} imported {', '.join(result['heavy_modules'])} at startup")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if failures:
+        print('\n'.join(f"FAIL: {failure}" for failure in failures))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,249 @@
+"""Local stand-in for the Reddit and Twitter APIs.
+
+Replays fixtures captured with HTTP_RECORD_DIR and, for requests without a
+fixture, serves synthetic paginated listings. Point scrapers at it through
+their ``base_url`` config:
+
+    python benchmarks/replay_server.py --port 8950 --latency-ms 80 --rate-limit-every 50
+"""
+import argparse
+import glob
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+import zlib
+from datetime import datetime, timedelta, timezone
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, Any, Optional, Tuple
+from urllib.parse import urlparse, parse_qsl
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scrapers.http_recorder import fixture_key  # noqa: E402
+
+REDDIT_LISTING = re.compile(r'^/r/(?P<subreddit>[^/]+)/(?P<sort>[^/.]+)\.json$')
+TWITTER_SEARCH = '/2/tweets/search/recent'
+
+
+class ReplayServer:
+    """Threaded HTTP server answering scraper requests from fixtures or synthetic data"""
+
+    def __init__(self, fixtures_dir: str = None, host: str = '127.0.0.1', port: int = 0,
+                 latency_ms: float = 0, jitter_ms: float = 0, rate_limit_every: int = 0,
+                 rate_limit_reset: float = 1, synthetic: bool = True, listing_size: int = 1000):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.rate_limit_every = rate_limit_every
+        self.rate_limit_reset = rate_limit_reset
+        self.synthetic = synthetic
+        self.listing_size = listing_size
+        self.fixtures = self._load_fixtures(fixtures_dir) if fixtures_dir else {}
+
+        self.lock = threading.Lock()
+        self.stats = {'requests': 0, 'rate_limited': 0, 'fixtures': 0, 'synthetic': 0, 'not_found': 0}
+
+        self.httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> str:
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self.url
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    @staticmethod
+    def _load_fixtures(fixtures_dir: str) -> Dict[str, Dict[str, Any]]:
+        fixtures = {}
+        for filepath in glob.glob(os.path.join(fixtures_dir, '*.json')):
+            with open(filepath, 'r') as f:
+                fixture = json.load(f)
+            fixtures[fixture_key(fixture['path'], fixture.get('params', {}))] = fixture
+        return fixtures
+
+    def _count(self, key: str) -> int:
+        with self.lock:
+            self.stats[key] = self.stats.get(key, 0) + 1
+            return self.stats[key]
+
+    def handle(self, path: str, params: Dict[str, str]) -> Tuple[int, Dict[str, str], Optional[Any]]:
+        """Return (status, headers, json body) for one request"""
+        request_number = self._count('requests')
+
+        delay = self.latency_ms + (random.random() * self.jitter_ms if self.jitter_ms else 0)
+        if delay:
+            time.sleep(delay / 1000)
+
+        if self.rate_limit_every and request_number % self.rate_limit_every == 0:
+            self._count('rate_limited')
+            headers = {
+                'Retry-After': str(self.rate_limit_reset),
+                'x-rate-limit-reset': str(int(time.time() + self.rate_limit_reset))
+            }
+            return 429, headers, {'title': 'Too Many Requests'}
+
+        fixture = self.fixtures.get(fixture_key(path, params))
+        if fixture:
+            self._count('fixtures')
+            body = fixture.get('json', fixture.get('text'))
+            return fixture['status'], fixture.get('headers', {}), body
+
+        if self.synthetic:
+            match = REDDIT_LISTING.match(path)
+            if match:
+                self._count('synthetic')
+                return 200, {}, self._reddit_listing(match.group('subreddit'), params)
+            if path == TWITTER_SEARCH:
+                self._count('synthetic')
+                return 200, {}, self._twitter_search(params)
+
+        self._count('not_found')
+        return 404, {}, {'error': f'No fixture for {path}'}
+
+    def _reddit_listing(self, subreddit: str, params: Dict[str, str]) -> Dict[str, Any]:
+        limit = min(int(params.get('limit', 25)), 100)
+        after = params.get('after')
+        start = int(after.rsplit('_', 1)[-1]) + 1 if after else 0
+        end = min(start + limit, self.listing_size)
+        now = time.time()
+
+        children = []
+        for index in range(start, end):
+            seed = zlib.crc32(f"{subreddit}{index}".encode())
+            children.append({'kind': 't3', 'data': {
+                'id': f"{subreddit}_{index}",
+                'subreddit': subreddit,
+                'title': f"Synthetic post {index} in r/{subreddit}",
+                'selftext': 'Looking for a tool that does this automatically' if seed % 3 == 0 else '',
+                'author': f"user{seed % 5000}",
+                'score': seed % 5000,
+                'upvote_ratio': round(0.5 + (seed % 50) / 100, 2),
+                'num_comments': seed % 400,
+                'created_utc': now - index * 60,
+                'url': f"https://example.com/{subreddit}/{index}",
+                'permalink': f"/r/{subreddit}/comments/{subreddit}_{index}/",
+                'is_video': False
+            }})
+
+        return {'kind': 'Listing', 'data': {
+            'after': f"t3_{subreddit}_{end - 1}" if end < self.listing_size else None,
+            'children': children
+        }}
+
+    def _twitter_search(self, params: Dict[str, str]) -> Dict[str, Any]:
+        query = params.get('query', '')
+        max_results = max(10, min(int(params.get('max_results', 10)), 100))
+        offset = int(params.get('next_token', 0))
+        since_id = int(params.get('since_id', 0))
+
+        # Ids are unique per query and decrease with age, like real snowflake ids
+        top_id = (zlib.crc32(query.encode()) % 1000 + 1) * 10 ** 9 + self.listing_size
+        now = datetime.now(timezone.utc)
+
+        tweets = []
+        index = offset
+        while len(tweets) < max_results and index < self.listing_size:
+            tweet_id = top_id - index
+            if tweet_id <= since_id:
+                break
+            seed = zlib.crc32(f"{query}{index}".encode())
+            tweets.append({
+                'id': str(tweet_id),
+                'text': f"{query} #{index}: does anyone know a tool for this?",
+                'author_id': str(seed % 100000),
+                'conversation_id': str(tweet_id),
+                'created_at': (now - timedelta(minutes=index)).strftime('%Y-%m-%dT%H:%M:%S.000Z'),
+                'public_metrics': {
+                    'retweet_count': seed % 50,
+                    'reply_count': seed % 30,
+                    'like_count': seed % 500,
+                    'quote_count': seed % 10
+                }
+            })
+            index += 1
+
+        if not tweets:
+            return {'meta': {'result_count': 0}}
+
+        meta = {
+            'newest_id': tweets[0]['id'],
+            'oldest_id': tweets[-1]['id'],
+            'result_count': len(tweets)
+        }
+        if index < self.listing_size and top_id - index > since_id:
+            meta['next_token'] = str(index)
+        return {'data': tweets, 'meta': meta}
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                status, headers, body = server.handle(parsed.path, dict(parse_qsl(parsed.query)))
+                payload = json.dumps(body).encode('utf-8') if not isinstance(body, str) else body.encode('utf-8')
+
+                self.send_response(status)
+                for name, value in headers.items():
+                    if name.lower() not in ('content-length', 'content-type'):
+                        self.send_header(name, value)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay recorded or synthetic Reddit/Twitter API responses')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8950)
+    parser.add_argument('--fixtures', help='Directory of fixtures recorded with HTTP_RECORD_DIR')
+    parser.add_argument('--latency-ms', type=float, default=0, help='Delay added to every response')
+    parser.add_argument('--jitter-ms', type=float, default=0, help='Random extra delay up to this value')
+    parser.add_argument('--rate-limit-every', type=int, default=0, help='Answer every Nth request with a 429')
+    parser.add_argument('--rate-limit-reset', type=float, default=1, help='Seconds advertised in 429 reset headers')
+    parser.add_argument('--listing-size', type=int, default=1000, help='Items per synthetic subreddit or query')
+    parser.add_argument('--no-synthetic', action='store_true', help='Return 404 for requests without a fixture')
+    args = parser.parse_args()
+
+    server = ReplayServer(
+        fixtures_dir=args.fixtures,
+        host=args.host,
+        port=args.port,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        rate_limit_every=args.rate_limit_every,
+        rate_limit_reset=args.rate_limit_reset,
+        synthetic=not args.no_synthetic,
+        listing_size=args.listing_size
+    )
+    print(f"Replay server listening on {server.url} ({len(server.fixtures)} fixtures)")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == '__main__':
+    main()
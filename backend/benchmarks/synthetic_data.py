@@ -0,0 +1,208 @@
+"""Synthetic Reddit/Twitter result and batch files for benchmarks.
+
+Items are a pure function of (seed, source, index), so any size from a few
+items to millions is generated deterministically and streamed straight into
+the document store without being held in memory. Titles and tweets are
+drawn from a small set of topics and phrasings, which gives the clustering
+stage realistic near-duplicate groups to find:
+
+    python benchmarks/synthetic_data.py --items 100000 --reddit-share 0.6
+"""
+import argparse
+import heapq
+import os
+import sys
+import time
+import zlib
+from datetime import datetime, timezone
+from typing import Dict, Any, Iterator, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from storage.document_store import get_document_store  # noqa: E402
+
+TOPICS = [
+    'python packaging', 'docker compose', 'kubernetes autoscaling', 'postgres indexing', 'react state management',
+    'rust async', 'typescript generics', 'CI pipelines', 'local LLMs', 'vector databases', 'home lab backups',
+    'password managers', 'note taking apps', 'invoice tracking', 'time tracking', 'monorepo tooling',
+    'API rate limits', 'web scraping', 'data visualization', 'mobile push notifications'
+]
+
+TEMPLATES = [
+    'Is there a tool that handles {topic} automatically?',
+    'What is everyone using for {topic} in 2024?',
+    'I am so tired of doing {topic} by hand',
+    'Show HN style: I built a small app for {topic}',
+    '{topic} keeps breaking in production, any advice?',
+    'Looking for a simpler alternative for {topic}',
+    'Why is {topic} still this hard?',
+    'Best practices for {topic} at a small startup'
+]
+
+SELFTEXTS = [
+    'We tried three different services and none of them fit our workflow.',
+    'Happy to pay for something that just works.',
+    'Our team spends hours every week on this.',
+    ''
+]
+
+SUBREDDITS = ['python', 'programming', 'technology', 'webdev', 'devops', 'selfhosted', 'startups', 'SaaS']
+
+
+def _hash(seed: int, source: str, index: int) -> int:
+    return zlib.crc32(f"{seed}:{source}:{index}".encode())
+
+
+def _score(h: int) -> int:
+    # Log-uniform between 1 and 10k: most posts are quiet, a few take off
+    return int(10 ** ((h % 1000) / 250))
+
+
+def reddit_post(index: int, seed: int = 0, now: float = 0.0, spacing: float = 30.0) -> Dict[str, Any]:
+    """Post ``index`` of a listing, newest first, in the shape RedditScraper exports"""
+    h = _hash(seed, 'reddit', index)
+    topic = TOPICS[h % len(TOPICS)]
+    subreddit = SUBREDDITS[(h >> 8) % len(SUBREDDITS)]
+    post_id = f"s{seed}r{index}"
+    return {
+        'id': post_id,
+        'subreddit': subreddit,
+        'title': TEMPLATES[(h >> 4) % len(TEMPLATES)].format(topic=topic),
+        'selftext': SELFTEXTS[(h >> 12) % len(SELFTEXTS)],
+        'author': f"user{(h >> 3) % 50000}",
+        'score': _score(h >> 5),
+        'upvote_ratio': round(0.5 + ((h >> 7) % 50) / 100, 2),
+        'num_comments': _score(h >> 9) // 10,
+        'created_utc': now - index * spacing,
+        'url': f"https://example.com/{subreddit}/{post_id}",
+        'permalink': f"https://reddit.com/r/{subreddit}/comments/{post_id}/",
+        'is_video': False,
+        'scraped_at': datetime.fromtimestamp(now).isoformat()
+    }
+
+
+def tweet(index: int, seed: int = 0, now: float = 0.0, spacing: float = 30.0) -> Dict[str, Any]:
+    """Tweet ``index`` of a search, newest first, in the shape TwitterScraper exports"""
+    h = _hash(seed, 'twitter', index)
+    topic = TOPICS[h % len(TOPICS)]
+    metrics = {
+        'retweet_count': _score(h >> 5) // 20,
+        'reply_count': _score(h >> 7) // 30,
+        'like_count': _score(h >> 9),
+        'quote_count': _score(h >> 11) // 100
+    }
+    return {
+        'id': str(10 ** 18 - index),
+        'text': f"{TEMPLATES[(h >> 4) % len(TEMPLATES)].format(topic=topic)} #{topic.split()[0]}",
+        'author_id': str((h >> 3) % 1000000),
+        'conversation_id': str(10 ** 18 - index),
+        'created_at': datetime.fromtimestamp(now - index * spacing, timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.000Z'),
+        'public_metrics': metrics,
+        'search_query': f"{topic} -is:retweet lang:en",
+        'engagement_score': metrics['retweet_count'] * 2 + metrics['like_count'] + metrics['reply_count'] * 3
+    }
+
+
+class SyntheticRun:
+    """Sizes, clock and seed of one synthetic scrape; documents are regenerated on demand"""
+
+    def __init__(self, items: int, reddit_share: float = 0.6, seed: int = 0, window_hours: float = 24, now: float = None):
+        self.seed = seed
+        self.now = now if now is not None else time.time()
+        self.reddit_count = int(round(items * reddit_share))
+        self.twitter_count = items - self.reddit_count
+        # Spread each source evenly over the window so the chronological merge interleaves them
+        self.spacing = {
+            'reddit': window_hours * 3600 / max(self.reddit_count, 1),
+            'twitter': window_hours * 3600 / max(self.twitter_count, 1)
+        }
+
+    @property
+    def items(self) -> int:
+        return self.reddit_count + self.twitter_count
+
+    def posts(self, reverse: bool = False) -> Iterator[Dict[str, Any]]:
+        indexes = range(self.reddit_count - 1, -1, -1) if reverse else range(self.reddit_count)
+        return (reddit_post(index, self.seed, self.now, self.spacing['reddit']) for index in indexes)
+
+    def tweets(self, reverse: bool = False) -> Iterator[Dict[str, Any]]:
+        indexes = range(self.twitter_count - 1, -1, -1) if reverse else range(self.twitter_count)
+        return (tweet(index, self.seed, self.now, self.spacing['twitter']) for index in indexes)
+
+    def reddit_document(self) -> Tuple[Dict[str, Any], Dict[Tuple[str, ...], Iterator[Dict[str, Any]]]]:
+        skeleton = {
+            'source': 'reddit',
+            'timestamp': datetime.fromtimestamp(self.now).isoformat(),
+            'data_count': self.reddit_count,
+            'data': []
+        }
+        return skeleton, {('data',): self.posts()}
+
+    def twitter_document(self) -> Tuple[Dict[str, Any], Dict[Tuple[str, ...], Iterator[Dict[str, Any]]]]:
+        skeleton = {
+            'source': 'twitter',
+            'scraped_at': datetime.fromtimestamp(self.now).isoformat(),
+            'time_window': '24h',
+            'search_queries': [f"{topic} -is:retweet lang:en" for topic in TOPICS],
+            'total_tweets': self.twitter_count,
+            'tweets': []
+        }
+        return skeleton, {('tweets',): self.tweets()}
+
+    def chronological(self) -> Iterator[Dict[str, Any]]:
+        """Oldest first, timestamped the way ScraperManager.normalize_timestamp does"""
+        reddit = ({'source': 'reddit', 'timestamp': datetime.fromtimestamp(post['created_utc']).isoformat(), 'data': post}
+                  for post in self.posts(reverse=True))
+        twitter = ({'source': 'twitter', 'timestamp': item['created_at'], 'data': item}
+                   for item in self.tweets(reverse=True))
+        return heapq.merge(reddit, twitter, key=lambda entry: entry['timestamp'])
+
+    def batch_document(self) -> Tuple[Dict[str, Any], Dict[Tuple[str, ...], Iterator[Dict[str, Any]]]]:
+        """The batch file ScraperManager.create_batch_file would write for this run"""
+        reddit_skeleton, reddit_sections = self.reddit_document()
+        twitter_skeleton, twitter_sections = self.twitter_document()
+        skeleton = {
+            'metadata': {
+                'run_timestamp': datetime.fromtimestamp(self.now).isoformat(),
+                'run_type': 'batch',
+                'total_items': self.items,
+                'sources': ['reddit', 'twitter'],
+                'summary': {'successful_scrapers': ['reddit', 'twitter'], 'failed_scrapers': [], 'success_rate': '2/2'}
+            },
+            'by_source': {'reddit': reddit_skeleton, 'twitter': twitter_skeleton},
+            'chronological': []
+        }
+        sections = {('by_source', 'reddit') + path: items for path, items in reddit_sections.items()}
+        sections.update({('by_source', 'twitter') + path: items for path, items in twitter_sections.items()})
+        sections[('chronological',)] = self.chronological()
+        return skeleton, sections
+
+
+def write_run(run: SyntheticRun, prefix: str = 'synthetic') -> Dict[str, str]:
+    """Write the run's reddit, twitter and batch files through the configured document store"""
+    store = get_document_store()
+    stamp = f"{prefix}_{run.items}_{run.seed}"
+    filenames = {}
+    for kind, (skeleton, sections) in (('reddit', run.reddit_document()), ('twitter', run.twitter_document()),
+                                       ('batch', run.batch_document())):
+        filename = f"batch_{stamp}.json" if kind == 'batch' else f"{kind}_{stamp}.json"
+        filenames[kind] = store.write_stream(filename, skeleton, sections)
+    return filenames
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Write synthetic Reddit/Twitter result and batch files to data/')
+    parser.add_argument('--items', type=int, nargs='+', default=[1000], help='Items per batch; one batch per value')
+    parser.add_argument('--reddit-share', type=float, default=0.6, help='Fraction of items that are Reddit posts')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--prefix', default='synthetic')
+    args = parser.parse_args()
+
+    for items in args.items:
+        started = time.perf_counter()
+        filenames = write_run(SyntheticRun(items, args.reddit_share, args.seed), args.prefix)
+        print(f"{items} items in {time.perf_counter() - started:.2f}s: {', '.join(filenames.values())}")
+
+
+if __name__ == '__main__':
+    main()
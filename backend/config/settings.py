@@ -13,12 +13,57 @@ class Settings:
         self.debug = os.getenv('DEBUG', 'False').lower() == 'true'
         self.data_dir = os.getenv('DATA_DIR', 'data')
         
+        # Shared HTTP client used by all scrapers
+        self.http_pool_size = int(os.getenv('HTTP_POOL_SIZE', 10))
+        self.http_max_retries = int(os.getenv('HTTP_MAX_RETRIES', 3))
+        self.http_backoff_factor = float(os.getenv('HTTP_BACKOFF_FACTOR', 1.0))
+        self.http_max_backoff = float(os.getenv('HTTP_MAX_BACKOFF', 60))
+        # When set, responses are saved as fixtures for benchmarks/replay_server.py
+        self.http_record_dir = os.getenv('HTTP_RECORD_DIR') or None
+        
+        # 'sync' runs scrapers on a thread pool, 'async' runs them on one event loop
+        self.scraper_engine = os.getenv('SCRAPER_ENGINE', 'sync').lower()
+        self.scraper_timeout = float(os.getenv('SCRAPER_TIMEOUT', 600))
+        # Thread pool size for sync runs; 0 gives every enabled scraper its own thread
+        self.scraper_workers = int(os.getenv('SCRAPER_WORKERS', 0))
+        # Cron expression or interval ('every 30m') for scrapers without their own 'schedule' config
+        self.schedule = os.getenv('SCHEDULE', '0 12 * * *')
+        # Up to this many seconds of random delay on every scheduled run
+        self.schedule_jitter = float(os.getenv('SCHEDULE_JITTER', 30))
+        
+        # Background jobs (run-now, single scraper runs, analyses): concurrent workers and waiting-queue bound
+        self.job_workers = int(os.getenv('JOB_WORKERS', 2))
+        self.job_queue_max = int(os.getenv('JOB_QUEUE_MAX', 50))
+        # 'standalone' runs everything in the API process; 'api' leaves scraping and analysis
+        # to worker.py processes, coordinated through data/state.db
+        self.process_role = os.getenv('PROCESS_ROLE', 'standalone').lower()
+        self.worker_heartbeat_timeout = float(os.getenv('WORKER_HEARTBEAT_TIMEOUT', 60))
+        # Load the embedding model and sklearn in the background at startup instead of on the first analysis
+        self.analysis_warmup = os.getenv('ANALYSIS_WARMUP', 'False').lower() == 'true'
+        
+        # 'segments' appends results to compressed NDJSON segments, 'json' writes one file per result
+        self.storage_backend = os.getenv('STORAGE_BACKEND', 'segments').lower()
+        self.segment_max_mb = float(os.getenv('SEGMENT_MAX_MB', 64))
+        self.segment_codec = os.getenv('SEGMENT_CODEC') or None  # zstd when installed, else gzip
+        # 'parquet' or 'arrow' also writes each result as a columnar item table (requires pyarrow)
+        self.columnar_export = os.getenv('COLUMNAR_EXPORT', '').lower() or None
+        
+        # Cross-run index of exported item ids
+        self.dedup_enabled = os.getenv('DEDUP_ENABLED', 'True').lower() == 'true'
+        self.dedup_retention_days = float(os.getenv('DEDUP_RETENTION_DAYS', 30))
+        
+        # Indexed SQLite copy of scraped items behind /api/items
+        self.item_store_enabled = os.getenv('ITEM_STORE_ENABLED', 'True').lower() == 'true'
+        
     def to_dict(self):
         return {
             'port': self.port,
             'host': self.host,
             'debug': self.debug,
-            'data_dir': self.data_dir
+            'data_dir': self.data_dir,
+            'scraper_engine': self.scraper_engine,
+            'storage_backend': self.storage_backend,
+            'process_role': self.process_role
         }
 
 
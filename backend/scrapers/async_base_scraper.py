@@ -0,0 +1,36 @@
+import asyncio
+from abc import abstractmethod
+from typing import Dict, List, Any
+
+from scrapers.base_scraper import BaseScraper
+
+
+class AsyncBaseScraper(BaseScraper):
+    """Base for scrapers whose scrape() is a coroutine run on the manager's event loop"""
+
+    @abstractmethod
+    async def scrape(self) -> List[Dict[str, Any]]:
+        pass
+
+    def get_max_concurrency(self) -> int:
+        """How many requests this scraper may have in flight at once"""
+        config = getattr(self, 'config', {})
+        return max(1, int(config.get('max_concurrency', config.get('max_workers', 4))))
+
+
+class SyncScraperAdapter:
+    """Runs a blocking BaseScraper in the default executor so it can join an async run"""
+
+    def __init__(self, scraper: BaseScraper):
+        self.scraper = scraper
+
+    async def scrape(self) -> List[Dict[str, Any]]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.scraper.scrape)
+
+
+def as_async(scraper: BaseScraper):
+    """Return an object whose scrape() can be awaited, wrapping sync scrapers"""
+    if isinstance(scraper, AsyncBaseScraper):
+        return scraper
+    return SyncScraperAdapter(scraper)
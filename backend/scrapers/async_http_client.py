@@ -0,0 +1,104 @@
+import asyncio
+import json
+import time
+from datetime import datetime
+from typing import Dict, Any
+from urllib.parse import urlparse
+
+from config.settings import settings
+from scrapers.http_client import HttpClient, get_http_client, get_retry_wait
+
+try:
+    import aiohttp
+except ImportError:  # The async engine is optional
+    aiohttp = None
+
+
+class AsyncResponse:
+    """Fully read aiohttp response exposing the parts of requests.Response scrapers use"""
+
+    def __init__(self, url: str, status_code: int, headers, body: bytes, payload: Any):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = body
+        self._payload = payload
+
+    def json(self) -> Any:
+        return self._payload
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise aiohttp.ClientResponseError(
+                None, (), status=self.status_code, message=f"HTTP {self.status_code} for {self.url}"
+            )
+
+
+class AsyncHttpClient:
+    """aiohttp counterpart of HttpClient, sharing its retry policy and per-host stats"""
+
+    def __init__(self, pool_size: int = None, max_retries: int = None,
+                 backoff_factor: float = None, max_backoff: float = None):
+        if aiohttp is None:
+            raise RuntimeError("The async scraping engine requires aiohttp (pip install aiohttp)")
+
+        self.pool_size = pool_size or settings.http_pool_size
+        self.max_retries = settings.http_max_retries if max_retries is None else max_retries
+        self.backoff_factor = settings.http_backoff_factor if backoff_factor is None else backoff_factor
+        self.max_backoff = settings.http_max_backoff if max_backoff is None else max_backoff
+        # Stats land in the sync client so /api/http/stats covers both engines
+        self.stats: HttpClient = get_http_client()
+        self.session = None
+
+    async def __aenter__(self) -> 'AsyncHttpClient':
+        connector = aiohttp.TCPConnector(limit=self.pool_size)
+        self.session = aiohttp.ClientSession(connector=connector)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.session.close()
+
+    async def get(self, url: str, params: Dict[str, Any] = None, headers: Dict[str, str] = None,
+                  timeout: float = 10, max_retries: int = None, max_backoff: float = None) -> AsyncResponse:
+        """GET with the same retry semantics as HttpClient.request"""
+        max_retries = self.max_retries if max_retries is None else max_retries
+        max_backoff = self.max_backoff if max_backoff is None else max_backoff
+        host = urlparse(url).netloc
+
+        attempt = 0
+        while True:
+            started = time.perf_counter()
+            try:
+                async with self.session.get(url, params=params, headers=headers,
+                                            timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+                    body = await response.read()
+                    status = response.status
+                    response_headers = response.headers.copy()
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                self.stats.record_request(host, None, time.perf_counter() - started, retried=attempt > 0)
+                if attempt >= max_retries:
+                    raise
+                await asyncio.sleep(min(get_retry_wait({}, attempt, self.backoff_factor), max_backoff))
+                attempt += 1
+                continue
+
+            self.stats.record_request(host, status, time.perf_counter() - started, retried=attempt > 0, size=len(body))
+
+            if status in HttpClient.RETRY_STATUSES and attempt < max_retries:
+                wait = get_retry_wait(response_headers, attempt, self.backoff_factor)
+                if wait <= max_backoff:
+                    print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] {host} returned {status}, retrying in {wait:.1f}s")
+                    await asyncio.sleep(wait)
+                    attempt += 1
+                    continue
+
+            if self.stats.recorder:
+                self.stats.recorder.record('GET', url, params, status, response_headers, body)
+
+            payload = None
+            if status < 400 and body:
+                try:
+                    payload = json.loads(body)
+                except ValueError:
+                    payload = None
+            return AsyncResponse(url, status, response_headers, body, payload)
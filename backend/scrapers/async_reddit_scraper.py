@@ -0,0 +1,50 @@
+import asyncio
+from datetime import datetime
+from typing import Dict, List, Any, AsyncIterator
+
+from scrapers.async_base_scraper import AsyncBaseScraper
+from scrapers.async_http_client import AsyncHttpClient
+from scrapers.reddit_scraper import RedditScraper, ListingWalk
+
+
+class AsyncRedditScraper(AsyncBaseScraper, RedditScraper):
+    """RedditScraper fetching every subreddit concurrently on one event loop"""
+    
+    async def scrape(self) -> List[Dict[str, Any]]:
+        self.reset_run_stats()
+        semaphore = asyncio.Semaphore(self.get_max_concurrency())
+        
+        async with AsyncHttpClient() as http:
+            per_subreddit = await asyncio.gather(*(
+                self._scrape_subreddit_async(http, semaphore, subreddit)
+                for subreddit in self.config['subreddits']
+            ))
+        
+        self.last_scraped = datetime.now()
+        return [post for posts in per_subreddit for post in posts]
+    
+    async def _scrape_subreddit_async(self, http: AsyncHttpClient, semaphore: asyncio.Semaphore,
+                                      subreddit: str) -> List[Dict[str, Any]]:
+        posts = []
+        try:
+            async with semaphore:
+                async for page in self.aiter_subreddit_pages(http, subreddit):
+                    posts.extend(page)
+        except Exception as e:
+            print(f"Error scraping r/{subreddit}: {e}")
+        return posts
+    
+    async def aiter_subreddit_pages(self, http: AsyncHttpClient, subreddit: str) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Async version of iter_subreddit_pages sharing its pagination state"""
+        walk = ListingWalk(self, subreddit)
+        
+        while not walk.done:
+            await self._get_limiter().acquire_async()
+            response = await http.get(walk.url, headers=self.headers, params=walk.next_params(), timeout=10)
+            response.raise_for_status()
+            
+            page = walk.consume(response.json().get('data', {}))
+            if page:
+                yield page
+        
+        walk.finish()
@@ -0,0 +1,73 @@
+import asyncio
+from datetime import datetime
+from typing import Dict, List, Any
+
+import aiohttp
+
+from scrapers.async_base_scraper import AsyncBaseScraper
+from scrapers.async_http_client import AsyncHttpClient
+from scrapers.twitter_scraper import TwitterScraper, SearchWalk
+
+
+class AsyncTwitterScraper(AsyncBaseScraper, TwitterScraper):
+    """TwitterScraper running its search queries concurrently on one event loop"""
+    
+    async def scrape(self) -> List[Dict[str, Any]]:
+        """Scrape tweets based on search queries"""
+        if not self._check_ready():
+            return []
+        
+        self.reset_run_stats()
+        self._rate_limited = False
+        start_time = self._get_time_range()
+        semaphore = asyncio.Semaphore(self.get_max_concurrency())
+        
+        async with AsyncHttpClient() as http:
+            per_query = await asyncio.gather(*(
+                self._search_async(http, semaphore, query, start_time)
+                for query in self.config['search_queries']
+            ))
+        
+        self._summarize_budget()
+        return [tweet for tweets in per_query for tweet in tweets]
+    
+    async def _search_async(self, http: AsyncHttpClient, semaphore: asyncio.Semaphore,
+                            query: str, start_time: str) -> List[Dict[str, Any]]:
+        walk = SearchWalk(self, query, start_time)
+        tweets = []
+        
+        async with semaphore:
+            # Once one query is rate limited the remaining ones would be too
+            if self._rate_limited:
+                self.record_detail('query_budget', query, walk.report())
+                return tweets
+            
+            print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Searching Twitter for: {query}")
+            
+            try:
+                while not walk.done:
+                    await self._get_limiter().acquire_async()
+                    response = await http.get(
+                        self._get_search_url(),
+                        headers=self._get_headers(),
+                        params=walk.next_params(),
+                        timeout=30,
+                        max_backoff=self.config.get('max_rate_limit_wait', 60)
+                    )
+                    
+                    if response.status_code == 429:
+                        print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Rate limit reached, saving cursor to resume next run")
+                        walk.interrupt()
+                        self._rate_limited = True
+                        break
+                    
+                    response.raise_for_status()
+                    tweets.extend(walk.consume(response.json()))
+                
+                walk.finish()
+                
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Error searching Twitter: {str(e)}")
+        
+        self.record_detail('query_budget', query, walk.report())
+        return tweets
@@ -1,7 +1,23 @@
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Iterable, Iterator
 from datetime import datetime
-import json
+import os
+import threading
+from api.metrics import get_metrics
+from scrapers.http_client import get_http_client
+from storage import columnar_export
+from storage.document_store import get_document_store
+from storage.items import iter_document_items
+from storage.json_stream import SectionPath
+
+
+SCRAPED_ITEMS = get_metrics().counter(
+    'scraper_items_total', 'Items seen by scrapers: new, or skipped as already stored', ('source', 'outcome')
+)
+
+
+class ScraperCancelled(Exception):
+    """Raised inside a scrape once the manager has given up on it (e.g. after a timeout)"""
 
 
 class BaseScraper(ABC):
@@ -9,24 +25,53 @@ class BaseScraper(ABC):
     def __init__(self, name: str):
         self.name = name
         self.last_scraped = None
+        # Shared keep-alive session with retries; subclasses should use it for all requests
+        self.http = get_http_client()
+        # Attached by ScraperManager; without it every run is a full scrape
+        self.cursor_store = None
+        self.run_stats = {'new_count': 0, 'skipped_count': 0}
+        self._pending_cursors = {}
+        self._stats_lock = threading.Lock()
+        # Called with a copy of run_stats whenever items are recorded (set by ScraperManager)
+        self.on_progress = None
+        # Cancel token of the current run: ScraperManager gives every run a fresh one and sets it
+        # when the run times out; scrapers stop at their next request
+        self.cancel_event = threading.Event()
         
     @abstractmethod
     def scrape(self) -> List[Dict[str, Any]]:
         pass
     
+    def iter_items(self) -> Iterator[Dict[str, Any]]:
+        """Yield scraped items as they arrive; scrapers that can stream override this"""
+        yield from self.scrape()
+    
     @abstractmethod
     def validate_data(self, data: List[Dict[str, Any]]) -> bool:
         pass
     
+    def validate_item(self, item: Dict[str, Any]) -> bool:
+        """Per-item check used by the streaming pipeline, which drops invalid items"""
+        return True
+    
     def filter_data(self, data: List[Dict[str, Any]], filters: Dict[str, Any] = None) -> List[Dict[str, Any]]:
         if not filters:
             return data
-        
-        filtered = data
-        for key, value in filters.items():
-            filtered = [item for item in filtered if key in item and item[key] == value]
-        
-        return filtered
+        return list(self.iter_filter(data, filters))
+    
+    def iter_filter(self, items: Iterable[Dict[str, Any]], filters: Dict[str, Any] = None) -> Iterator[Dict[str, Any]]:
+        """Items matching every key/value in ``filters``, checked in one pass per item"""
+        if not filters:
+            yield from items
+            return
+        conditions = list(filters.items())
+        for item in items:
+            if all(key in item and item[key] == value for key, value in conditions):
+                yield item
+    
+    def enrich_item(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """Add derived fields to an item before it is exported"""
+        return item
     
     def convert_to_common_format(self, data: List[Dict[str, Any]]) -> Dict[str, Any]:
         return {
@@ -41,11 +86,77 @@ class BaseScraper(ABC):
             # Just the filename, no path prefix
             filename = f"{self.name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
         
-        # Always save to data directory
-        filepath = f"data/{filename}"
-        
-        with open(filepath, 'w') as f:
-            json.dump(data, f, indent=2, default=str)
+        # Saved through the configured store (segments or plain files in data/)
+        return get_document_store().write(filename, data)
+    
+    def export_stream(self, skeleton: Dict[str, Any], sections: Dict[SectionPath, Iterable[Any]],
+                      filename: str = None) -> str:
+        """export_to_json for a document whose item lists are streamed rather than held in memory"""
+        if not filename:
+            filename = f"{self.name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        return get_document_store().write_stream(filename, skeleton, sections)
+    
+    def export_to_columnar(self, data: Dict[str, Any], filename: str = None, fmt: str = 'parquet') -> str:
+        """Write the exported items as one typed table (Parquet or Arrow IPC) for analytics"""
+        if not filename:
+            filename = f"{self.name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}{columnar_export.FORMATS[fmt]}"
         
-        # Return just the filename, not the full path
-        return filename
\ No newline at end of file
+        os.makedirs('data', exist_ok=True)
+        columnar_export.write_items(os.path.join('data', filename), iter_document_items(data), fmt)
+        return filename
+    
+    def is_incremental(self) -> bool:
+        config = getattr(self, 'config', {})
+        return self.cursor_store is not None and config.get('incremental', True)
+    
+    def reset_run_stats(self):
+        with self._stats_lock:
+            self.run_stats = {'new_count': 0, 'skipped_count': 0}
+            self._pending_cursors = {}
+    
+    def cancel(self):
+        self.cancel_event.set()
+    
+    def check_cancelled(self):
+        """Call before each request so a cancelled run stops instead of running on in the background"""
+        if self.cancel_event.is_set():
+            raise ScraperCancelled(f"{self.name} was cancelled")
+    
+    def record_items(self, new_count: int = 0, skipped_count: int = 0):
+        if new_count:
+            SCRAPED_ITEMS.inc(new_count, source=self.name, outcome='new')
+        if skipped_count:
+            SCRAPED_ITEMS.inc(skipped_count, source=self.name, outcome='skipped')
+        with self._stats_lock:
+            self.run_stats['new_count'] += new_count
+            self.run_stats['skipped_count'] += skipped_count
+            stats = dict(self.run_stats)
+        if self.on_progress:
+            self.on_progress(stats)
+    
+    def record_detail(self, section: str, key: str, value: Any):
+        """Attach per-source details (e.g. budget usage) to this run's stats"""
+        with self._stats_lock:
+            self.run_stats.setdefault(section, {})[key] = value
+    
+    def get_cursor(self, key: str) -> Dict[str, Any]:
+        if self.cursor_store is None:
+            return {}
+        return self.cursor_store.get(self.name, key)
+    
+    def has_cursors(self) -> bool:
+        """Whether an earlier run stored high-water marks, so an empty result just means nothing is new"""
+        return self.is_incremental() and self.cursor_store.has_cursors(self.name)
+    
+    def stage_cursor(self, key: str, value: Dict[str, Any]):
+        """Remember a cursor to persist once the run's data has been exported"""
+        with self._stats_lock:
+            self._pending_cursors[key] = value
+    
+    def commit_cursors(self):
+        if self.cursor_store is None:
+            return
+        with self._stats_lock:
+            pending, self._pending_cursors = self._pending_cursors, {}
+        if pending:
+            self.cursor_store.update(self.name, pending)
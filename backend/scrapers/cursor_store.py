@@ -0,0 +1,72 @@
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Dict, Any
+
+from storage.file_lock import FileLock
+
+
+class CursorStore:
+    """Persists per-source high-water marks so scrapers only fetch new items"""
+
+    def __init__(self, path: str = 'data/scraper_cursors.json'):
+        self.path = path
+        self.lock = threading.Lock()
+        # Other worker processes may update the file too
+        self.file_lock = FileLock(f"{path}.lock")
+        self.cursors: Dict[str, Dict[str, Any]] = {}
+        self.mtime = None
+        self.load()
+
+    def load(self):
+        if os.path.exists(self.path):
+            try:
+                self.mtime = os.path.getmtime(self.path)
+                with open(self.path, 'r') as f:
+                    self.cursors = json.load(f)
+            except Exception as e:
+                print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Error loading cursors: {str(e)}")
+                self.cursors = {}
+
+    def _refresh(self):
+        if os.path.exists(self.path) and os.path.getmtime(self.path) != self.mtime:
+            self.load()
+
+    def get(self, scraper_name: str, key: str) -> Dict[str, Any]:
+        with self.lock:
+            self._refresh()
+            return dict(self.cursors.get(scraper_name, {}).get(key, {}))
+
+    def has_cursors(self, scraper_name: str) -> bool:
+        with self.lock:
+            self._refresh()
+            return bool(self.cursors.get(scraper_name))
+
+    def update(self, scraper_name: str, values: Dict[str, Dict[str, Any]]):
+        """Merge cursors for several keys of one scraper and persist them"""
+        with self.lock, self.file_lock:
+            # Merge into the latest file so another process's cursors are kept
+            self._refresh()
+            scraper_cursors = self.cursors.setdefault(scraper_name, {})
+            for key, value in values.items():
+                if value is None:
+                    scraper_cursors.pop(key, None)
+                else:
+                    scraper_cursors[key] = {**value, 'updated_at': datetime.now().isoformat()}
+            self._save()
+
+    def reset(self, scraper_name: str):
+        with self.lock, self.file_lock:
+            self._refresh()
+            self.cursors.pop(scraper_name, None)
+            self._save()
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        # Write then rename so a crash never leaves a truncated cursor file
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.cursors, f, indent=2)
+        os.replace(tmp_path, self.path)
+        self.mtime = os.path.getmtime(self.path)
@@ -0,0 +1,218 @@
+import random
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from typing import Dict, Any, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from api.metrics import get_metrics
+from config.settings import settings
+from scrapers.http_recorder import HttpRecorder
+
+HTTP_REQUESTS = get_metrics().counter('http_requests_total', 'Scraper HTTP requests by host and status', ('host', 'status'))
+HTTP_LATENCY = get_metrics().histogram('http_request_seconds', 'Scraper HTTP request latency', ('host',))
+HTTP_BYTES = get_metrics().counter('http_response_bytes_total', 'Response body bytes downloaded by scrapers', ('host',))
+
+
+class HttpClient:
+    """Keep-alive HTTP client with retries, conditional requests and per-host stats"""
+
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+    MAX_CACHED_RESPONSES = 256
+
+    def __init__(self, pool_size: int = 10, max_retries: int = 3,
+                 backoff_factor: float = 1.0, max_backoff: float = 60, record_dir: str = None):
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+
+        self.session = requests.Session()
+        # Retries are handled here so Retry-After and rate-limit headers can be honoured
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        # url -> (etag, last_modified, response) for If-None-Match/If-Modified-Since
+        self._validators: 'OrderedDict[str, tuple]' = OrderedDict()
+        self._host_stats: Dict[str, Dict[str, Any]] = {}
+        self.lock = threading.Lock()
+        # Recording mode writes every final response to a fixture for the replay server
+        self.recorder = HttpRecorder(record_dir) if record_dir else None
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request('POST', url, **kwargs)
+
+    def request(self, method: str, url: str, params: Dict[str, Any] = None,
+                headers: Dict[str, str] = None, timeout: float = 10,
+                max_retries: int = None, max_backoff: float = None,
+                revalidate: bool = True, **kwargs) -> requests.Response:
+        """Send a request, retrying transient failures with exponential backoff
+
+        A retryable response whose server-requested wait exceeds max_backoff is
+        returned as-is so the caller can decide how to resume.
+        """
+        max_retries = self.max_retries if max_retries is None else max_retries
+        max_backoff = self.max_backoff if max_backoff is None else max_backoff
+        headers = dict(headers or {})
+        host = urlparse(url).netloc
+
+        cache_key = None
+        cached = None
+        if method == 'GET' and revalidate:
+            cache_key = requests.Request(method, url, params=params).prepare().url
+            with self.lock:
+                cached = self._validators.get(cache_key)
+            if cached:
+                etag, last_modified, _ = cached
+                if etag:
+                    headers['If-None-Match'] = etag
+                if last_modified:
+                    headers['If-Modified-Since'] = last_modified
+
+        attempt = 0
+        while True:
+            started = time.perf_counter()
+            try:
+                response = self.session.request(method, url, params=params, headers=headers,
+                                                timeout=timeout, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                self.record_request(host, None, time.perf_counter() - started, retried=attempt > 0)
+                if attempt >= max_retries:
+                    raise
+                self._sleep_before_retry(None, attempt)
+                attempt += 1
+                continue
+
+            # Bodies are already read unless the caller streams them
+            size = 0 if kwargs.get('stream') else len(response.content)
+            self.record_request(host, response.status_code, time.perf_counter() - started, retried=attempt > 0, size=size)
+
+            if response.status_code == 304 and cached:
+                with self.lock:
+                    self._validators.move_to_end(cache_key)
+                return cached[2]
+
+            if response.status_code in self.RETRY_STATUSES and attempt < max_retries:
+                wait = self._get_retry_wait(response, attempt)
+                if wait <= max_backoff:
+                    print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] {host} returned {response.status_code}, retrying in {wait:.1f}s")
+                    time.sleep(wait)
+                    attempt += 1
+                    continue
+
+            if cache_key and response.status_code == 200:
+                self._remember(cache_key, response)
+            if self.recorder:
+                self.recorder.record(method, url, params, response.status_code, response.headers, response.content)
+            return response
+
+    def _get_retry_wait(self, response: Optional[requests.Response], attempt: int) -> float:
+        headers = response.headers if response is not None else {}
+        return get_retry_wait(headers, attempt, self.backoff_factor)
+
+    def _sleep_before_retry(self, response: Optional[requests.Response], attempt: int):
+        time.sleep(min(self._get_retry_wait(response, attempt), self.max_backoff))
+
+    def _remember(self, cache_key: str, response: requests.Response):
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if not etag and not last_modified:
+            return
+        with self.lock:
+            self._validators[cache_key] = (etag, last_modified, response)
+            self._validators.move_to_end(cache_key)
+            while len(self._validators) > self.MAX_CACHED_RESPONSES:
+                self._validators.popitem(last=False)
+
+    def record_request(self, host: str, status_code: Optional[int], latency: float, retried: bool = False,
+                       size: int = 0):
+        code = str(status_code) if status_code is not None else 'connection_error'
+        HTTP_REQUESTS.inc(host=host, status=code)
+        HTTP_LATENCY.observe(latency, host=host)
+        if size:
+            HTTP_BYTES.inc(size, host=host)
+        with self.lock:
+            stats = self._host_stats.setdefault(host, {
+                'requests': 0,
+                'errors': 0,
+                'retries': 0,
+                'not_modified': 0,
+                'total_latency': 0.0,
+                'max_latency': 0.0,
+                'status_codes': {}
+            })
+            stats['requests'] += 1
+            stats['total_latency'] += latency
+            stats['max_latency'] = max(stats['max_latency'], latency)
+            if retried:
+                stats['retries'] += 1
+            if status_code is None or status_code >= 400:
+                stats['errors'] += 1
+            if status_code == 304:
+                stats['not_modified'] += 1
+            stats['status_codes'][code] = stats['status_codes'].get(code, 0) + 1
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Request counts and latencies per host"""
+        with self.lock:
+            return {
+                host: {
+                    'requests': stats['requests'],
+                    'errors': stats['errors'],
+                    'retries': stats['retries'],
+                    'not_modified': stats['not_modified'],
+                    'avg_latency_ms': round(stats['total_latency'] / stats['requests'] * 1000, 1),
+                    'max_latency_ms': round(stats['max_latency'] * 1000, 1),
+                    'status_codes': dict(stats['status_codes'])
+                }
+                for host, stats in self._host_stats.items()
+            }
+
+
+def get_retry_wait(headers, attempt: int, backoff_factor: float) -> float:
+    """Prefer the server's own hint, falling back to jittered exponential backoff"""
+    retry_after = headers.get('Retry-After')
+    if retry_after:
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            try:
+                return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+            except (TypeError, ValueError):
+                pass
+
+    reset_at = headers.get('x-rate-limit-reset')
+    if reset_at:
+        try:
+            return max(0.0, float(reset_at) - time.time())
+        except ValueError:
+            pass
+
+    return backoff_factor * (2 ** attempt) * (1 + random.random() * 0.1)
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_http_client() -> HttpClient:
+    """Return the process-wide client so all scrapers share one connection pool"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient(
+                pool_size=settings.http_pool_size,
+                max_retries=settings.http_max_retries,
+                backoff_factor=settings.http_backoff_factor,
+                max_backoff=settings.http_max_backoff,
+                record_dir=settings.http_record_dir
+            )
+        return _client
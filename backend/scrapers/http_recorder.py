@@ -0,0 +1,62 @@
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Dict, Any, Optional
+from urllib.parse import urlparse, parse_qsl
+
+# Parameters that change every run and must not affect fixture matching
+VOLATILE_PARAMS = {'start_time', 'end_time'}
+
+# Response headers worth replaying; everything else (cookies, auth echoes) is dropped
+RECORDED_HEADERS = {
+    'content-type', 'etag', 'last-modified', 'retry-after',
+    'x-rate-limit-limit', 'x-rate-limit-remaining', 'x-rate-limit-reset',
+    'x-ratelimit-remaining', 'x-ratelimit-reset', 'x-ratelimit-used'
+}
+
+
+def fixture_key(path: str, params: Dict[str, Any]) -> str:
+    """Stable name for a request, shared by the recorder and the replay server"""
+    stable = sorted((str(k), str(v)) for k, v in params.items() if k not in VOLATILE_PARAMS)
+    digest = hashlib.sha1(json.dumps([path, stable]).encode('utf-8')).hexdigest()[:16]
+    slug = path.strip('/').replace('/', '_') or 'root'
+    return f"{slug}-{digest}"
+
+
+class HttpRecorder:
+    """Captures live responses as fixture files for the replay server"""
+
+    def __init__(self, record_dir: str):
+        self.record_dir = record_dir
+        self.lock = threading.Lock()
+        os.makedirs(record_dir, exist_ok=True)
+
+    def record(self, method: str, url: str, params: Optional[Dict[str, Any]],
+               status_code: int, headers, body: bytes):
+        parsed = urlparse(url)
+        all_params = dict(parse_qsl(parsed.query))
+        all_params.update({k: v for k, v in (params or {}).items() if v is not None})
+
+        try:
+            payload = json.loads(body) if body else None
+            body_field = {'json': payload}
+        except ValueError:
+            body_field = {'text': body.decode('utf-8', errors='replace')}
+
+        fixture = {
+            'method': method,
+            'host': parsed.netloc,
+            'path': parsed.path,
+            'params': {str(k): str(v) for k, v in all_params.items()},
+            'status': status_code,
+            'headers': {k: v for k, v in headers.items() if k.lower() in RECORDED_HEADERS},
+            'recorded_at': datetime.now().isoformat(),
+            **body_field
+        }
+
+        filepath = os.path.join(self.record_dir, f"{fixture_key(parsed.path, all_params)}.json")
+        with self.lock:
+            with open(filepath, 'w') as f:
+                json.dump(fixture, f, indent=2)
@@ -0,0 +1,121 @@
+import time
+from itertools import islice
+from typing import Dict, List, Any, Callable, Iterable, Iterator, Tuple
+
+# A stage turns a stream of items into another stream of items
+Stage = Callable[[Iterator[Dict[str, Any]]], Iterable[Dict[str, Any]]]
+
+
+def map_stage(function: Callable[[Dict[str, Any]], Dict[str, Any]]) -> Stage:
+    """Stage applying ``function`` to every item"""
+    return lambda items: (function(item) for item in items)
+
+
+def filter_stage(predicate: Callable[[Dict[str, Any]], bool]) -> Stage:
+    """Stage keeping the items ``predicate`` accepts"""
+    return lambda items: (item for item in items if predicate(item))
+
+
+def batch_stage(function: Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]], size: int = 500) -> Stage:
+    """Stage handing ``size`` items at a time to ``function`` (e.g. one SQLite lookup per batch)"""
+    def stage(items: Iterator[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        for chunk in chunked(items, size):
+            yield from function(chunk)
+    return stage
+
+
+def chunked(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class StageStats:
+    def __init__(self, name: str):
+        self.name = name
+        self.items_in = 0
+        self.items_out = 0
+        self.seconds = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'items_in': self.items_in, 'items_out': self.items_out, 'seconds': round(self.seconds, 4)}
+
+
+class Pipeline:
+    """Chains generator stages so items flow through one at a time
+
+    Nothing runs until the output is iterated, and each stage pulls its next
+    item only when the stage after it asks for one, so a slow consumer
+    throttles the source and memory stays bounded by what stages buffer
+    themselves (batch stages hold one batch). Every stage's item counts and
+    its own time, excluding the stages before it, are recorded in
+    ``report()``.
+    """
+
+    def __init__(self, stages: List[Tuple[str, Stage]] = None):
+        self.stages: List[Tuple[str, Stage]] = list(stages or [])
+        self.stats: Dict[str, StageStats] = {}
+
+    def add(self, name: str, stage: Stage, before: str = None) -> 'Pipeline':
+        """Append a stage, or insert it ahead of the stage named ``before``"""
+        names = [existing for existing, _ in self.stages]
+        position = names.index(before) if before in names else len(self.stages)
+        self.stages.insert(position, (name, stage))
+        return self
+
+    def run(self, items: Iterable[Dict[str, Any]], source: str = 'source') -> Iterator[Dict[str, Any]]:
+        self.stats = {}
+        # The source's own time is time spent producing items, i.e. all of it
+        stream = self._measure(source, lambda upstream: upstream, items, exclusive=False)
+        for name, stage in self.stages:
+            stream = self._measure(name, stage, stream)
+        return stream
+
+    def record(self, name: str, items: int, seconds: float):
+        """Add timings for work done outside the chain, such as exporting its output"""
+        stats = self.stats.setdefault(name, StageStats(name))
+        stats.items_in += items
+        stats.items_out += items
+        stats.seconds += seconds
+
+    def report(self) -> Dict[str, Dict[str, Any]]:
+        return {name: stats.to_dict() for name, stats in self.stats.items()}
+
+    def _measure(self, name: str, stage: Stage, upstream: Iterable[Dict[str, Any]],
+                 exclusive: bool = True) -> Iterator[Dict[str, Any]]:
+        stats = self.stats[name] = StageStats(name)
+        waited = 0.0
+
+        def counted() -> Iterator[Dict[str, Any]]:
+            nonlocal waited
+            iterator = iter(upstream)
+            while True:
+                started = time.perf_counter()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+                finally:
+                    waited += time.perf_counter() - started
+                stats.items_in += 1
+                yield item
+
+        def measured() -> Iterator[Dict[str, Any]]:
+            output = iter(stage(counted()))
+            while True:
+                started, waited_before = time.perf_counter(), waited
+                try:
+                    item = next(output)
+                except StopIteration:
+                    return
+                finally:
+                    elapsed = time.perf_counter() - started
+                    stats.seconds += elapsed - (waited - waited_before) if exclusive else elapsed
+                stats.items_out += 1
+                yield item
+
+        return measured()
+
@@ -0,0 +1,71 @@
+import asyncio
+import threading
+import time
+from typing import Dict
+
+
+class TokenBucket:
+    """Thread-safe token bucket limiting how often requests may be issued"""
+
+    def __init__(self, rate: float, capacity: float = 1):
+        # rate is tokens added per second, capacity is the allowed burst size
+        if rate <= 0:
+            raise ValueError(f"Rate limit must be positive, got {rate} requests per second")
+        self.rate = rate
+        self.capacity = max(capacity, 1)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Take a token and return how long the caller must wait before using it"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+            self.tokens -= 1
+
+            if self.tokens >= 0:
+                return 0.0
+            # Negative balance means the token is borrowed from the future
+            return -self.tokens / self.rate
+
+    def acquire(self):
+        """Block until a request is allowed"""
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        """Wait without blocking the event loop until a request is allowed"""
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def update_rate(self, rate: float, capacity: float = None):
+        if rate <= 0:
+            raise ValueError(f"Rate limit must be positive, got {rate} requests per second")
+        with self.lock:
+            self.rate = rate
+            if capacity is not None:
+                self.capacity = max(capacity, 1)
+                self.tokens = min(self.tokens, self.capacity)
+
+
+_limiters: Dict[str, TokenBucket] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(key: str, requests_per_minute: float, burst: float = 1) -> TokenBucket:
+    """Return the process-wide limiter for a key, creating it on first use"""
+    if requests_per_minute <= 0:
+        raise ValueError(f"requests_per_minute for '{key}' must be positive, got {requests_per_minute}")
+    rate = requests_per_minute / 60.0
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            limiter = TokenBucket(rate, burst)
+            _limiters[key] = limiter
+        elif limiter.rate != rate or limiter.capacity != max(burst, 1):
+            limiter.update_rate(rate, burst)
+        return limiter
@@ -1,77 +1,216 @@
-import requests
+import queue
+import threading
 import time
-from typing import Dict, List, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Iterator, Optional
 from datetime import datetime
 from scrapers.base_scraper import BaseScraper
+from scrapers.rate_limiter import get_limiter
+
+
+_DONE = object()
+
+
+class ListingWalk:
+    """Pagination state for one subreddit listing, shared by the sync and async scrapers"""
+    
+    def __init__(self, scraper: 'RedditScraper', subreddit: str):
+        self.scraper = scraper
+        self.subreddit = subreddit
+        self.sort_by = scraper.config.get('sort_by', 'hot')
+        self.max_items = int(scraper.config.get('posts_per_subreddit', 25))
+        self.cutoff = scraper._get_age_cutoff()
+        base_url = scraper.config.get('base_url', 'https://www.reddit.com').rstrip('/')
+        self.url = f'{base_url}/r/{subreddit}/{self.sort_by}.json'
+        
+        # High-water mark from the previous run: everything at or below it was already stored
+        self.high_water = scraper.get_cursor(subreddit).get('created_utc') if scraper.is_incremental() else None
+        self.newest = None
+        self.after = None
+        self.collected = 0
+        self.done = self.max_items <= 0
+    
+    def next_params(self) -> Dict[str, Any]:
+        params = {'limit': min(RedditScraper.PAGE_SIZE, self.max_items - self.collected)}
+        if self.after:
+            params['after'] = self.after
+        return params
+    
+    def consume(self, listing: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Turn one listing response into a page of new posts and advance the cursor"""
+        children = listing.get('children', [])
+        page = []
+        reached_cutoff = False
+        
+        for item in children:
+            post_data = item.get('data', {})
+            created_utc = post_data.get('created_utc')
+            
+            if self.cutoff and created_utc and created_utc < self.cutoff:
+                # 'new' listings are time ordered, so nothing older can follow
+                if self.sort_by == 'new':
+                    reached_cutoff = True
+                    break
+                continue
+            
+            if created_utc and (self.newest is None or created_utc > self.newest['created_utc']):
+                self.newest = {'created_utc': created_utc, 'id': post_data.get('id')}
+            
+            if self.high_water and created_utc and created_utc <= self.high_water:
+                self.scraper.record_items(skipped_count=1)
+                if self.sort_by == 'new':
+                    reached_cutoff = True
+                    break
+                continue
+            
+            page.append(self.scraper._parse_post(post_data))
+        
+        page = page[:self.max_items - self.collected]
+        self.collected += len(page)
+        self.scraper.record_items(new_count=len(page))
+        
+        # Other listings are not time ordered; stop once a whole page is too old or already stored
+        if children and not page:
+            reached_cutoff = True
+        
+        self.after = listing.get('after')
+        if reached_cutoff or not self.after or not children or self.collected >= self.max_items:
+            self.done = True
+        return page
+    
+    def finish(self):
+        # Only advance the mark once the listing was walked without errors
+        if self.newest and (not self.high_water or self.newest['created_utc'] > self.high_water):
+            self.scraper.stage_cursor(self.subreddit, self.newest)
 
 
 class RedditScraper(BaseScraper):
     
+    PAGE_SIZE = 100  # Reddit caps a single listing request at 100 posts
+    
     def __init__(self, config: Dict[str, Any] = None):
         super().__init__('reddit')
-        self.base_url = 'https://www.reddit.com/r/{}/hot.json'
         self.headers = {
             'User-Agent': 'DataSky/1.0 (Web Scraper for Data Analysis)'
         }
         
         default_config = {
+            'base_url': 'https://www.reddit.com',  # Point at a replay server for offline runs
             'subreddits': ['python', 'programming', 'technology'],
-            'posts_per_subreddit': 25,
+            'posts_per_subreddit': 25,  # Paginated beyond 100 via the after cursor
             'sort_by': 'hot',
+            'max_age_hours': None,  # Stop paginating past posts older than this
+            'incremental': True,  # Skip posts at or below each subreddit's high-water mark
+            'max_workers': 4,  # 1 fetches subreddits sequentially
+            'requests_per_minute': 60,
             'enabled': True
         }
         
         self.config = {**default_config, **(config or {})}
         
     def scrape(self) -> List[Dict[str, Any]]:
-        all_posts = []
+        return list(self.iter_items())
+    
+    def iter_items(self) -> Iterator[Dict[str, Any]]:
+        for page in self.iter_pages():
+            yield from page
+    
+    def iter_pages(self) -> Iterator[List[Dict[str, Any]]]:
+        """Yield pages of posts from all subreddits as soon as each page arrives"""
+        subreddits = self.config['subreddits']
+        max_workers = max(1, min(int(self.config.get('max_workers', 1)), len(subreddits) or 1))
+        self.reset_run_stats()
+        
+        # Bounded so fetching pauses when the consumer falls behind
+        pages = queue.Queue(maxsize=max_workers * 2)
+        stop = threading.Event()
         
-        for subreddit in self.config['subreddits']:
+        def fetch(subreddit: str):
             try:
-                posts = self._scrape_subreddit(subreddit)
-                all_posts.extend(posts)
-                time.sleep(1)  # Rate limiting: 1 request per second
+                for page in self.iter_subreddit_pages(subreddit):
+                    if not self._put(pages, page, stop):
+                        return
             except Exception as e:
                 print(f"Error scraping r/{subreddit}: {e}")
-                continue
+            finally:
+                self._put(pages, _DONE, stop)
+        
+        # Workers share one limiter so the request rate is enforced globally
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            for subreddit in subreddits:
+                executor.submit(fetch, subreddit)
+            
+            remaining = len(subreddits)
+            while remaining:
+                page = pages.get()
+                if page is _DONE:
+                    remaining -= 1
+                    continue
+                yield page
+        finally:
+            stop.set()
+            executor.shutdown(wait=False, cancel_futures=True)
         
         self.last_scraped = datetime.now()
-        return all_posts
+    
+    @staticmethod
+    def _put(pages: queue.Queue, page: Any, stop: threading.Event) -> bool:
+        while not stop.is_set():
+            try:
+                pages.put(page, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+    
+    def _get_limiter(self):
+        # Reddit allows 60 requests per minute per client
+        return get_limiter('reddit', self.config.get('requests_per_minute', 60))
+    
+    def _get_age_cutoff(self) -> Optional[float]:
+        max_age_hours = self.config.get('max_age_hours')
+        if not max_age_hours:
+            return None
+        return time.time() - float(max_age_hours) * 3600
     
     def _scrape_subreddit(self, subreddit: str) -> List[Dict[str, Any]]:
-        sort_by = self.config.get('sort_by', 'hot')
-        limit = self.config.get('posts_per_subreddit', 25)
-        
-        url = f'https://www.reddit.com/r/{subreddit}/{sort_by}.json'
-        params = {'limit': limit}
-        
-        response = requests.get(url, headers=self.headers, params=params, timeout=10)
-        response.raise_for_status()
-        
-        data = response.json()
         posts = []
+        for page in self.iter_subreddit_pages(subreddit):
+            posts.extend(page)
+        return posts
+    
+    def iter_subreddit_pages(self, subreddit: str) -> Iterator[List[Dict[str, Any]]]:
+        """Follow the listing's after cursor until the item budget or age cutoff is reached"""
+        walk = ListingWalk(self, subreddit)
         
-        for item in data.get('data', {}).get('children', []):
-            post_data = item.get('data', {})
-            
-            post = {
-                'id': post_data.get('id'),
-                'subreddit': post_data.get('subreddit'),
-                'title': post_data.get('title'),
-                'author': post_data.get('author'),
-                'score': post_data.get('score', 0),
-                'upvote_ratio': post_data.get('upvote_ratio', 0),
-                'num_comments': post_data.get('num_comments', 0),
-                'created_utc': post_data.get('created_utc'),
-                'url': post_data.get('url'),
-                'permalink': f"https://reddit.com{post_data.get('permalink', '')}",
-                'is_video': post_data.get('is_video', False),
-                'scraped_at': datetime.now().isoformat()
-            }
+        while not walk.done:
+            self.check_cancelled()
+            self._get_limiter().acquire()
+            response = self.http.get(walk.url, headers=self.headers, params=walk.next_params(), timeout=10)
+            response.raise_for_status()
             
-            posts.append(post)
+            page = walk.consume(response.json().get('data', {}))
+            if page:
+                yield page
         
-        return posts
+        walk.finish()
+    
+    def _parse_post(self, post_data: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            'id': post_data.get('id'),
+            'subreddit': post_data.get('subreddit'),
+            'title': post_data.get('title'),
+            'author': post_data.get('author'),
+            'score': post_data.get('score', 0),
+            'upvote_ratio': post_data.get('upvote_ratio', 0),
+            'num_comments': post_data.get('num_comments', 0),
+            'created_utc': post_data.get('created_utc'),
+            'url': post_data.get('url'),
+            'permalink': f"https://reddit.com{post_data.get('permalink', '')}",
+            'is_video': post_data.get('is_video', False),
+            'scraped_at': datetime.now().isoformat()
+        }
     
     def validate_data(self, data: List[Dict[str, Any]]) -> bool:
         if not data:
@@ -86,6 +225,9 @@ class RedditScraper(BaseScraper):
         
         return True
     
+    def validate_item(self, item: Dict[str, Any]) -> bool:
+        return all(item.get(field) is not None for field in ('id', 'title', 'subreddit', 'author', 'score'))
+    
     def get_config(self) -> Dict[str, Any]:
         return self.config
     
@@ -101,5 +243,7 @@ class RedditScraper(BaseScraper):
             'config': self.config,
             'last_run': self.last_scraped.isoformat() if self.last_scraped else None,
             'subreddits_count': len(self.config.get('subreddits', [])),
-            'posts_per_subreddit': self.config.get('posts_per_subreddit', 25)
+            'posts_per_subreddit': self.config.get('posts_per_subreddit', 25),
+            'max_workers': self.config.get('max_workers', 4),
+            'last_run_stats': self.run_stats
         }
\ No newline at end of file
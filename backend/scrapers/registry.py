@@ -0,0 +1,47 @@
+import importlib
+import json
+import os
+from typing import Dict, List, Type
+
+from config.settings import settings
+from .base_scraper import BaseScraper
+from .scraper_manager import ScraperManager
+
+# Scraper classes by config key and engine, as "module:Class"; a module is imported only when its scraper is configured
+SCRAPER_CLASSES: Dict[str, Dict[str, str]] = {
+    'reddit': {
+        'sync': 'scrapers.reddit_scraper:RedditScraper',
+        'async': 'scrapers.async_reddit_scraper:AsyncRedditScraper'
+    },
+    'twitter': {
+        'sync': 'scrapers.twitter_scraper:TwitterScraper',
+        'async': 'scrapers.async_twitter_scraper:AsyncTwitterScraper'
+    }
+}
+
+
+def register_scraper_class(name: str, sync_path: str, async_path: str = None):
+    """Make a scraper available under config key ``name`` without importing it yet"""
+    SCRAPER_CLASSES[name] = {'sync': sync_path, 'async': async_path or sync_path}
+
+
+def load_scraper_class(name: str, engine: str = None) -> Type[BaseScraper]:
+    paths = SCRAPER_CLASSES[name]
+    module_name, class_name = paths.get(engine or settings.scraper_engine, paths['sync']).split(':')
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def register_default_scrapers(manager: ScraperManager, config_path: str = 'config/scrapers.json') -> List[str]:
+    """Register the scrapers configured in ``config_path`` with the manager, returning their names"""
+    if not os.path.exists(config_path):
+        return []
+    with open(config_path, 'r') as f:
+        default_configs = json.load(f)
+
+    registered = []
+    for name, config in default_configs.items():
+        if name not in SCRAPER_CLASSES:
+            continue
+        manager.register_scraper(load_scraper_class(name)(config))
+        registered.append(name)
+    return registered
@@ -0,0 +1,269 @@
+import json
+import os
+import random
+import re
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, List, Any, Callable, Optional
+
+# Longest the scheduler sleeps between checks of the wall clock, in seconds
+MAX_WAIT = 60
+
+
+class IntervalSchedule:
+    """Runs every N seconds: ``every 5m``, ``every 2h``, ``every 1d`` (or just ``30m``)"""
+
+    UNITS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+    PATTERN = re.compile(r'^(?:every\s+)?(\d+)\s*([smhd])$')
+
+    def __init__(self, spec: str):
+        match = self.PATTERN.match(spec.strip().lower())
+        if not match:
+            raise ValueError(f"Invalid interval '{spec}'")
+        self.spec = spec
+        self.seconds = int(match.group(1)) * self.UNITS[match.group(2)]
+        if self.seconds < 1:
+            raise ValueError(f"Interval '{spec}' must be at least one second")
+
+    def next_after(self, moment: datetime) -> datetime:
+        return moment + timedelta(seconds=self.seconds)
+
+
+class CronSchedule:
+    """Five-field cron expression (minute hour day-of-month month day-of-week) in local time
+
+    Fields accept ``*``, numbers, ranges (``9-17``), lists (``0,30``) and steps
+    (``*/15``, ``9-17/2``). Day of week runs 0-6 from Sunday (7 is also Sunday).
+    """
+
+    FIELDS = [('minute', 0, 59), ('hour', 0, 23), ('day', 1, 31), ('month', 1, 12), ('weekday', 0, 7)]
+
+    def __init__(self, spec: str):
+        parts = spec.split()
+        if len(parts) != 5:
+            raise ValueError(f"Cron expression '{spec}' must have 5 fields")
+        self.spec = spec
+        values = {}
+        for part, (name, low, high) in zip(parts, self.FIELDS):
+            values[name] = self._parse_field(part, low, high)
+        self.minutes = values['minute']
+        self.hours = values['hour']
+        self.days = values['day']
+        self.months = values['month']
+        self.weekdays = {day % 7 for day in values['weekday']}
+        # Like cron, a restricted day-of-month and day-of-week match when either does
+        self.any_day = parts[2] == '*'
+        self.any_weekday = parts[4] == '*'
+
+    @staticmethod
+    def _parse_field(field: str, low: int, high: int) -> set:
+        values = set()
+        for item in field.split(','):
+            value_range, _, step = item.partition('/')
+            if value_range == '*':
+                start, end = low, high
+            elif '-' in value_range:
+                start, end = (int(value) for value in value_range.split('-', 1))
+            else:
+                start = end = int(value_range)
+            step = int(step) if step else 1
+            if start < low or end > high or start > end or step < 1:
+                raise ValueError(f"Cron field '{field}' is out of range {low}-{high}")
+            values.update(range(start, end + 1, step))
+        return values
+
+    def _day_matches(self, moment: datetime) -> bool:
+        in_days = moment.day in self.days
+        # Python's weekday() is Monday=0; cron's is Sunday=0
+        in_weekdays = (moment.weekday() + 1) % 7 in self.weekdays
+        if self.any_day and self.any_weekday:
+            return True
+        if self.any_day:
+            return in_weekdays
+        if self.any_weekday:
+            return in_days
+        return in_days or in_weekdays
+
+    def next_after(self, moment: datetime) -> datetime:
+        candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = candidate + timedelta(days=366 * 5)
+        while candidate < limit:
+            # Skip a whole month, day or hour at a time when it cannot match
+            if candidate.month not in self.months:
+                candidate = (candidate.replace(day=1, hour=0, minute=0) + timedelta(days=32)).replace(day=1)
+            elif not self._day_matches(candidate):
+                candidate = candidate.replace(hour=0, minute=0) + timedelta(days=1)
+            elif candidate.hour not in self.hours:
+                candidate = candidate.replace(minute=0) + timedelta(hours=1)
+            elif candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+            else:
+                return self._skip_gap(candidate)
+        raise ValueError(f"Cron expression '{self.spec}' never matches")
+
+    @staticmethod
+    def _skip_gap(moment: datetime) -> datetime:
+        """A slot inside a DST gap (a local time that never occurs) runs at the end of the gap, as cron does"""
+        while datetime.fromtimestamp(moment.timestamp()) != moment:
+            moment += timedelta(minutes=1)
+        return moment
+
+
+def parse_schedule(spec: str):
+    """An IntervalSchedule or CronSchedule for a spec string, raising ValueError if it is neither"""
+    if not isinstance(spec, str) or not spec.strip():
+        raise ValueError("Schedule must be a non-empty string")
+    if len(spec.split()) == 5:
+        return CronSchedule(spec)
+    return IntervalSchedule(spec)
+
+
+class ScheduledJob:
+    def __init__(self, name: str, spec: str, action: Callable[[], Any], jitter: float = 0):
+        self.name = name
+        self.spec = spec
+        self.schedule = parse_schedule(spec)
+        self.action = action
+        self.jitter = jitter
+        self.next_run: Optional[datetime] = None
+        self.last_run: Optional[datetime] = None
+        self.running = False
+
+    def plan_next(self, after: datetime) -> datetime:
+        self.next_run = self.schedule.next_after(after) + timedelta(seconds=random.uniform(0, self.jitter))
+        return self.next_run
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'schedule': self.spec,
+            'next_run': self.next_run.isoformat() if self.next_run else None,
+            'last_run': self.last_run.isoformat() if self.last_run else None,
+            'running': self.running
+        }
+
+
+class Scheduler:
+    """Runs jobs on interval or cron schedules from one thread that sleeps until the next one is due
+
+    Each due job runs on its own thread, so a slow job never delays the
+    others; a job still running when it comes due again skips that
+    occurrence. Next-run times are persisted, so runs missed while the
+    process was down are caught up once (not once per missed slot) after
+    a restart. Every planned time gets up to ``jitter`` seconds of random
+    delay so jobs sharing a schedule don't fire in the same instant.
+    """
+
+    def __init__(self, state_path: str = 'data/scheduler_state.json'):
+        self.state_path = state_path
+        self.jobs: Dict[str, ScheduledJob] = {}
+        self.condition = threading.Condition()
+        self.thread = None
+        self.running = False
+        self.state = {}
+        # Whether the scheduler was on when the process last saved its state
+        self.was_running = False
+        self._load_state()
+
+    def _load_state(self):
+        if os.path.exists(self.state_path):
+            try:
+                with open(self.state_path, 'r') as f:
+                    saved = json.load(f)
+                self.state = saved.get('jobs', {})
+                self.was_running = saved.get('running', False)
+            except Exception as e:
+                print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Error loading scheduler state: {str(e)}")
+
+    def _save_state(self):
+        self.state = {
+            name: {'schedule': job.spec, 'next_run': job.next_run.isoformat() if job.next_run else None,
+                   'last_run': job.last_run.isoformat() if job.last_run else None}
+            for name, job in self.jobs.items()
+        }
+        try:
+            os.makedirs(os.path.dirname(self.state_path) or '.', exist_ok=True)
+            with open(f"{self.state_path}.tmp", 'w') as f:
+                json.dump({'running': self.running, 'jobs': self.state, 'saved_at': datetime.now().isoformat()}, f, indent=2)
+            os.replace(f"{self.state_path}.tmp", self.state_path)
+        except Exception as e:
+            print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Error saving scheduler state: {str(e)}")
+
+    def set_jobs(self, jobs: List[ScheduledJob]):
+        """Replace the job set, keeping next-run times of jobs whose schedule is unchanged"""
+        now = datetime.now()
+        with self.condition:
+            current = self.jobs
+            self.jobs = {}
+            for job in jobs:
+                previous = current.get(job.name)
+                saved = self.state.get(job.name, {})
+                if previous and previous.spec == job.spec:
+                    job.next_run, job.last_run, job.running = previous.next_run, previous.last_run, previous.running
+                elif saved.get('schedule') == job.spec and saved.get('next_run'):
+                    # A time already in the past makes the job due at once: the missed-run catch-up
+                    job.next_run = datetime.fromisoformat(saved['next_run'])
+                    job.last_run = datetime.fromisoformat(saved['last_run']) if saved.get('last_run') else None
+                else:
+                    job.plan_next(now)
+                self.jobs[job.name] = job
+            self._save_state()
+            self.condition.notify_all()
+
+    def start(self):
+        with self.condition:
+            if self.running:
+                return False
+            self.running = True
+            self._save_state()
+        self.thread = threading.Thread(target=self._loop, name='scheduler', daemon=True)
+        self.thread.start()
+        return True
+
+    def stop(self):
+        with self.condition:
+            self.running = False
+            self._save_state()
+            self.condition.notify_all()
+        if self.thread and self.thread.is_alive():
+            self.thread.join(timeout=2)
+        self.thread = None
+
+    def _loop(self):
+        with self.condition:
+            while self.running:
+                now = datetime.now()
+                for job in self.jobs.values():
+                    if job.next_run and job.next_run <= now:
+                        self._dispatch(job, now)
+
+                upcoming = [job.next_run for job in self.jobs.values() if job.next_run]
+                timeout = (min(upcoming) - datetime.now()).total_seconds() if upcoming else MAX_WAIT
+                # Sleep until the next job is due; set_jobs() and stop() wake us early. Times are local
+                # wall-clock times, so wake at least every MAX_WAIT to notice DST and clock changes
+                self.condition.wait(timeout=min(max(0, timeout), MAX_WAIT))
+
+    def _dispatch(self, job: ScheduledJob, now: datetime):
+        # The next slot is planned from now, so a backlog of missed slots collapses into one run
+        job.plan_next(now)
+        if job.running:
+            print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Skipping scheduled run of {job.name}: previous run still in progress")
+        else:
+            job.running = True
+            job.last_run = now
+            threading.Thread(target=self._run_job, args=(job,), name=f"scheduled-{job.name}", daemon=True).start()
+        self._save_state()
+
+    def _run_job(self, job: ScheduledJob):
+        print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Scheduled run: {job.name}")
+        try:
+            job.action()
+        except Exception as e:
+            print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Scheduled run of {job.name} failed: {str(e)}")
+        finally:
+            with self.condition:
+                job.running = False
+
+    def get_jobs(self) -> List[Dict[str, Any]]:
+        with self.condition:
+            return [job.to_dict() for job in self.jobs.values()]
@@ -1,27 +1,95 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Iterator, Optional
 from .base_scraper import BaseScraper
-import schedule
+from .async_base_scraper import AsyncBaseScraper, as_async
+from .cursor_store import CursorStore
+from .pipeline import Pipeline, batch_stage, filter_stage, map_stage, chunked
+from .scheduler import Scheduler, ScheduledJob, parse_schedule
+from config.settings import settings
+from api.events import get_event_bus
+from api.metrics import get_metrics
+from storage.dedup_index import DedupIndex
+from storage.catalog import get_catalog
+from storage.columnar_export import columnar_filename, write_items
+from storage.document_store import get_document_store
+from storage.item_store import ItemStore
+from storage.items import iter_document_items
+from storage.spool import ItemSpool
+from storage.state_store import StateStore
+import asyncio
+import heapq
+from contextlib import ExitStack
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 import time
 import threading
 from datetime import datetime
 import json
 import os
+import socket
+import uuid
+
+
+# Items per dedup lookup, and per seen-index / item-store transaction, in the ingest pipeline
+DEDUP_BATCH_SIZE = 500
+PERSIST_BATCH_SIZE = 5000
+# Items sorted in memory at a time when building a batch's chronological view
+SORT_BUFFER_SIZE = 10000
+# Seconds a shared-mode scraper lease lasts unrenewed; running scrapers renew it every third of that
+SCRAPER_LEASE_TTL = 60
+
+SCRAPER_RUNS = get_metrics().counter('scraper_runs_total', 'Finished scraper runs by result status', ('source', 'status'))
+SCRAPER_RUN_SECONDS = get_metrics().histogram('scraper_run_seconds', 'Wall time of one scraper run', ('source',))
+STAGE_SECONDS = get_metrics().histogram('pipeline_stage_seconds', 'Time spent in each ingest pipeline stage per run',
+                                        ('source', 'stage'))
+STAGE_ITEMS = get_metrics().counter('pipeline_items_total', 'Items leaving each ingest pipeline stage', ('source', 'stage'))
+STAGE_DROPPED = get_metrics().counter('pipeline_dropped_total', 'Items dropped by a pipeline stage (invalid, filtered, duplicate)',
+                                      ('source', 'stage'))
 
 
 class ScraperManager:
+    """Registers scrapers, runs them, and keeps the run history and schedule
     
-    def __init__(self):
+    With a ``state_store`` the manager runs in shared mode: runtime config,
+    results history, the scheduler switch and status snapshots live in the
+    store so an API process (``role='api'``) and scrape workers
+    (``role='worker'``) see the same state.
+    """
+    
+    def __init__(self, state_store: StateStore = None, role: str = 'standalone'):
+        self.state_store = state_store
+        self.role = role
+        self.config_version = None
         self.scrapers: Dict[str, BaseScraper] = {}
         self.is_running = False
-        self.scheduler_thread = None
+        self.scheduler = Scheduler('data/scheduler_state.json')
         self.last_run = None
         self.results = []
+        # Bumped on every change visible in get_status(); used as the /api/status ETag
+        self.state_version = 0
+        self.state_updated_at = datetime.now()
+        self._state_lock = threading.Lock()
+        # Scrapers with a run in progress: scheduled, batch and run-now runs share one instance.
+        # In shared mode each busy scraper also holds a 'scraper:<name>' lease so other workers skip it
+        self._busy = set()
+        self._busy_lock = threading.Lock()
+        self.lease_owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._lease_thread = None
+        self.events = get_event_bus()
         self.config_file = 'data/scraper_config.json'
         self.history_file = 'data/results_history.json'
+        self.cursor_store = CursorStore('data/scraper_cursors.json')
+        self.dedup_index = DedupIndex('data/seen_items.db', settings.dedup_retention_days) if settings.dedup_enabled else None
+        self.item_store = ItemStore('data/items.db') if settings.item_store_enabled else None
+        self.catalog = get_catalog()
         self.load_runtime_config()
         self.load_results_history()
         
     def load_runtime_config(self):
+        if self.state_store:
+            record = self.state_store.get_with_time('scraper_config')
+            if record is not None:
+                self.runtime_config = record['value']
+                self.config_version = record['updated_at']
+                return
         if os.path.exists(self.config_file):
             try:
                 with open(self.config_file, 'r') as f:
@@ -30,20 +98,29 @@ class ScraperManager:
                 self.runtime_config = {}
         else:
             self.runtime_config = {}
+        if self.state_store and self.runtime_config:
+            # First start in shared mode: the config file seeds the store
+            self.save_runtime_config()
     
     def load_results_history(self):
         """Load previous results from history file on startup"""
+        if self.state_store:
+            self.results = self.state_store.get_results()
+            last_run = self.state_store.get('last_run')
+            self.last_run = datetime.fromisoformat(last_run) if last_run else None
+            if self.results or last_run:
+                return
         if os.path.exists(self.history_file):
             try:
                 with open(self.history_file, 'r') as f:
                     history = json.load(f)
                     self.results = history.get('results', [])
                     
-                    # Validate that referenced files still exist
+                    # Validate that referenced files still exist (one catalog scan, not a lookup per result)
                     valid_results = []
                     for result in self.results:
                         # Keep results without files (errors) or with existing files
-                        if not result.get('filename') or os.path.exists(f"data/{result['filename']}"):
+                        if not result.get('filename') or self.catalog.exists(result['filename']):
                             valid_results.append(result)
                         else:
                             print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Removing result with missing file: {result.get('filename')}")
@@ -55,14 +132,30 @@ class ScraperManager:
                         self.last_run = datetime.fromisoformat(history['last_run'])
                     
                     print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Loaded {len(self.results)} results from history")
+                    if self.state_store:
+                        self.state_store.replace_results(self.results)
+                        self.state_store.set('last_run', history.get('last_run'))
             except Exception as e:
                 print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Error loading results history: {str(e)}")
                 self.results = []
         else:
             print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] No results history found, starting fresh")
     
+    def _record_results(self, entries: List[Dict[str, Any]]):
+        """Append run results to the history, keeping the last 15 (batch + individual results)"""
+        self.last_run = datetime.now()
+        if self.state_store:
+            # Several workers may record at once; the store appends atomically
+            self.results = self.state_store.append_results(entries, keep=15)
+            self.state_store.set('last_run', self.last_run.isoformat())
+        else:
+            self.results = (self.results + entries)[-15:]
+    
     def save_results_history(self):
         """Save current results to history file for persistence"""
+        if self.state_store:
+            self.touch()
+            return
         try:
             os.makedirs('data', exist_ok=True)
             history = {
@@ -73,24 +166,78 @@ class ScraperManager:
             
             with open(self.history_file, 'w') as f:
                 json.dump(history, f, indent=2, default=str)
+            self.touch()
             
             print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Saved {len(self.results)} results to history")
         except Exception as e:
             print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Error saving results history: {str(e)}")
     
+    def touch(self):
+        """Record that status-visible state changed"""
+        with self._state_lock:
+            self.state_version += 1
+            self.state_updated_at = datetime.now()
+            version = self.state_version
+        if self.state_store:
+            if self.role == 'worker':
+                # Snapshots of what only the worker knows, for the API's /api/status
+                self.state_store.set('scrapers_info', self.get_all_scrapers_info())
+                self.state_store.set('schedule', self.scheduler.get_jobs() if self.is_running else [])
+            version = self.state_store.increment('state_version')
+        self.events.publish('status', version=version)
+    
+    def get_state_version(self):
+        """(version, updated_at) of status-visible state, for the /api/status ETag"""
+        if self.state_store:
+            record = self.state_store.get_with_time('state_version')
+            if record:
+                return record['value'], datetime.fromtimestamp(record['updated_at'])
+        with self._state_lock:
+            return self.state_version, self.state_updated_at
+    
+    def sync_shared_state(self):
+        """Apply scraper config changed through the API process (worker side of shared mode)"""
+        record = self.state_store.get_with_time('scraper_config')
+        if record is None or record['updated_at'] == self.config_version:
+            return
+        self.config_version = record['updated_at']
+        changed = [name for name, config in record['value'].items()
+                   if config != self.runtime_config.get(name) and name in self.scrapers]
+        self.runtime_config = record['value']
+        for name in changed:
+            if hasattr(self.scrapers[name], 'update_config'):
+                self.scrapers[name].update_config(self.runtime_config[name])
+        if changed:
+            print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Applied config changes for {', '.join(changed)}")
+            self._reschedule()
+            self.touch()
+    
     def save_runtime_config(self):
+        if self.state_store:
+            self.state_store.set('scraper_config', self.runtime_config)
+            self.config_version = self.state_store.get_with_time('scraper_config')['updated_at']
+            return
         os.makedirs(os.path.dirname(self.config_file), exist_ok=True)
         with open(self.config_file, 'w') as f:
             json.dump(self.runtime_config, f, indent=2)
     
     def register_scraper(self, scraper: BaseScraper):
         self.scrapers[scraper.name] = scraper
+        scraper.cursor_store = self.cursor_store
+        scraper.on_progress = lambda stats, name=scraper.name: self.events.publish(
+            'scraper_progress', scraper=name,
+            new_count=stats.get('new_count', 0), skipped_count=stats.get('skipped_count', 0)
+        )
         if scraper.name in self.runtime_config:
             scraper.update_config(self.runtime_config[scraper.name])
+        self._reschedule()
+        self.touch()
         
     def remove_scraper(self, scraper_name: str):
         if scraper_name in self.scrapers:
             del self.scrapers[scraper_name]
+            self._reschedule()
+            self.touch()
     
     def normalize_timestamp(self, source: str, item: Dict[str, Any]) -> str:
         """Normalize timestamps from different sources to ISO format"""
@@ -109,22 +256,64 @@ class ScraperManager:
         except Exception:
             return datetime.now().isoformat()
     
-    def create_batch_file(self, individual_results: List[Dict[str, Any]]) -> str:
-        """Creates a merged JSON file from individual scraper results"""
-        batch_data = {
-            "metadata": {
-                "run_timestamp": datetime.now().isoformat(),
-                "run_type": "batch",
-                "total_items": 0,
-                "sources": [],
-                "summary": {}
-            },
-            "by_source": {},
-            "chronological": []
+    def _items_section(self, scraper_name: str, sections: Dict[str, int]) -> Optional[str]:
+        """Name of the item list among one scraper document's sections"""
+        preferred = {'reddit': 'posts', 'twitter': 'tweets'}.get(scraper_name)
+        for name in (preferred, 'data'):
+            if name in sections:
+                return name
+        return None
+    
+    def _sorted_runs(self, scraper_name: str, items: Iterable[Dict[str, Any]], stack: ExitStack) -> List[ItemSpool]:
+        """Chronological entries for one source, as time-sorted runs spilled to disk
+        
+        Only SORT_BUFFER_SIZE items are held at once; the runs are merged afterwards.
+        """
+        runs = []
+        for chunk in chunked(items, SORT_BUFFER_SIZE):
+            # sorted() is stable, so items with equal timestamps keep their order
+            entries = sorted(
+                ({"source": scraper_name, "timestamp": self.normalize_timestamp(scraper_name, item), "data": item}
+                 for item in chunk),
+                key=lambda entry: entry['timestamp']
+            )
+            run = stack.enter_context(ItemSpool('data'))
+            run.extend(entries)
+            runs.append(run)
+        return runs
+    
+    def _merge_chronological(self, runs: List[ItemSpool]) -> Iterator[Dict[str, Any]]:
+        """k-way merge of the time-sorted runs, holding one entry per run in memory"""
+        return heapq.merge(*runs, key=lambda entry: entry['timestamp'])
+    
+    @staticmethod
+    def _spool_through(entries: Iterable[Dict[str, Any]], spool: ItemSpool) -> Iterator[Dict[str, Any]]:
+        for entry in entries:
+            spool.append(entry)
+            yield entry
+    
+    def create_batch_file(self, individual_results: List[Dict[str, Any]],
+                          documents: Dict[str, Dict[str, Any]] = None) -> str:
+        """Creates a merged JSON file from individual scraper results
+        
+        Items are streamed from the exported documents; memory holds at most one
+        sort buffer, whatever the size of the run. ``documents`` holds the
+        skeletons of documents just exported, keyed by scraper name, so they
+        need not be read back.
+        """
+        documents = documents or {}
+        store = get_document_store()
+        metadata = {
+            "run_timestamp": datetime.now().isoformat(),
+            "run_type": "batch",
+            "total_items": 0,
+            "sources": [],
+            "summary": {}
         }
         
         successful_scrapers = []
         failed_scrapers = []
+        sources = {}
         
         # Process each scraper's results
         for result in individual_results:
@@ -134,64 +323,82 @@ class ScraperManager:
                 failed_scrapers.append(scraper_name)
                 continue
             
-            successful_scrapers.append(scraper_name)
-            batch_data["metadata"]["sources"].append(scraper_name)
-            
-            # Read the individual scraper's data file
             try:
-                filepath = f"data/{result['filename']}"
-                with open(filepath, 'r') as f:
-                    scraper_data = json.load(f)
-                
-                # Add to by_source section (preserving original structure)
-                batch_data["by_source"][scraper_name] = scraper_data
-                
-                # Extract actual data array based on scraper type
-                data_items = []
-                if scraper_name == 'reddit' and 'posts' in scraper_data:
-                    data_items = scraper_data['posts']
-                elif scraper_name == 'twitter' and 'tweets' in scraper_data:
-                    data_items = scraper_data['tweets']
-                elif 'data' in scraper_data:
-                    data_items = scraper_data['data']
-                
-                # Add to chronological view with normalized timestamps
-                for item in data_items:
-                    batch_data["chronological"].append({
-                        "source": scraper_name,
-                        "timestamp": self.normalize_timestamp(scraper_name, item),
-                        "data": item
-                    })
-                
-                batch_data["metadata"]["total_items"] += len(data_items)
-                
+                skeleton = documents.get(scraper_name)
+                if skeleton is None:
+                    skeleton = store.read_skeleton(result['filename'])
+                section_counts = store.list_sections(result['filename'])
             except Exception as e:
                 print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Error reading {result['filename']}: {str(e)}")
                 failed_scrapers.append(scraper_name)
-        
-        # Sort chronological by timestamp
-        batch_data["chronological"].sort(key=lambda x: x['timestamp'])
+                continue
+            
+            successful_scrapers.append(scraper_name)
+            metadata["sources"].append(scraper_name)
+            sources[scraper_name] = (result['filename'], skeleton, section_counts)
+            items_section = self._items_section(scraper_name, section_counts)
+            metadata["total_items"] += section_counts[items_section] if items_section else 0
         
         # Update metadata summary
-        batch_data["metadata"]["summary"] = {
+        metadata["summary"] = {
             "successful_scrapers": successful_scrapers,
             "failed_scrapers": failed_scrapers,
             "success_rate": f"{len(successful_scrapers)}/{len(individual_results)}"
         }
         
-        # Save the batch file
         filename = f"batch_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        filepath = f"data/{filename}"
-        
-        with open(filepath, 'w') as f:
-            json.dump(batch_data, f, indent=2, default=str)
+        with ExitStack() as stack:
+            # by_source keeps each document's original structure; its item lists are
+            # streamed from the store into the writer rather than copied
+            skeleton = {"metadata": metadata, "by_source": {}, "chronological": []}
+            sections = {}
+            runs = []
+            for scraper_name, (source_filename, source_skeleton, section_counts) in sources.items():
+                skeleton["by_source"][scraper_name] = source_skeleton
+                for section in section_counts:
+                    sections[("by_source", scraper_name) + tuple(section.split('.'))] = \
+                        store.iter_section(source_filename, section)
+                items_section = self._items_section(scraper_name, section_counts)
+                if items_section:
+                    runs.extend(self._sorted_runs(scraper_name, store.iter_section(source_filename, items_section), stack))
+            
+            # Merged once; the columnar export reads the merged entries back from a spool
+            chronological = self._merge_chronological(runs)
+            merged = stack.enter_context(ItemSpool('data')) if settings.columnar_export else None
+            if merged is not None:
+                chronological = self._spool_through(chronological, merged)
+            sections[("chronological",)] = chronological
+            
+            # Save the batch file
+            store.write_stream(filename, skeleton, sections)
+            self.catalog.record(filename)
+            if merged is not None:
+                self._export_columnar(filename, {"chronological": merged})
         
+        self.events.publish('file_written', scraper='Run All', filename=filename, data_count=metadata["total_items"])
         print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Created batch file: {filename}")
         return filename
         
-    def run_all_scrapers(self) -> List[Dict[str, Any]]:
+    def _export_columnar(self, filename: str, document: Dict[str, Any], scraper: BaseScraper = None):
+        """Write the Parquet/Arrow twin of a result file; a failure never fails the run"""
+        fmt = settings.columnar_export
+        try:
+            if scraper:
+                scraper.export_to_columnar(document, columnar_filename(filename, fmt), fmt)
+            else:
+                write_items(os.path.join('data', columnar_filename(filename, fmt)), iter_document_items(document), fmt)
+            self.catalog.record(columnar_filename(filename, fmt))
+        except Exception as e:
+            print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Error writing {fmt} export for {filename}: {str(e)}")
+        
+    def run_all_scrapers(self, scraper_names: List[str] = None) -> List[Dict[str, Any]]:
+        """Run every enabled scraper (or only ``scraper_names``) and combine their results into a batch"""
         print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Beginning data scraping process...")
+        self.touch()
+        run_started = time.monotonic()
         results = []
+        # Skeletons of the exported documents, so the batch file only re-reads their items
+        documents = {}
         
         if not self.scrapers:
             print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] No scrapers registered - placeholder run")
@@ -203,62 +410,38 @@ class ScraperManager:
                 "timestamp": datetime.now().isoformat()
             })
         else:
-            for name, scraper in self.scrapers.items():
-                if hasattr(scraper, 'config') and not scraper.config.get('enabled', True):
-                    continue
-                print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Running scraper: {name}")
-                try:
-                    raw_data = scraper.scrape()
-                    if scraper.validate_data(raw_data):
-                        filtered_data = scraper.filter_data(raw_data)
-                        formatted_data = scraper.convert_to_common_format(filtered_data)
-                        filename = scraper.export_to_json(formatted_data)
-                        
-                        results.append({
-                            "scraper": scraper.name,
-                            "status": "success",
-                            "data_count": len(filtered_data),
-                            "filename": filename,
-                            "timestamp": datetime.now().isoformat()
-                        })
-                        print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] {scraper.name} completed: {len(filtered_data)} items")
-                    else:
-                        results.append({
-                            "scraper": scraper.name,
-                            "status": "validation_failed",
-                            "timestamp": datetime.now().isoformat()
-                        })
-                        print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] {scraper.name} validation failed")
-                except Exception as e:
-                    results.append({
-                        "scraper": scraper.name,
-                        "status": "error",
-                        "error": str(e),
-                        "timestamp": datetime.now().isoformat()
-                    })
-                    print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] {scraper.name} error: {str(e)}")
-        
-        self.last_run = datetime.now()
+            enabled_scrapers = [
+                scraper for scraper in self.scrapers.values()
+                if not (hasattr(scraper, 'config') and not scraper.config.get('enabled', True))
+                and (scraper_names is None or scraper.name in scraper_names)
+            ]
+            self.events.publish('run_started', run_type='batch', scrapers=[scraper.name for scraper in enabled_scrapers])
+            
+            if settings.scraper_engine == 'async':
+                results = asyncio.run(self._run_scrapers_async(enabled_scrapers, documents))
+            else:
+                results = self._run_scrapers_parallel(enabled_scrapers, documents)
+            
+            for result in results:
+                self._log_result(result)
         
         # For run-all operations, create a combined result entry
         if len(results) > 1:
-            # Add individual results
-            self.results.extend(results)
             
             # Create batch file with merged data
             batch_filename = None
             if any(r['status'] == 'success' for r in results):
                 try:
-                    batch_filename = self.create_batch_file(results)
+                    batch_filename = self.create_batch_file(results, documents)
                 except Exception as e:
                     print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Error creating batch file: {str(e)}")
             
             # Create combined "Run All" result
             total_items = sum(r.get('data_count', 0) for r in results if r['status'] == 'success')
             successful_scrapers = [r['scraper'] for r in results if r['status'] == 'success']
-            failed_scrapers = [r['scraper'] for r in results if r['status'] != 'success']
+            failed_scrapers = [r['scraper'] for r in results if r['status'] not in ('success', 'no_new_data')]
             
-            combined_status = 'success' if all(r['status'] == 'success' for r in results) else 'partial_success' if successful_scrapers else 'error'
+            combined_status = 'success' if not failed_scrapers and successful_scrapers else 'partial_success' if successful_scrapers else 'no_new_data' if not failed_scrapers else 'error'
             
             combined_result = {
                 "scraper": "Run All",
@@ -267,19 +450,19 @@ class ScraperManager:
                 "failed_scrapers": failed_scrapers,
                 "status": combined_status,
                 "data_count": total_items,
+                "new_count": sum(r.get('new_count', 0) for r in results),
+                "skipped_count": sum(r.get('skipped_count', 0) for r in results),
                 "filename": batch_filename,  # Add the batch filename for view/download
                 "timestamp": datetime.now().isoformat(),
+                "duration": round(time.monotonic() - run_started, 3),
                 "run_type": "batch"
             }
             
-            self.results.append(combined_result)
+            self._record_results(results + [combined_result])
+            self.events.publish('run_finished', run_type='batch', result=combined_result)
         else:
             # Single scraper run
-            self.results.extend(results)
-        
-        # Keep only last 15 results (increased to accommodate batch + individual results)
-        if len(self.results) > 15:
-            self.results = self.results[-15:]
+            self._record_results(results)
         
         # Save results history for persistence across restarts
         self.save_results_history()
@@ -287,29 +470,376 @@ class ScraperManager:
         print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Scraping process completed. Total results: {len(results)}")
         return results
     
-    def _scheduled_run(self):
-        while self.is_running:
-            schedule.run_pending()
-            time.sleep(1)
+    def _scraper_timeout(self, scraper: BaseScraper) -> float:
+        return float(getattr(scraper, 'config', {}).get('timeout', settings.scraper_timeout))
+    
+    def _run_scrapers_parallel(self, scrapers: List[BaseScraper],
+                               documents: Dict[str, Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Run sync scrapers on a thread pool, each against its own wall-clock timeout
+        
+        Results are collected as scrapers finish. A scraper that overruns gets an
+        error result and is cancelled at its next request; the others carry on.
+        """
+        if not scrapers:
+            return []
+        results: Dict[str, Dict[str, Any]] = {}
+        started: Dict[str, float] = {}
+        # One cancel token per run, set by the deadline check below
+        tokens = {scraper.name: threading.Event() for scraper in scrapers}
+        
+        def run(scraper: BaseScraper) -> Dict[str, Any]:
+            started[scraper.name] = time.monotonic()
+            print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Running scraper: {scraper.name}")
+            return self._run_scraper(scraper, documents, tokens[scraper.name])
+        
+        executor = ThreadPoolExecutor(max_workers=settings.scraper_workers or len(scrapers), thread_name_prefix='scraper')
+        futures = {executor.submit(run, scraper): scraper for scraper in scrapers}
+        pending = set(futures)
+        try:
+            while pending:
+                # Deadlines start when a scraper gets a thread, not when it is queued
+                deadlines = {
+                    future: started[futures[future].name] + self._scraper_timeout(futures[future])
+                    for future in pending if futures[future].name in started
+                }
+                wait_for = min(deadlines.values(), default=time.monotonic() + 1) - time.monotonic()
+                done, pending = wait(pending, timeout=max(0, min(wait_for, 1)), return_when=FIRST_COMPLETED)
+                
+                for future in done:
+                    scraper = futures[future]
+                    try:
+                        results[scraper.name] = future.result()
+                    except Exception as e:
+                        results[scraper.name] = self._finish_scraper(self._error_result(scraper, str(e)), started.get(scraper.name))
+                
+                now = time.monotonic()
+                for future in [future for future in pending if future in deadlines and deadlines[future] <= now]:
+                    scraper = futures[future]
+                    tokens[scraper.name].set()
+                    pending.discard(future)
+                    timeout = self._scraper_timeout(scraper)
+                    print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] {scraper.name} timed out after {timeout}s, cancelling")
+                    results[scraper.name] = self._finish_scraper(
+                        self._error_result(scraper, f"Timed out after {timeout}s"), started[scraper.name]
+                    )
+        finally:
+            # Timed-out threads are not waited for; they stop at their next cancellation check
+            executor.shutdown(wait=False, cancel_futures=True)
+        
+        return [results[scraper.name] for scraper in scrapers]
+    
+    async def _run_scrapers_async(self, scrapers: List[BaseScraper],
+                                  documents: Dict[str, Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Run every scraper on one event loop so the total time tracks the slowest source"""
+        return list(await asyncio.gather(*(self._run_scraper_async(scraper, documents) for scraper in scrapers)))
+    
+    async def _run_scraper_async(self, scraper: BaseScraper,
+                                 documents: Dict[str, Dict[str, Any]] = None) -> Dict[str, Any]:
+        timeout = self._scraper_timeout(scraper)
+        print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Running scraper: {scraper.name}")
+        started = time.monotonic()
+        cancel = threading.Event()
+        
+        if not isinstance(scraper, AsyncBaseScraper):
+            # Sync scrapers run whole in the default executor; on timeout they are cancelled at their
+            # next request, and stay busy until their thread has actually stopped
+            try:
+                return await asyncio.wait_for(asyncio.to_thread(self._run_scraper, scraper, documents, cancel), timeout)
+            except asyncio.TimeoutError:
+                cancel.set()
+                return self._finish_scraper(self._error_result(scraper, f"Timed out after {timeout}s"), started)
+        
+        if not self._claim(scraper):
+            return self._busy_result(scraper)
+        try:
+            self.events.publish('scraper_started', scraper=scraper.name)
+            scraper.cancel_event = cancel
+            try:
+                raw_data = await asyncio.wait_for(as_async(scraper).scrape(), timeout)
+            except asyncio.TimeoutError:
+                cancel.set()
+                return self._finish_scraper(self._error_result(scraper, f"Timed out after {timeout}s"), started)
+            except Exception as e:
+                return self._finish_scraper(self._error_result(scraper, str(e)), started)
+            
+            # Validation and export are blocking file work, keep them off the loop
+            return self._finish_scraper(await asyncio.to_thread(self._process_scraped, scraper, raw_data, documents), started)
+        finally:
+            self._release(scraper)
+    
+    def _log_result(self, result: Dict[str, Any]):
+        if result['status'] == 'error':
+            print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] {result['scraper']} error: {result['error']}")
+        elif result['status'] == 'success':
+            print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] {result['scraper']} completed: {result['data_count']} items")
+        else:
+            print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] {result['scraper']} {result['status'].replace('_', ' ')}")
+    
+    def _error_result(self, scraper: BaseScraper, error: str) -> Dict[str, Any]:
+        return {
+            "scraper": scraper.name,
+            "status": "error",
+            "error": error,
+            "timestamp": datetime.now().isoformat()
+        }
+    
+    def _claim(self, scraper: BaseScraper) -> bool:
+        """Mark a scraper busy; False if a run of it is already in progress here or in another worker"""
+        with self._busy_lock:
+            if scraper.name in self._busy:
+                return False
+            if self.state_store and not self.state_store.acquire_lease(f"scraper:{scraper.name}", self.lease_owner,
+                                                                       SCRAPER_LEASE_TTL):
+                return False
+            self._busy.add(scraper.name)
+            if self.state_store and self._lease_thread is None:
+                self._lease_thread = threading.Thread(target=self._renew_leases, name='scraper-leases', daemon=True)
+                self._lease_thread.start()
+            return True
+    
+    def _release(self, scraper: BaseScraper):
+        with self._busy_lock:
+            self._busy.discard(scraper.name)
+            if self.state_store:
+                self.state_store.release_lease(f"scraper:{scraper.name}", self.lease_owner)
+    
+    def _renew_leases(self):
+        """Keep the leases of running scrapers alive; exits once none are running"""
+        while True:
+            time.sleep(SCRAPER_LEASE_TTL / 3)
+            with self._busy_lock:
+                if not self._busy:
+                    self._lease_thread = None
+                    return
+                for name in self._busy:
+                    if not self.state_store.acquire_lease(f"scraper:{name}", self.lease_owner, SCRAPER_LEASE_TTL):
+                        print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Lost the lease on {name} to another worker")
+    
+    def _busy_result(self, scraper: BaseScraper) -> Dict[str, Any]:
+        print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Skipping {scraper.name}: previous run still in progress")
+        return self._error_result(scraper, "Already running")
+    
+    def _run_scraper(self, scraper: BaseScraper, documents: Dict[str, Dict[str, Any]] = None,
+                     cancel: threading.Event = None) -> Dict[str, Any]:
+        """Scrape, validate, filter and export one scraper's data into a result entry
+        
+        A scraper already running (scheduled, in a batch or run on demand, in
+        this process or in another worker) is not started again; that includes
+        a timed-out run that has not stopped yet.
+        ``cancel`` is this run's cancel token, set by whoever enforces its deadline.
+        """
+        if not self._claim(scraper):
+            return self._busy_result(scraper)
+        try:
+            self.events.publish('scraper_started', scraper=scraper.name)
+            # Installed only once the scraper is ours, so no other run's token is replaced
+            scraper.cancel_event = cancel = cancel or threading.Event()
+            started = time.monotonic()
+            try:
+                if isinstance(scraper, AsyncBaseScraper):
+                    items = asyncio.run(scraper.scrape())
+                else:
+                    # Sync scrapers are consumed lazily: items stream through the pipeline as they are fetched
+                    items = scraper.iter_items()
+            except Exception as e:
+                if cancel.is_set():
+                    return self._error_result(scraper, "Cancelled")
+                return self._finish_scraper(self._error_result(scraper, str(e)), started)
+            result = self._process_scraped(scraper, items, documents)
+            if cancel.is_set():
+                # The run already reported a timeout; nothing was exported and cursors did not advance
+                return self._error_result(scraper, "Cancelled")
+            return self._finish_scraper(result, started)
+        finally:
+            self._release(scraper)
+    
+    def _finish_scraper(self, result: Dict[str, Any], started: float = None) -> Dict[str, Any]:
+        if started is not None:
+            result['duration'] = round(time.monotonic() - started, 3)
+            SCRAPER_RUN_SECONDS.observe(result['duration'], source=result['scraper'])
+        SCRAPER_RUNS.inc(source=result['scraper'], status=result['status'])
+        self.events.publish('scraper_finished', result=result)
+        self.touch()
+        return result
+    
+    def _build_pipeline(self, scraper: BaseScraper, counters: Dict[str, int]) -> Pipeline:
+        """validate → filter → dedup → enrich; persisting happens on the pipeline's output"""
+        pipeline = Pipeline([
+            ('validate', filter_stage(scraper.validate_item)),
+            ('filter', scraper.iter_filter)
+        ])
+        if self.dedup_index:
+            def drop_seen(batch: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+                fresh, duplicates = self.dedup_index.filter_new(scraper.name, batch)
+                counters['duplicate_count'] += duplicates
+                return fresh
+            pipeline.add('dedup', batch_stage(drop_seen, DEDUP_BATCH_SIZE))
+        pipeline.add('enrich', map_stage(scraper.enrich_item))
+        return pipeline
+    
+    def _process_scraped(self, scraper: BaseScraper, items: Iterable[Dict[str, Any]],
+                         documents: Dict[str, Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Stream scraped items through the ingest pipeline and export the survivors
+        
+        Items are spooled to disk on their way to the document store, so memory
+        stays flat however large the crawl. ``documents`` (the Run All batch)
+        receives the exported document's skeleton.
+        """
+        counters = {'duplicate_count': 0}
+        pipeline = self._build_pipeline(scraper, counters)
+        try:
+            with ItemSpool('data') as spool:
+                spool.extend(pipeline.run(items, source='scrape'))
+                run_stats = dict(scraper.run_stats)
+                stages = pipeline.report()
+                scraped = stages['scrape']['items_out']
+                invalid_count = stages['validate']['items_in'] - stages['validate']['items_out']
+                
+                if not spool:
+                    # APIs that filter by cursor themselves (Twitter's since_id) return nothing, not skipped items
+                    caught_up = scraped or run_stats.get('skipped_count') or scraper.has_cursors()
+                    if (scraped and invalid_count == scraped) or not caught_up:
+                        return {
+                            "scraper": scraper.name,
+                            "status": "validation_failed",
+                            "invalid_count": invalid_count,
+                            "timestamp": datetime.now().isoformat()
+                        }
+                    # Incremental run where every item was already stored
+                    scraper.commit_cursors()
+                    return {
+                        "scraper": scraper.name,
+                        "status": "no_new_data",
+                        "data_count": 0,
+                        "new_count": 0,
+                        "skipped_count": run_stats.get('skipped_count', 0),
+                        "duplicate_count": counters['duplicate_count'],
+                        "timestamp": datetime.now().isoformat()
+                    }
+                
+                # A run that timed out while streaming must not export partial data
+                scraper.check_cancelled()
+                export_started = time.perf_counter()
+                formatted_data = scraper.convert_to_common_format(spool)
+                skeleton = {key: [] if value is spool else value for key, value in formatted_data.items()}
+                sections = {(key,): spool for key, value in formatted_data.items() if value is spool}
+                filename = scraper.export_stream(skeleton, sections)
+                self.catalog.record(filename)
+                if settings.columnar_export:
+                    self._export_columnar(filename, formatted_data, scraper)
+                pipeline.record('export', len(spool), time.perf_counter() - export_started)
+                if documents is not None:
+                    # The batch file streams the items back from the store; only the skeleton is kept
+                    documents[scraper.name] = skeleton
+                self.events.publish('file_written', scraper=scraper.name, filename=filename, data_count=len(spool))
+                
+                # Cursors and the seen index only advance once the new items are safely on disk
+                scraper.commit_cursors()
+                persist_started = time.perf_counter()
+                for batch in chunked(spool, PERSIST_BATCH_SIZE):
+                    if self.dedup_index:
+                        self.dedup_index.mark_seen(scraper.name, batch)
+                    if self.item_store:
+                        try:
+                            self.item_store.add_items(scraper.name, batch, filename)
+                        except Exception as e:
+                            print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Error indexing {scraper.name} items: {str(e)}")
+                pipeline.record('persist', len(spool), time.perf_counter() - persist_started)
+                
+                result = {
+                    "scraper": scraper.name,
+                    "status": "success",
+                    "data_count": len(spool),
+                    "new_count": run_stats.get('new_count', scraped),
+                    "skipped_count": run_stats.get('skipped_count', 0),
+                    "duplicate_count": counters['duplicate_count'],
+                    "invalid_count": invalid_count,
+                    "filename": filename,
+                    "timestamp": datetime.now().isoformat(),
+                    "pipeline": pipeline.report()
+                }
+            
+            # Scraper-specific run details such as Twitter's query budget usage
+            for key, value in run_stats.items():
+                result.setdefault(key, value)
+            return result
+        except Exception as e:
+            return self._error_result(scraper, str(e))
+        finally:
+            self._observe_pipeline(scraper.name, pipeline.report())
+    
+    def _observe_pipeline(self, source: str, stages: Dict[str, Dict[str, Any]]):
+        for stage, stats in stages.items():
+            STAGE_SECONDS.observe(stats['seconds'], source=source, stage=stage)
+            STAGE_ITEMS.inc(stats['items_out'], source=source, stage=stage)
+            if stats['items_in'] > stats['items_out']:
+                STAGE_DROPPED.inc(stats['items_in'] - stats['items_out'], source=source, stage=stage)
+    
+    def _build_jobs(self) -> List[ScheduledJob]:
+        """One job per scraper with its own 'schedule' config, plus a batch job for the rest"""
+        jobs = []
+        unscheduled = []
+        for name, scraper in self.scrapers.items():
+            config = getattr(scraper, 'config', {})
+            if not config.get('enabled', True):
+                continue
+            if config.get('schedule'):
+                try:
+                    jobs.append(ScheduledJob(name, config['schedule'], lambda name=name: self.run_single_scraper(name),
+                                             settings.schedule_jitter))
+                    continue
+                except ValueError as e:
+                    print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Invalid schedule for {name}, using default: {str(e)}")
+            unscheduled.append(name)
+        
+        if unscheduled:
+            jobs.append(ScheduledJob('default', settings.schedule, lambda: self.run_all_scrapers(unscheduled),
+                                     settings.schedule_jitter))
+        return jobs
+    
+    def _reschedule(self):
+        if self.is_running:
+            self.scheduler.set_jobs(self._build_jobs())
+    
+    def scheduler_enabled(self) -> bool:
+        if self.role == 'api':
+            return bool(self.state_store.get('scheduler_enabled', False))
+        return self.is_running
+    
+    def set_scheduler_enabled(self, enabled: bool) -> bool:
+        """Switch the schedule on or off; in shared mode the worker holding the scheduler lease follows"""
+        if self.role == 'api':
+            if self.scheduler_enabled() == enabled:
+                return False
+            self.state_store.set('scheduler_enabled', enabled)
+            self.touch()
+            return True
+        if enabled:
+            return self.start_scheduler()
+        self.stop_scheduler()
+        return True
     
     def start_scheduler(self):
         if not self.is_running:
             self.is_running = True
-            schedule.clear()
-            schedule.every().day.at("12:00").do(self.run_all_scrapers)
-            self.scheduler_thread = threading.Thread(target=self._scheduled_run)
-            self.scheduler_thread.daemon = True
-            self.scheduler_thread.start()
-            print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Scheduler started - will run daily at 12:00 PM")
+            self.scheduler.set_jobs(self._build_jobs())
+            self.scheduler.start()
+            self.touch()
+            for job in self.scheduler.get_jobs():
+                print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Scheduled {job['name']} ({job['schedule']}), next run {job['next_run']}")
+            print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Scheduler started")
             return True
         return False
     
+    def resume_scheduler(self):
+        """Restart the scheduler if it was on when the server last stopped; missed runs are caught up"""
+        if self.state_store is None and self.scheduler.was_running:
+            self.start_scheduler()
+    
     def stop_scheduler(self):
         self.is_running = False
-        schedule.clear()
-        if self.scheduler_thread and self.scheduler_thread.is_alive():
-            self.scheduler_thread.join(timeout=2)
-        self.scheduler_thread = None
+        self.scheduler.stop()
+        self.touch()
         print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Scheduler stopped")
     
     def run_single_scraper(self, scraper_name: str) -> Dict[str, Any]:
@@ -318,41 +848,13 @@ class ScraperManager:
         
         scraper = self.scrapers[scraper_name]
         print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Running single scraper: {scraper_name}")
+        self.events.publish('run_started', run_type='single', scrapers=[scraper_name])
         
-        try:
-            raw_data = scraper.scrape()
-            if scraper.validate_data(raw_data):
-                filtered_data = scraper.filter_data(raw_data)
-                formatted_data = scraper.convert_to_common_format(filtered_data)
-                filename = scraper.export_to_json(formatted_data)
-                
-                result = {
-                    "scraper": scraper_name,
-                    "status": "success",
-                    "data_count": len(filtered_data),
-                    "filename": filename,
-                    "timestamp": datetime.now().isoformat()
-                }
-            else:
-                result = {
-                    "scraper": scraper_name,
-                    "status": "validation_failed",
-                    "timestamp": datetime.now().isoformat()
-                }
-        except Exception as e:
-            result = {
-                "scraper": scraper_name,
-                "status": "error",
-                "error": str(e),
-                "timestamp": datetime.now().isoformat()
-            }
+        result = self._run_scraper(scraper)
+        self.events.publish('run_finished', run_type='single', result=result)
         
         # Update manager state so result shows in Recent Results
-        self.last_run = datetime.now()
-        self.results.append(result)
-        # Keep only last 15 results (consistent with run_all)
-        if len(self.results) > 15:
-            self.results = self.results[-15:]
+        self._record_results([result])
         
         # Save results history for persistence
         self.save_results_history()
@@ -367,12 +869,16 @@ class ScraperManager:
         return {}
     
     def update_scraper_config(self, scraper_name: str, config: Dict[str, Any]):
+        if config.get('schedule'):
+            parse_schedule(config['schedule'])  # Raises ValueError for an invalid spec
         if scraper_name in self.scrapers:
             scraper = self.scrapers[scraper_name]
             if hasattr(scraper, 'update_config'):
                 scraper.update_config(config)
                 self.runtime_config[scraper_name] = config
                 self.save_runtime_config()
+                self._reschedule()
+                self.touch()
     
     def get_scraper_stats(self, scraper_name: str) -> Dict[str, Any]:
         if scraper_name in self.scrapers:
@@ -395,10 +901,21 @@ class ScraperManager:
         return scrapers_info
     
     def get_status(self) -> Dict[str, Any]:
+        if self.state_store:
+            last_run = self.state_store.get('last_run')
+            return {
+                "is_running": bool(self.state_store.get('scheduler_enabled', False)),
+                "scrapers_count": len(self.scrapers),
+                "scrapers": self.state_store.get('scrapers_info') or self.get_all_scrapers_info(),
+                "last_run": last_run,
+                "schedule": self.state_store.get('schedule', []),
+                "last_results": self.state_store.get_results()
+            }
         return {
             "is_running": self.is_running,
             "scrapers_count": len(self.scrapers),
             "scrapers": self.get_all_scrapers_info(),
             "last_run": self.last_run.isoformat() if self.last_run else None,
+            "schedule": self.scheduler.get_jobs() if self.is_running else [],
             "last_results": self.results
         }
\ No newline at end of file
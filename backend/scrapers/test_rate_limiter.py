@@ -0,0 +1,33 @@
+"""Tests for the shared request rate limiter (run from backend/: python -m pytest scrapers)"""
+import unittest
+
+from scrapers.rate_limiter import TokenBucket, get_limiter
+
+
+class RateLimiterTests(unittest.TestCase):
+    def test_zero_or_negative_rate_is_rejected(self):
+        for requests_per_minute in (0, -5):
+            with self.subTest(requests_per_minute=requests_per_minute):
+                with self.assertRaises(ValueError):
+                    get_limiter('test-invalid', requests_per_minute)
+                with self.assertRaises(ValueError):
+                    TokenBucket(requests_per_minute / 60.0)
+
+    def test_rate_cannot_be_updated_to_zero(self):
+        limiter = get_limiter('test-update', 60)
+        with self.assertRaises(ValueError):
+            get_limiter('test-update', 0)
+        with self.assertRaises(ValueError):
+            limiter.update_rate(0)
+        self.assertEqual(limiter.rate, 1.0)
+
+    def test_burst_then_wait(self):
+        bucket = TokenBucket(rate=10, capacity=2)
+        self.assertEqual(bucket._reserve(), 0.0)
+        self.assertEqual(bucket._reserve(), 0.0)
+        # The third request borrows a token that arrives a tenth of a second later
+        self.assertAlmostEqual(bucket._reserve(), 0.1, delta=0.01)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+"""Tests for cron/interval parsing and next-run planning (run from backend/: python -m pytest scrapers)"""
+import os
+import time
+import unittest
+from datetime import datetime
+
+from scrapers.scheduler import CronSchedule, IntervalSchedule, parse_schedule
+
+
+class CronFieldTests(unittest.TestCase):
+    def test_wildcards_ranges_lists_and_steps(self):
+        cron = CronSchedule('*/15 9-17/4 1,15 * *')
+        self.assertEqual(cron.minutes, {0, 15, 30, 45})
+        self.assertEqual(cron.hours, {9, 13, 17})
+        self.assertEqual(cron.days, {1, 15})
+        self.assertEqual(cron.months, set(range(1, 13)))
+
+    def test_sunday_is_zero_or_seven(self):
+        self.assertEqual(CronSchedule('0 0 * * 7').weekdays, {0})
+        self.assertEqual(CronSchedule('0 0 * * 5-7').weekdays, {5, 6, 0})
+
+    def test_invalid_fields(self):
+        for spec in ('60 * * * *', '* 24 * * *', '* * 0 * *', '* * * 13 *', '* * * * 8',
+                     '5-1 * * * *', '*/0 * * * *', 'a * * * *', '* * * *'):
+            with self.subTest(spec=spec), self.assertRaises(ValueError):
+                CronSchedule(spec)
+
+    def test_parse_schedule(self):
+        self.assertIsInstance(parse_schedule('0 12 * * *'), CronSchedule)
+        self.assertEqual(parse_schedule('every 15m').seconds, 900)
+        self.assertEqual(parse_schedule('2h').seconds, 7200)
+        for spec in ('', '   ', 'every 0s', 'every 5 weeks', None):
+            with self.subTest(spec=spec), self.assertRaises(ValueError):
+                parse_schedule(spec)
+
+
+class CronNextAfterTests(unittest.TestCase):
+    def assertNext(self, spec: str, after: datetime, expected: datetime):
+        self.assertEqual(CronSchedule(spec).next_after(after), expected)
+
+    def test_next_slot_is_strictly_after(self):
+        self.assertNext('0 12 * * *', datetime(2024, 6, 1, 12, 0), datetime(2024, 6, 2, 12, 0))
+        self.assertNext('0 12 * * *', datetime(2024, 6, 1, 11, 59, 59, 999999), datetime(2024, 6, 1, 12, 0))
+        self.assertNext('*/15 * * * *', datetime(2024, 6, 1, 10, 7, 30), datetime(2024, 6, 1, 10, 15))
+
+    def test_rollover(self):
+        # Hour, day, month and year boundaries
+        self.assertNext('0 * * * *', datetime(2024, 6, 1, 23, 30), datetime(2024, 6, 2, 0, 0))
+        self.assertNext('30 0 1 * *', datetime(2024, 4, 30, 23, 59), datetime(2024, 5, 1, 0, 30))
+        self.assertNext('0 0 1 1 *', datetime(2024, 12, 31, 23, 59), datetime(2025, 1, 1, 0, 0))
+        # Short months are skipped for day 31, and only leap years have 29 February
+        self.assertNext('0 0 31 * *', datetime(2024, 3, 31, 0, 0), datetime(2024, 5, 31, 0, 0))
+        self.assertNext('0 0 29 2 *', datetime(2024, 3, 1), datetime(2028, 2, 29, 0, 0))
+
+    def test_day_of_month_or_day_of_week(self):
+        # 2024-06-03 is a Monday; like cron, a restricted day and weekday match when either does
+        self.assertNext('0 9 * * 1', datetime(2024, 6, 1), datetime(2024, 6, 3, 9, 0))
+        self.assertNext('0 9 15 * 1', datetime(2024, 6, 11), datetime(2024, 6, 15, 9, 0))
+        self.assertNext('0 9 15 * 1', datetime(2024, 6, 15, 10), datetime(2024, 6, 17, 9, 0))
+
+    def test_never_matching_expression(self):
+        with self.assertRaises(ValueError):
+            CronSchedule('0 0 30 2 *').next_after(datetime(2024, 1, 1))
+
+    def test_interval(self):
+        self.assertEqual(IntervalSchedule('every 90s').next_after(datetime(2024, 6, 1, 23, 59)),
+                         datetime(2024, 6, 2, 0, 0, 30))
+
+
+@unittest.skipUnless(hasattr(time, 'tzset'), 'needs time.tzset')
+class CronDaylightSavingTests(unittest.TestCase):
+    """US Eastern time: clocks jump 02:00 -> 03:00 on 2024-03-10 and 02:00 -> 01:00 on 2024-11-03"""
+
+    def setUp(self):
+        self.previous = os.environ.get('TZ')
+        os.environ['TZ'] = 'America/New_York'
+        time.tzset()
+
+    def tearDown(self):
+        if self.previous is None:
+            os.environ.pop('TZ', None)
+        else:
+            os.environ['TZ'] = self.previous
+        time.tzset()
+
+    def test_slot_in_spring_forward_gap_runs_at_end_of_gap(self):
+        cron = CronSchedule('30 2 * * *')
+        self.assertEqual(cron.next_after(datetime(2024, 3, 10, 1, 0)), datetime(2024, 3, 10, 3, 0))
+        # The displaced run does not repeat; the next one is back on schedule
+        self.assertEqual(cron.next_after(datetime(2024, 3, 10, 3, 0)), datetime(2024, 3, 11, 2, 30))
+
+    def test_frequent_schedule_skips_the_gap(self):
+        cron = CronSchedule('*/20 * * * *')
+        self.assertEqual(cron.next_after(datetime(2024, 3, 10, 1, 45)), datetime(2024, 3, 10, 3, 0))
+        self.assertEqual(cron.next_after(datetime(2024, 3, 10, 3, 0)), datetime(2024, 3, 10, 3, 20))
+
+    def test_repeated_fall_back_hour_runs_once(self):
+        cron = CronSchedule('30 1 * * *')
+        self.assertEqual(cron.next_after(datetime(2024, 11, 3, 0, 0)), datetime(2024, 11, 3, 1, 30))
+        self.assertEqual(cron.next_after(datetime(2024, 11, 3, 1, 30)), datetime(2024, 11, 4, 1, 30))
+
+
+if __name__ == '__main__':
+    unittest.main()
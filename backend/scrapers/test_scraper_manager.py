@@ -0,0 +1,85 @@
+"""Tests for ScraperManager run dispatch (run from backend/: python -m pytest scrapers)"""
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from config.settings import settings
+from scrapers.base_scraper import BaseScraper
+from scrapers.scraper_manager import ScraperManager
+from storage.state_store import StateStore
+
+
+class StaticScraper(BaseScraper):
+    def __init__(self, name: str, enabled: bool = True):
+        super().__init__(name)
+        self.config = {'enabled': enabled, 'incremental': False}
+        self.scraped = 0
+
+    def scrape(self):
+        self.scraped += 1
+        return [{'id': '1', 'title': 'item'}]
+
+    def validate_data(self, data):
+        return True
+
+
+class RunAllScrapersTests(unittest.TestCase):
+    def setUp(self):
+        # The manager keeps its state under data/ in the working directory
+        self.cwd = os.getcwd()
+        self.workdir = tempfile.mkdtemp(prefix='datasky-test-')
+        os.chdir(self.workdir)
+        self.manager = ScraperManager()
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        shutil.rmtree(self.workdir, ignore_errors=True)
+
+    def test_no_enabled_scrapers(self):
+        disabled = StaticScraper('disabled', enabled=False)
+        self.manager.register_scraper(disabled)
+        for engine in ('sync', 'async'):
+            with self.subTest(engine=engine), mock.patch.object(settings, 'scraper_engine', engine):
+                self.assertEqual(self.manager.run_all_scrapers(), [])
+        self.assertEqual(disabled.scraped, 0)
+
+    def test_no_matching_scrapers(self):
+        self.manager.register_scraper(StaticScraper('enabled'))
+        self.assertEqual(self.manager.run_all_scrapers(['missing']), [])
+        self.assertEqual(self.manager._run_scrapers_parallel([]), [])
+
+
+class SharedModeClaimTests(unittest.TestCase):
+    """Two workers sharing data/state.db must not run the same scraper at once"""
+
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.workdir = tempfile.mkdtemp(prefix='datasky-test-')
+        os.chdir(self.workdir)
+        os.makedirs('data')
+        self.store = StateStore('data/state.db')
+        self.workers = [ScraperManager(self.store, role='worker') for _ in range(2)]
+        for manager in self.workers:
+            manager.register_scraper(StaticScraper('static'))
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        shutil.rmtree(self.workdir, ignore_errors=True)
+
+    def test_scraper_lease_is_exclusive_across_workers(self):
+        first, second = self.workers
+        self.assertTrue(first._claim(first.scrapers['static']))
+        self.assertEqual(second.run_single_scraper('static')['error'], 'Already running')
+        self.assertEqual(second.scrapers['static'].scraped, 0)
+
+        first._release(first.scrapers['static'])
+        self.assertEqual(second.run_single_scraper('static')['status'], 'success')
+        # The lease is released after the run, so the first worker can run it again
+        self.assertTrue(first._claim(first.scrapers['static']))
+        first._release(first.scrapers['static'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,8 +1,97 @@
 import requests
-import time
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Iterator, Optional
 from datetime import datetime, timedelta
 from scrapers.base_scraper import BaseScraper
+from scrapers.rate_limiter import get_limiter
+
+
+class SearchWalk:
+    """next_token pagination for one query within its per-run budget, resumable after a 429"""
+    
+    PAGE_MIN = 10  # The recent search endpoint rejects max_results outside 10-100
+    PAGE_MAX = 100
+    
+    def __init__(self, scraper: 'TwitterScraper', query: str, start_time: str):
+        self.scraper = scraper
+        self.query = query
+        self.budget = int(scraper.config.get('max_results_per_query', 10))
+        self.used = 0
+        self.pages = 0
+        self.found = 0
+        self.rate_limited = False
+        
+        cursor = scraper.get_cursor(query)
+        self.resumed = bool(cursor.get('next_token'))
+        if self.resumed:
+            # Continue the interrupted walk with exactly the parameters it started with
+            self.next_token = cursor['next_token']
+            self.start_time = cursor.get('start_time', start_time)
+            self.since_id = cursor.get('since_id')
+            self.newest_id = cursor.get('pending_since_id')
+        else:
+            self.next_token = None
+            self.start_time = start_time
+            self.since_id = cursor.get('since_id') if scraper.is_incremental() else None
+            self.newest_id = None
+        self.done = self.budget <= 0
+    
+    def next_params(self) -> Dict[str, Any]:
+        params = self.scraper._build_params(self.query, self.start_time, self.since_id)
+        remaining = self.budget - self.used
+        params['max_results'] = max(self.PAGE_MIN, min(self.PAGE_MAX, remaining))
+        if self.next_token:
+            params['next_token'] = self.next_token
+        return params
+    
+    def consume(self, data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        meta = data.get('meta', {})
+        self.pages += 1
+        
+        # Results are newest first, so the first page carries the new high-water mark
+        if self.newest_id is None:
+            self.newest_id = meta.get('newest_id')
+        
+        # Pages hold at least 10 tweets, so the last one may overshoot the budget
+        returned = data.get('data', [])[:self.budget - self.used]
+        self.used += len(returned)
+        
+        tweets = self.scraper._collect_tweets(self.query, returned, self.since_id)
+        self.found += len(tweets)
+        
+        self.next_token = meta.get('next_token')
+        if not self.next_token or self.used >= self.budget:
+            self.done = True
+        return tweets
+    
+    def interrupt(self):
+        """Stop on a long rate limit, keeping the page cursor so the next run resumes here"""
+        self.rate_limited = True
+        self.done = True
+        if self.next_token:
+            self.scraper.stage_cursor(self.query, {
+                'since_id': self.since_id,
+                'start_time': self.start_time,
+                'next_token': self.next_token,
+                'pending_since_id': self.newest_id
+            })
+    
+    def finish(self):
+        if self.rate_limited:
+            return
+        newest_id = self.newest_id or self.since_id
+        if newest_id:
+            self.scraper.stage_cursor(self.query, {'since_id': newest_id})
+        
+        print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Found {self.found} tweets for query: {self.query}")
+    
+    def report(self) -> Dict[str, Any]:
+        return {
+            'budget': self.budget,
+            'used': self.used,
+            'pages': self.pages,
+            'resumed': self.resumed,
+            'resumable': self.rate_limited and bool(self.next_token)
+        }
 
 
 class TwitterScraper(BaseScraper):
@@ -11,6 +100,7 @@ class TwitterScraper(BaseScraper):
         
         # Default configuration
         default_config = {
+            'base_url': 'https://api.twitter.com',  # Point at a replay server for offline runs
             'bearer_token': '',
             'search_queries': [
                 'I wish there was an app',
@@ -18,13 +108,16 @@ class TwitterScraper(BaseScraper):
                 'does anyone know how to'
             ],
             'time_window': '24h',  # 1h, 24h, 3d, 7d
-            'max_results_per_query': 10,
+            'max_results_per_query': 10,  # Per-query budget, paginated 100 at a time
+            'max_rate_limit_wait': 60,  # Longer rate-limit resets end the run with a resume cursor
             'exclude_retweets': True,
+            'requests_per_minute': 30,
+            'incremental': True,  # Only request tweets newer than each query's since_id
             'enabled': True
         }
         
         self.config = {**default_config, **(config or {})}
-        self.base_url = 'https://api.twitter.com/2/tweets/search/recent'
+        self.search_path = '/2/tweets/search/recent'
         
     def get_config(self) -> Dict[str, Any]:
         """Get current configuration"""
@@ -45,7 +138,8 @@ class TwitterScraper(BaseScraper):
             'max_results_per_query': self.config.get('max_results_per_query', 10),
             'time_window': self.config.get('time_window', '24h'),
             'has_token': bool(self.config.get('bearer_token', '')),
-            'last_run': None  # Could track this if needed
+            'last_run': None,  # Could track this if needed
+            'last_run_stats': self.run_stats
         }
     
     def _get_time_range(self) -> str:
@@ -64,75 +158,121 @@ class TwitterScraper(BaseScraper):
     
     def scrape(self) -> List[Dict[str, Any]]:
         """Scrape tweets based on search queries"""
-        if not self.config.get('enabled'):
-            print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Twitter scraper is disabled")
-            return []
-        
-        if not self.config.get('bearer_token'):
-            raise ValueError("Twitter bearer token is required")
-        
-        headers = {
-            'Authorization': f"Bearer {self.config['bearer_token']}",
-            'User-Agent': 'DataSky/1.0'
-        }
+        return list(self.iter_items())
+    
+    def iter_items(self) -> Iterator[Dict[str, Any]]:
+        """Yield tweets page by page as each search request returns"""
+        if not self._check_ready():
+            return
         
-        all_tweets = []
+        headers = self._get_headers()
         start_time = self._get_time_range()
+        self.reset_run_stats()
+        rate_limited = False
         
         for query in self.config['search_queries']:
-            print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Searching Twitter for: {query}")
-            
-            # Build query with retweet filter
-            full_query = query
-            if self.config.get('exclude_retweets', True):
-                full_query += ' -is:retweet'
+            walk = SearchWalk(self, query, start_time)
             
-            # Add language filter (English only as discussed)
-            full_query += ' lang:en'
+            # Queries after a rate limit keep their cursors and run next time
+            if rate_limited:
+                self.record_detail('query_budget', query, walk.report())
+                continue
             
-            params = {
-                'query': full_query,
-                'start_time': start_time,
-                'max_results': min(self.config.get('max_results_per_query', 10), 100),
-                'tweet.fields': 'created_at,author_id,public_metrics,conversation_id'
-            }
+            print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Searching Twitter for: {query}")
             
             try:
-                response = requests.get(
-                    self.base_url,
-                    headers=headers,
-                    params=params,
-                    timeout=30
-                )
-                
-                if response.status_code == 429:
-                    print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Rate limit reached")
-                    break
-                
-                response.raise_for_status()
-                data = response.json()
-                
-                if 'data' in data:
-                    tweets = data['data']
-                    print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Found {len(tweets)} tweets for query: {query}")
+                while not walk.done:
+                    self.check_cancelled()
+                    self._get_limiter().acquire()
+                    # Waits up to max_rate_limit_wait are retried by the client; longer ones come back as 429
+                    response = self.http.get(
+                        self._get_search_url(),
+                        headers=headers,
+                        params=walk.next_params(),
+                        timeout=30,
+                        max_backoff=self.config.get('max_rate_limit_wait', 60)
+                    )
                     
-                    # Add query context to each tweet
-                    for tweet in tweets:
-                        tweet['search_query'] = query
+                    if response.status_code == 429:
+                        print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Rate limit reached, saving cursor to resume next run")
+                        walk.interrupt()
+                        rate_limited = True
+                        break
                     
-                    all_tweets.extend(tweets)
-                else:
-                    print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] No tweets found for query: {query}")
+                    response.raise_for_status()
+                    yield from walk.consume(response.json())
                 
-                # Rate limiting - Twitter allows 300 requests per 15 min for app auth
-                # Being conservative with free tier
-                time.sleep(2)
+                walk.finish()
                 
             except requests.exceptions.RequestException as e:
                 print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Error searching Twitter: {str(e)}")
-                continue
+            
+            self.record_detail('query_budget', query, walk.report())
+        
+        self._summarize_budget()
+    
+    def _summarize_budget(self):
+        # Fetch threads may still be recording into run_stats
+        with self._stats_lock:
+            budgets = list(self.run_stats.get('query_budget', {}).values())
+            self.run_stats['budget_total'] = sum(b['budget'] for b in budgets)
+            self.run_stats['budget_used'] = sum(b['used'] for b in budgets)
+    
+    def _check_ready(self) -> bool:
+        if not self.config.get('enabled'):
+            print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Twitter scraper is disabled")
+            return False
+        
+        if not self.config.get('bearer_token'):
+            raise ValueError("Twitter bearer token is required")
+        return True
+    
+    def _get_headers(self) -> Dict[str, str]:
+        return {
+            'Authorization': f"Bearer {self.config['bearer_token']}",
+            'User-Agent': 'DataSky/1.0'
+        }
+    
+    def _get_search_url(self) -> str:
+        return self.config.get('base_url', 'https://api.twitter.com').rstrip('/') + self.search_path
+    
+    def _get_limiter(self):
+        # Twitter allows 450 requests per 15 min for app auth; stay conservative for the free tier
+        return get_limiter('twitter', self.config.get('requests_per_minute', 30))
+    
+    def _build_params(self, query: str, start_time: str, since_id: Optional[str] = None) -> Dict[str, Any]:
+        # Build query with retweet filter
+        full_query = query
+        if self.config.get('exclude_retweets', True):
+            full_query += ' -is:retweet'
+        
+        # Add language filter (English only as discussed)
+        full_query += ' lang:en'
+        
+        params = {
+            'query': full_query,
+            'start_time': start_time,
+            'max_results': min(self.config.get('max_results_per_query', 10), 100),
+            'tweet.fields': 'created_at,author_id,public_metrics,conversation_id'
+        }
+        
+        if since_id:
+            params['since_id'] = since_id
+        return params
+    
+    def _collect_tweets(self, query: str, tweets: List[Dict[str, Any]], since_id: Optional[str]) -> List[Dict[str, Any]]:
+        """Drop already-seen tweets from one search page and tag the rest with their query"""
+        # The API honours since_id, but guard against overlap anyway
+        if since_id:
+            fresh = [t for t in tweets if int(t['id']) > int(since_id)]
+            self.record_items(skipped_count=len(tweets) - len(fresh))
+            tweets = fresh
+        self.record_items(new_count=len(tweets))
         
-        return all_tweets
+        # Add query context to each tweet
+        for tweet in tweets:
+            tweet['search_query'] = query
+        return tweets
     
     def validate_data(self, data: List[Dict[str, Any]]) -> bool:
         """Validate scraped Twitter data"""
@@ -150,29 +290,28 @@ class TwitterScraper(BaseScraper):
         
         return False
     
+    def validate_item(self, item: Dict[str, Any]) -> bool:
+        return 'id' in item and 'text' in item
+    
+    def enrich_item(self, tweet: Dict[str, Any]) -> Dict[str, Any]:
+        """Score a tweet's engagement from its public metrics"""
+        # Skip if no public metrics
+        if 'public_metrics' not in tweet:
+            return tweet
+        
+        metrics = tweet['public_metrics']
+        tweet['engagement_score'] = (
+            metrics.get('retweet_count', 0) * 2 +
+            metrics.get('like_count', 0) +
+            metrics.get('reply_count', 0) * 3  # Replies indicate discussion
+        )
+        return tweet
+    
     def filter_data(self, data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Filter tweets based on engagement metrics"""
-        filtered = []
-        
-        for tweet in data:
-            # Skip if no public metrics
-            if 'public_metrics' not in tweet:
-                filtered.append(tweet)
-                continue
-            
-            metrics = tweet['public_metrics']
-            
-            # Could add filtering based on engagement here
-            # For now, include all tweets but sort by engagement
-            engagement_score = (
-                metrics.get('retweet_count', 0) * 2 +
-                metrics.get('like_count', 0) +
-                metrics.get('reply_count', 0) * 3  # Replies indicate discussion
-            )
-            tweet['engagement_score'] = engagement_score
-            filtered.append(tweet)
-        
-        # Sort by engagement score
+        # Could add filtering based on engagement here
+        # For now, include all tweets but sort by engagement
+        filtered = [self.enrich_item(tweet) for tweet in data]
         filtered.sort(key=lambda x: x.get('engagement_score', 0), reverse=True)
         
         return filtered
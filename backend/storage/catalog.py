@@ -0,0 +1,262 @@
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Any, Iterable, Optional
+
+from storage.document_store import get_document_store
+
+
+STATE_FILES = {'scraper_config.json', 'results_history.json', 'scraper_cursors.json', 'scheduler_state.json'}
+ANALYSIS_SUFFIX = '_analysis.json'
+PROFILE_SUFFIXES = ('_profile.json', '.prof')
+COLUMNAR_EXTENSIONS = ('.parquet', '.arrow')
+
+
+def classify(filename: str) -> Optional[str]:
+    """Kind of a data-directory file, or None for files the catalog ignores (temp files, SQLite journals)"""
+    if filename.endswith(ANALYSIS_SUFFIX):
+        return 'analysis'
+    if filename.endswith(PROFILE_SUFFIXES):
+        return 'profile'
+    if filename in STATE_FILES:
+        return 'state'
+    extension = os.path.splitext(filename)[1]
+    if extension == '.json':
+        return 'batch' if filename.startswith('batch_') else 'result'
+    if extension in COLUMNAR_EXTENSIONS:
+        return 'columnar'
+    if extension == '.db':
+        return 'database'
+    return None
+
+
+def analysis_filename_for(filename: str) -> str:
+    return filename.replace('.json', ANALYSIS_SUFFIX)
+
+
+class DataCatalog:
+    """In-memory metadata for every file in the data directory
+
+    Entries hold kind, size, mtime and per-kind details: item counts for
+    result documents, model and stats for analyses. The directory (and the
+    segment manifest) is re-scanned at most every ``min_interval`` seconds;
+    only files whose size or mtime changed are opened again. Writers call
+    ``record`` so their files show up without waiting for a scan. The
+    catalog is persisted to a small index file so restarts skip the reads.
+    """
+
+    FORMAT_VERSION = 1
+
+    def __init__(self, data_dir: str = 'data', index_path: str = None, min_interval: float = 2.0):
+        self.data_dir = data_dir
+        self.index_path = index_path or os.path.join(data_dir, '.index', 'catalog.json')
+        self.min_interval = min_interval
+        self.lock = threading.RLock()
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.version = 0
+        self.updated_at = datetime.now()
+        self.scanned_at = 0.0
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.index_path):
+            return
+        try:
+            with open(self.index_path, 'r') as f:
+                index = json.load(f)
+            if index.get('format') == self.FORMAT_VERSION:
+                self.entries = index['entries']
+        except Exception as e:
+            print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Error loading data catalog: {str(e)}")
+
+    def _save(self):
+        try:
+            os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+            # Per-process temp name: the API and worker processes both save this cache
+            tmp_path = f"{self.index_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump({'format': self.FORMAT_VERSION, 'entries': self.entries}, f, separators=(',', ':'))
+            os.replace(tmp_path, self.index_path)
+        except Exception as e:
+            print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Error saving data catalog: {str(e)}")
+
+    def _changed(self):
+        self.version += 1
+        self.updated_at = datetime.now()
+        self._link()
+        self._save()
+
+    def _stat(self, filename: str) -> Optional[Dict[str, Any]]:
+        """Size, mtime and backend of one file, looking in the document store for documents"""
+        kind = classify(filename)
+        if kind in ('result', 'batch'):
+            stat = get_document_store().stat(filename)
+            if stat is None:
+                return None
+            return {'size': stat['size'], 'stored_size': stat['stored_size'], 'mtime': stat['mtime'],
+                    'backend': stat['backend']}
+        path = os.path.join(self.data_dir, filename)
+        if not os.path.isfile(path):
+            return None
+        return self._file_stat(filename, os.stat(path))
+
+    @staticmethod
+    def _file_stat(filename: str, st: os.stat_result) -> Dict[str, Any]:
+        backend = 'json' if filename.endswith('.json') else 'file'
+        return {'size': st.st_size, 'stored_size': st.st_size, 'mtime': st.st_mtime, 'backend': backend}
+
+    def _scan(self) -> Dict[str, Dict[str, Any]]:
+        found = {}
+        if os.path.isdir(self.data_dir):
+            with os.scandir(self.data_dir) as entries:
+                for entry in entries:
+                    if entry.name.startswith('.') or classify(entry.name) is None or not entry.is_file():
+                        continue
+                    found[entry.name] = self._file_stat(entry.name, entry.stat())
+
+        # Documents packed into segments have no file of their own
+        store = get_document_store()
+        for filename in store.list_documents():
+            if filename not in found:
+                stat = store.stat(filename)
+                if stat is not None:
+                    found[filename] = {'size': stat['size'], 'stored_size': stat['stored_size'],
+                                       'mtime': stat['mtime'], 'backend': stat['backend']}
+        return found
+
+    def _describe(self, filename: str, stat: Dict[str, Any]) -> Dict[str, Any]:
+        kind = classify(filename)
+        entry = {'filename': filename, 'kind': kind, **stat}
+        try:
+            if kind in ('result', 'batch'):
+                sections = get_document_store().list_sections(filename)
+                entry['sections'] = sections
+                # Batches list every item under chronological and again under by_source
+                entry['item_count'] = sections.get('chronological', sum(sections.values()))
+            elif kind == 'analysis':
+                with open(os.path.join(self.data_dir, filename), 'r', encoding='utf-8') as f:
+                    analysis = json.load(f)
+                entry['source_file'] = analysis.get('source_file') or filename.replace(ANALYSIS_SUFFIX, '.json')
+                entry['analyzed_at'] = analysis.get('analyzed_at')
+                entry['model'] = analysis.get('model')
+                entry['stats'] = analysis.get('stats', {})
+            elif kind == 'columnar':
+                entry['source_file'] = f"{os.path.splitext(filename)[0]}.json"
+        except Exception as e:
+            entry['error'] = str(e)
+        return entry
+
+    def _link(self):
+        """Point every result document at its analysis and columnar exports"""
+        derived: Dict[str, Dict[str, Any]] = {}
+        for filename, entry in self.entries.items():
+            if entry['kind'] == 'analysis' and 'error' not in entry:
+                derived.setdefault(entry['source_file'], {})['analysis'] = {
+                    'analysis_filename': filename,
+                    'analyzed_at': entry['analyzed_at'],
+                    'model': entry['model'],
+                    'stats': entry['stats']
+                }
+            elif entry['kind'] == 'columnar':
+                derived.setdefault(entry['source_file'], {}).setdefault('columnar', []).append(filename)
+
+        for filename, entry in self.entries.items():
+            if entry['kind'] in ('result', 'batch'):
+                links = derived.get(filename, {})
+                entry['analysis'] = links.get('analysis')
+                entry['columnar'] = sorted(links.get('columnar', []))
+
+    def refresh(self, force: bool = False) -> bool:
+        """Re-scan the data directory if the last scan is stale, returning whether anything changed"""
+        with self.lock:
+            if not force and time.monotonic() - self.scanned_at < self.min_interval:
+                return False
+            found = self._scan()
+            changed = False
+            for filename in list(self.entries):
+                if filename not in found:
+                    del self.entries[filename]
+                    changed = True
+            for filename, stat in found.items():
+                entry = self.entries.get(filename)
+                if entry is None or entry['size'] != stat['size'] or entry['mtime'] != stat['mtime']:
+                    self.entries[filename] = self._describe(filename, stat)
+                    changed = True
+            self.scanned_at = time.monotonic()
+            if changed:
+                self._changed()
+            return changed
+
+    def record(self, filename: str):
+        """Catalog a file that was just written (or removed) without waiting for the next scan"""
+        with self.lock:
+            stat = self._stat(filename)
+            if stat is None:
+                if self.entries.pop(filename, None) is not None:
+                    self._changed()
+                return
+            self.entries[filename] = self._describe(filename, stat)
+            self._changed()
+
+    def get(self, filename: str) -> Optional[Dict[str, Any]]:
+        self.refresh()
+        with self.lock:
+            entry = self.entries.get(filename)
+            return dict(entry) if entry else None
+
+    def exists(self, filename: str) -> bool:
+        self.refresh()
+        with self.lock:
+            return filename in self.entries
+
+    def list(self, kind: str = None, filenames: Iterable[str] = None) -> Dict[str, Dict[str, Any]]:
+        """Entries keyed by filename, optionally restricted to one kind or a set of filenames"""
+        self.refresh()
+        with self.lock:
+            names = self.entries.keys() if filenames is None else [f for f in filenames if f in self.entries]
+            return {
+                filename: dict(self.entries[filename]) for filename in names
+                if kind is None or self.entries[filename]['kind'] == kind
+            }
+
+    def analysis_status(self, filename: str) -> Dict[str, Any]:
+        """Whether a result document has been analysed, with the analysis' model and stats"""
+        entry = self.get(analysis_filename_for(filename))
+        if entry is None:
+            return {'exists': False}
+        if 'error' in entry:
+            return {'exists': False, 'error': f"Failed to read analysis file: {entry['error']}"}
+        return {
+            'exists': True,
+            'analysis_filename': entry['filename'],
+            'analyzed_at': entry['analyzed_at'],
+            'model': entry['model'],
+            'stats': entry['stats']
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        self.refresh()
+        with self.lock:
+            by_kind: Dict[str, int] = {}
+            for entry in self.entries.values():
+                by_kind[entry['kind']] = by_kind.get(entry['kind'], 0) + 1
+            return {
+                'files': len(self.entries),
+                'by_kind': by_kind,
+                'total_size': sum(entry['stored_size'] for entry in self.entries.values())
+            }
+
+
+_catalog = None
+_catalog_lock = threading.Lock()
+
+
+def get_catalog() -> DataCatalog:
+    """Return the process-wide catalog of the data directory"""
+    global _catalog
+    with _catalog_lock:
+        if _catalog is None:
+            _catalog = DataCatalog('data')
+        return _catalog
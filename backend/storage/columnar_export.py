@@ -0,0 +1,105 @@
+import os
+from typing import Dict, List, Any, Iterable, Tuple
+
+from storage.items import normalize_item
+
+# pyarrow is optional (JSON results work without it) and slow to import, so it is loaded on first use
+pa = None
+pq = None
+
+FORMATS = {'parquet': '.parquet', 'arrow': '.arrow'}
+MIMETYPES = {'parquet': 'application/vnd.apache.parquet', 'arrow': 'application/vnd.apache.arrow.file'}
+COLUMNS = ['source', 'id', 'text', 'author', 'channel', 'created_at', 'score', 'comments', 'likes', 'retweets', 'url']
+
+
+def is_available() -> bool:
+    global pa, pq
+    if pa is None:
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            return False
+        pa, pq = pyarrow, pyarrow.parquet
+    return True
+
+
+def item_schema():
+    return pa.schema([
+        ('source', pa.string()),
+        ('id', pa.string()),
+        ('text', pa.string()),
+        ('author', pa.string()),
+        ('channel', pa.string()),
+        ('created_at', pa.timestamp('ms', tz='UTC')),
+        ('score', pa.int64()),
+        ('comments', pa.int64()),
+        ('likes', pa.int64()),
+        ('retweets', pa.int64()),
+        ('url', pa.string())
+    ])
+
+
+def columnar_filename(filename: str, fmt: str) -> str:
+    """batch_20240101_120000.json -> batch_20240101_120000.parquet"""
+    return f"{os.path.splitext(filename)[0]}{FORMATS[fmt]}"
+
+
+def _record_batch(rows: List[Dict[str, Any]], schema):
+    columns = {name: [] for name in COLUMNS}
+    for row in rows:
+        for name in COLUMNS:
+            if name == 'created_at':
+                # Arrow takes integer milliseconds for a timestamp('ms') column
+                ts = row['created_ts']
+                columns[name].append(int(ts * 1000) if ts is not None else None)
+            else:
+                columns[name].append(row[name])
+    return pa.RecordBatch.from_arrays(
+        [pa.array(columns[field.name], type=field.type) for field in schema],
+        schema=schema
+    )
+
+
+def write_items(sink, items: Iterable[Tuple[str, Dict[str, Any]]], fmt: str = 'parquet',
+                batch_size: int = 10000) -> int:
+    """Write (source, item) pairs as one normalized table in record batches, returning the row count
+
+    ``sink`` is a path or a pyarrow output stream. Only one batch of rows is
+    held in memory at a time.
+    """
+    if not is_available():
+        raise RuntimeError("Columnar export requires the pyarrow package (pip install pyarrow)")
+    if fmt not in FORMATS:
+        raise ValueError(f"format must be one of {', '.join(FORMATS)}")
+
+    schema = item_schema()
+    if fmt == 'parquet':
+        writer = pq.ParquetWriter(sink, schema, compression='zstd')
+    else:
+        writer = pa.ipc.new_file(sink, schema)
+
+    total = 0
+    rows = []
+    try:
+        for source, item in items:
+            rows.append(normalize_item(source, item))
+            if len(rows) >= batch_size:
+                writer.write_batch(_record_batch(rows, schema))
+                total += len(rows)
+                rows = []
+        if rows or not total:
+            writer.write_batch(_record_batch(rows, schema))
+            total += len(rows)
+    finally:
+        writer.close()
+    return total
+
+
+def to_bytes(items: Iterable[Tuple[str, Dict[str, Any]]], fmt: str = 'parquet') -> bytes:
+    """Serialise items into an in-memory Parquet or Arrow IPC file"""
+    if not is_available():
+        raise RuntimeError("Columnar export requires the pyarrow package (pip install pyarrow)")
+    sink = pa.BufferOutputStream()
+    write_items(sink, items, fmt)
+    return sink.getvalue().to_pybytes()
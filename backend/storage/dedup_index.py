@@ -0,0 +1,161 @@
+import hashlib
+import math
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Any, Iterable, Tuple
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter answering 'definitely new' without touching disk"""
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        self.capacity = max(capacity, 1)
+        self.size = max(8, int(-self.capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / self.capacity * math.log(2)))
+        self.bits = bytearray(self.size // 8 + 1)
+        self.count = 0
+
+    def _positions(self, key: str) -> Iterable[int]:
+        # Double hashing: k positions from two 64-bit halves of one digest
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hash_count))
+
+    def add(self, key: str):
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+
+class DedupIndex:
+    """Persistent (source, id) index of items already exported by previous runs"""
+
+    LOOKUP_CHUNK = 500  # Stay well below SQLite's bound-parameter limit
+
+    def __init__(self, path: str = 'data/seen_items.db', retention_days: float = 30,
+                 expected_items: int = 1_000_000):
+        self.path = path
+        self.retention_days = retention_days
+        self.expected_items = expected_items
+        self.lock = threading.Lock()
+        self.last_pruned = 0.0
+        self.bloom = None
+        self.data_version = None
+
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS seen_items ('
+            ' source TEXT NOT NULL,'
+            ' item_id TEXT NOT NULL,'
+            ' first_seen REAL NOT NULL,'
+            ' PRIMARY KEY (source, item_id)'
+            ') WITHOUT ROWID'
+        )
+        self.conn.execute('CREATE INDEX IF NOT EXISTS idx_seen_items_first_seen ON seen_items (first_seen)')
+        self.conn.commit()
+
+        self.prune()
+
+    @staticmethod
+    def _key(source: str, item_id: Any) -> str:
+        return f"{source}:{item_id}"
+
+    def _rebuild_bloom(self):
+        total = self.conn.execute('SELECT COUNT(*) FROM seen_items').fetchone()[0]
+        # Leave headroom so the false-positive rate holds until the next prune
+        self.bloom = BloomFilter(max(self.expected_items, total * 2))
+        for source, item_id in self.conn.execute('SELECT source, item_id FROM seen_items'):
+            self.bloom.add(self._key(source, item_id))
+        self.data_version = self._data_version()
+
+    def _data_version(self) -> int:
+        # Changes whenever another connection (e.g. another worker process) commits
+        return self.conn.execute('PRAGMA data_version').fetchone()[0]
+
+    def prune(self) -> int:
+        """Forget items older than the retention window and rebuild the filter"""
+        with self.lock:
+            cutoff = time.time() - self.retention_days * 86400
+            deleted = self.conn.execute('DELETE FROM seen_items WHERE first_seen < ?', (cutoff,)).rowcount
+            self.conn.commit()
+            # Bloom filters cannot forget, so rebuild only when rows were removed
+            if deleted or self.bloom is None:
+                self._rebuild_bloom()
+            self.last_pruned = time.time()
+
+        if deleted:
+            print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Dedup index pruned {deleted} expired items")
+        return deleted
+
+    def filter_new(self, source: str, items: List[Dict[str, Any]], id_field: str = 'id') -> Tuple[List[Dict[str, Any]], int]:
+        """Return the items not exported before, plus how many duplicates were dropped"""
+        if time.time() - self.last_pruned > 86400:
+            self.prune()
+
+        # Only Bloom hits need a disk lookup; most new items never reach SQLite
+        candidates = []
+        with self.lock:
+            if self._data_version() != self.data_version:
+                # Items marked seen by another process are missing from our filter
+                self._rebuild_bloom()
+            for item in items:
+                item_id = item.get(id_field)
+                if item_id is not None and self._key(source, item_id) in self.bloom:
+                    candidates.append(str(item_id))
+            seen = self._lookup(source, candidates)
+
+        new_items = []
+        batch_ids = set()
+        for item in items:
+            item_id = item.get(id_field)
+            if item_id is None:
+                new_items.append(item)
+                continue
+            item_id = str(item_id)
+            if item_id in seen or item_id in batch_ids:
+                continue
+            batch_ids.add(item_id)
+            new_items.append(item)
+
+        return new_items, len(items) - len(new_items)
+
+    def _lookup(self, source: str, item_ids: List[str]) -> set:
+        seen = set()
+        for start in range(0, len(item_ids), self.LOOKUP_CHUNK):
+            chunk = item_ids[start:start + self.LOOKUP_CHUNK]
+            placeholders = ','.join('?' * len(chunk))
+            rows = self.conn.execute(
+                f'SELECT item_id FROM seen_items WHERE source = ? AND item_id IN ({placeholders})',
+                [source, *chunk]
+            )
+            seen.update(row[0] for row in rows)
+        return seen
+
+    def mark_seen(self, source: str, items: List[Dict[str, Any]], id_field: str = 'id'):
+        now = time.time()
+        rows = [(source, str(item[id_field]), now) for item in items if item.get(id_field) is not None]
+        with self.lock:
+            self.conn.executemany('INSERT OR IGNORE INTO seen_items VALUES (?, ?, ?)', rows)
+            self.conn.commit()
+            for source_name, item_id, _ in rows:
+                self.bloom.add(self._key(source_name, item_id))
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self.lock:
+            total = self.conn.execute('SELECT COUNT(*) FROM seen_items').fetchone()[0]
+        return {
+            'items': total,
+            'retention_days': self.retention_days,
+            'bloom_bits': self.bloom.size,
+            'bloom_hashes': self.bloom.hash_count
+        }
@@ -0,0 +1,476 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import zlib
+from datetime import datetime
+from itertools import islice
+from typing import Dict, List, Any, Iterable, Iterator, Optional
+
+from config.settings import settings
+from storage.file_lock import FileLock
+from storage.json_stream import (
+    SectionPath, split_sections, merge_sections, section_order, iter_json_chunks, index_json_arrays, iter_json_array,
+    buffer_chunks
+)
+
+try:
+    import zstandard
+except ImportError:  # zstd is optional; gzip is always available
+    zstandard = None
+
+
+class JsonFileStore:
+    """Result documents as one JSON file each in the data directory (the original layout)"""
+    
+    INDEX_DIR = '.index'
+    CHECKPOINT_ITEMS = 1000
+
+    def __init__(self, data_dir: str = 'data'):
+        self.data_dir = data_dir
+
+    def _path(self, filename: str) -> str:
+        return os.path.join(self.data_dir, filename)
+
+    def write(self, filename: str, document: Dict[str, Any]) -> str:
+        skeleton, sections = split_sections(document)
+        return self.write_stream(filename, skeleton, sections)
+
+    def write_stream(self, filename: str, skeleton: Dict[str, Any],
+                     sections: Dict[SectionPath, Iterable[Any]]) -> str:
+        """Write a document whose item lists are produced lazily, returning its filename"""
+        os.makedirs(self.data_dir, exist_ok=True)
+        offsets = {}
+        position = 0
+        
+        def track(name: str, items: Iterable[Any]) -> Iterator[Any]:
+            # The writer asks for the next item only after writing the previous one,
+            # so the current position is where that item's separator begins
+            checkpoints = []
+            count = 0
+            for item in items:
+                if count % self.CHECKPOINT_ITEMS == 0:
+                    checkpoints.append([count, position])
+                count += 1
+                yield item
+            if count:
+                offsets[name] = {'count': count, 'checkpoints': checkpoints}
+        
+        tracked = {path: track('.'.join(path), items) for path, items in sections.items()}
+        with open(self._path(filename), 'wb') as f:
+            for chunk in iter_json_chunks(skeleton, tracked, indent=2):
+                data = chunk.encode('utf-8')
+                position += len(data)
+                f.write(data)
+        
+        self._save_offset_index(filename, offsets, skeleton)
+        return filename
+
+    def exists(self, filename: str) -> bool:
+        return os.path.exists(self._path(filename))
+
+    def read(self, filename: str) -> Dict[str, Any]:
+        with open(self._path(filename), 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def read_skeleton(self, filename: str) -> Dict[str, Any]:
+        """The document with every section emptied, without reading its items where possible"""
+        index = self._read_sidecar(filename)
+        if index and 'skeleton' in index:
+            return index['skeleton']
+        # Files whose sidecar was rebuilt by a scan (or written before skeletons were kept) are parsed whole
+        return split_sections(self.read(filename))[0]
+
+    def stat(self, filename: str) -> Optional[Dict[str, Any]]:
+        """Size on disk, logical size and modification time, or None if missing"""
+        path = self._path(filename)
+        if not os.path.exists(path):
+            return None
+        st = os.stat(path)
+        return {'size': st.st_size, 'stored_size': st.st_size, 'mtime': st.st_mtime, 'backend': 'json'}
+
+    def iter_json_bytes(self, filename: str, chunk_size: int = 65536) -> Iterator[bytes]:
+        """The document serialised as JSON, for downloads"""
+        with open(self._path(filename), 'rb') as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+
+    def list_documents(self) -> List[str]:
+        if not os.path.isdir(self.data_dir):
+            return []
+        return sorted(name for name in os.listdir(self.data_dir) if name.endswith('.json'))
+    
+    def _offset_index(self, filename: str) -> Dict[str, Dict[str, Any]]:
+        """Section counts and item byte offsets, from a sidecar file rebuilt when the document changes"""
+        index = self._read_sidecar(filename)
+        if index:
+            return index['sections']
+        
+        # Files written before the index existed are scanned once
+        with open(self._path(filename), 'rb') as f:
+            sections = {'.'.join(path): info for path, info in index_json_arrays(f, self.CHECKPOINT_ITEMS).items()}
+        self._save_offset_index(filename, sections)
+        return sections
+    
+    def _read_sidecar(self, filename: str) -> Optional[Dict[str, Any]]:
+        """The sidecar index if it still matches the document's size and mtime"""
+        st = os.stat(self._path(filename))
+        sidecar = self._sidecar_path(filename)
+        if os.path.exists(sidecar):
+            try:
+                with open(sidecar, 'r') as f:
+                    index = json.load(f)
+                if index['size'] == st.st_size and index['mtime'] == st.st_mtime:
+                    return index
+            except Exception:
+                pass
+        return None
+    
+    def _save_offset_index(self, filename: str, sections: Dict[str, Dict[str, Any]], skeleton: Dict[str, Any] = None):
+        st = os.stat(self._path(filename))
+        sidecar = self._sidecar_path(filename)
+        os.makedirs(os.path.dirname(sidecar), exist_ok=True)
+        index = {'size': st.st_size, 'mtime': st.st_mtime, 'sections': sections}
+        if skeleton is not None:
+            index['skeleton'] = skeleton
+        with open(f"{sidecar}.tmp", 'w') as f:
+            json.dump(index, f, separators=(',', ':'), default=str)
+        os.replace(f"{sidecar}.tmp", sidecar)
+    
+    def _sidecar_path(self, filename: str) -> str:
+        return os.path.join(self.data_dir, self.INDEX_DIR, f"{filename}.idx")
+    
+    def list_sections(self, filename: str) -> Dict[str, int]:
+        """Item count of every section (list of objects) in a document, keyed by dotted path"""
+        return {name: info['count'] for name, info in self._offset_index(filename).items()}
+    
+    def resolve_section(self, filename: str, name: str) -> Optional[str]:
+        """Match a dotted section name exactly, or as the prefix of a single section
+        
+        ``by_source.reddit`` resolves to ``by_source.reddit.data``.
+        """
+        sections = self.list_sections(filename)
+        if name in sections:
+            return name
+        matches = [section for section in sections if section.startswith(f"{name}.")]
+        return matches[0] if len(matches) == 1 else None
+    
+    def iter_section(self, filename: str, section: str, offset: int = 0, limit: int = None) -> Iterator[Any]:
+        """Items ``offset`` to ``offset + limit`` of one section, reading only that part of the file"""
+        info = self._offset_index(filename)[section]
+        start_index, start_offset = 0, 0
+        for index, byte_offset in info['checkpoints']:
+            if index > offset:
+                break
+            start_index, start_offset = index, byte_offset
+        
+        with open(self._path(filename), 'rb') as f:
+            f.seek(start_offset)
+            stop = None if limit is None else offset - start_index + limit
+            yield from islice(iter_json_array(f), offset - start_index, stop)
+
+
+class SegmentStore(JsonFileStore):
+    """Append-only store packing documents as compressed NDJSON into rotating segment files
+
+    Each document becomes one compressed frame appended to the active segment:
+    a header line holding the document skeleton and section paths, then one
+    ``[section_index, item]`` line per item. The manifest maps filenames to
+    frame offsets, so reads decompress only the requested document. Legacy
+    JSON files in the data directory remain readable through the same API.
+    """
+
+    MANIFEST_NAME = 'manifest.json'
+
+    def __init__(self, data_dir: str = 'data', segment_dir: str = None,
+                 max_segment_bytes: int = 64 * 1024 * 1024, codec: str = None):
+        super().__init__(data_dir)
+        self.segment_dir = segment_dir or os.path.join(data_dir, 'segments')
+        self.max_segment_bytes = max_segment_bytes
+        self.codec = codec or ('zstd' if zstandard else 'gzip')
+        if self.codec == 'zstd' and zstandard is None:
+            raise RuntimeError("zstd segments require the zstandard package (pip install zstandard)")
+
+        self.lock = threading.RLock()
+        # Worker processes append to the same segments; the file lock serialises their writes
+        self.file_lock = FileLock(os.path.join(self.segment_dir, '.lock'))
+        self.manifest_path = os.path.join(self.segment_dir, self.MANIFEST_NAME)
+        os.makedirs(self.segment_dir, exist_ok=True)
+        self.manifest_mtime = None
+        self.manifest = self._load_manifest()
+
+    def _load_manifest(self) -> Dict[str, Any]:
+        if os.path.exists(self.manifest_path):
+            self.manifest_mtime = os.path.getmtime(self.manifest_path)
+            try:
+                with open(self.manifest_path, 'r') as f:
+                    return json.load(f)
+            except Exception as e:
+                print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Error loading segment manifest: {str(e)}")
+        return {'active_segment': None, 'next_segment': 1, 'documents': {}}
+
+    def _save_manifest(self):
+        tmp_path = f"{self.manifest_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.manifest, f, separators=(',', ':'))
+        os.replace(tmp_path, self.manifest_path)
+        self.manifest_mtime = os.path.getmtime(self.manifest_path)
+
+    def _refresh_manifest(self):
+        # Another process may have appended documents since we last looked
+        if os.path.exists(self.manifest_path) and os.path.getmtime(self.manifest_path) != self.manifest_mtime:
+            self.manifest = self._load_manifest()
+
+    def _active_segment(self) -> str:
+        name = self.manifest.get('active_segment')
+        if name:
+            path = os.path.join(self.segment_dir, name)
+            if not os.path.exists(path) or os.path.getsize(path) < self.max_segment_bytes:
+                return name
+
+        # Rotate: start a new segment once the current one is full
+        number = self.manifest.get('next_segment', 1)
+        name = f"segment_{number:06d}.ndjson.{'zst' if self.codec == 'zstd' else 'gz'}"
+        self.manifest['active_segment'] = name
+        self.manifest['next_segment'] = number + 1
+        return name
+
+    def _compressor(self, codec: str):
+        if codec == 'zstd':
+            return zstandard.ZstdCompressor(level=3).compressobj()
+        # wbits=31 produces a standalone gzip member
+        return zlib.compressobj(6, zlib.DEFLATED, 31)
+
+    def _decompressor(self, codec: str):
+        if codec == 'zstd':
+            return zstandard.ZstdDecompressor().decompressobj()
+        return zlib.decompressobj(31)
+
+    def write_stream(self, filename: str, skeleton: Dict[str, Any],
+                     sections: Dict[SectionPath, Iterable[Any]]) -> str:
+        # Stored in serialisation order so downloads can stream sections back in one pass
+        paths = section_order(skeleton, sections.keys())
+        header = {'doc': skeleton, 'sections': [list(path) for path in paths]}
+        section_counts = {}
+        checkpoints = {}
+        raw_size = 0
+
+        # The frame is compressed into a temp file first: sections may be slow generators, and readers
+        # must not wait on them. Only appending the finished frame holds the locks.
+        handle, frame_path = tempfile.mkstemp(prefix='.frame-', suffix='.tmp', dir=self.segment_dir)
+        try:
+            compressor = self._compressor(self.codec)
+            with os.fdopen(handle, 'w+b') as frame:
+                def emit(line: str):
+                    nonlocal raw_size
+                    data = (line + '\n').encode('utf-8')
+                    raw_size += len(data)
+                    compressed = compressor.compress(data)
+                    if compressed:
+                        frame.write(compressed)
+
+                def restart() -> int:
+                    # Close the current compressed member so reads can start from here
+                    nonlocal compressor
+                    frame.write(compressor.flush())
+                    compressor = self._compressor(self.codec)
+                    return frame.tell()
+
+                emit(json.dumps(header, separators=(',', ':'), default=str, ensure_ascii=False))
+                for index, path in enumerate(paths):
+                    name = '.'.join(path)
+                    checkpoints[name] = []
+                    count = 0
+                    for item in sections[path]:
+                        if count % self.CHECKPOINT_ITEMS == 0:
+                            checkpoints[name].append([count, restart()])
+                        emit(json.dumps([index, item], separators=(',', ':'), default=str, ensure_ascii=False))
+                        count += 1
+                    section_counts[name] = count
+
+                frame.write(compressor.flush())
+                length = frame.tell()
+                frame.seek(0)
+
+                with self.lock, self.file_lock:
+                    self._refresh_manifest()
+                    segment = self._active_segment()
+                    with open(os.path.join(self.segment_dir, segment), 'ab') as f:
+                        offset = f.tell()
+                        shutil.copyfileobj(frame, f, 1 << 20)
+                        f.flush()
+
+                    self.manifest['documents'][filename] = {
+                        'segment': segment,
+                        'offset': offset,
+                        'length': length,
+                        'codec': self.codec,
+                        'raw_size': raw_size,
+                        'sections': section_counts,
+                        'checkpoints': checkpoints,
+                        'written_at': time.time()
+                    }
+                    self._save_manifest()
+        finally:
+            os.remove(frame_path)
+
+        return filename
+
+    def _entry(self, filename: str) -> Optional[Dict[str, Any]]:
+        with self.lock:
+            self._refresh_manifest()
+            return self.manifest['documents'].get(filename)
+
+    def _iter_lines(self, entry: Dict[str, Any], start: int = 0, chunk_size: int = 65536) -> Iterator[str]:
+        """Decompress one document frame incrementally from a member boundary, yielding its NDJSON lines"""
+        decompressor = self._decompressor(entry['codec'])
+        remaining = entry['length'] - start
+        pending = b''
+
+        with open(os.path.join(self.segment_dir, entry['segment']), 'rb') as f:
+            f.seek(entry['offset'] + start)
+            while remaining > 0:
+                chunk = f.read(min(chunk_size, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                pending += decompressor.decompress(chunk)
+                # A frame is a series of compressed members, one per checkpoint
+                while decompressor.eof and decompressor.unused_data:
+                    unused = decompressor.unused_data
+                    decompressor = self._decompressor(entry['codec'])
+                    pending += decompressor.decompress(unused)
+                *lines, pending = pending.split(b'\n')
+                for line in lines:
+                    yield line.decode('utf-8')
+        if pending:
+            yield pending.decode('utf-8')
+
+    def exists(self, filename: str) -> bool:
+        return self._entry(filename) is not None or super().exists(filename)
+
+    def read(self, filename: str) -> Dict[str, Any]:
+        entry = self._entry(filename)
+        if entry is None:
+            return super().read(filename)
+
+        lines = self._iter_lines(entry)
+        header = json.loads(next(lines))
+        paths = [tuple(path) for path in header['sections']]
+        sections: Dict[SectionPath, List[Any]] = {path: [] for path in paths}
+        for line in lines:
+            index, item = json.loads(line)
+            sections[paths[index]].append(item)
+        return merge_sections(header['doc'], sections)
+
+    def read_skeleton(self, filename: str) -> Dict[str, Any]:
+        entry = self._entry(filename)
+        if entry is None:
+            return super().read_skeleton(filename)
+        # The header line comes first, so only the start of the frame is decompressed
+        return json.loads(next(self._iter_lines(entry)))['doc']
+
+    def stat(self, filename: str) -> Optional[Dict[str, Any]]:
+        entry = self._entry(filename)
+        if entry is None:
+            return super().stat(filename)
+        return {
+            'size': entry['raw_size'],
+            'stored_size': entry['length'],
+            'mtime': entry['written_at'],
+            'backend': 'segments'
+        }
+
+    def iter_json_bytes(self, filename: str, chunk_size: int = 65536) -> Iterator[bytes]:
+        entry = self._entry(filename)
+        if entry is None:
+            yield from super().iter_json_bytes(filename, chunk_size)
+            return
+
+        # Items are stored section by section, so each section can be streamed in turn
+        lines = self._iter_lines(entry)
+        header = json.loads(next(lines))
+        paths = [tuple(path) for path in header['sections']]
+        state = {'pending': None}
+
+        def section_items(index: int) -> Iterator[Any]:
+            while True:
+                if state['pending'] is None:
+                    line = next(lines, None)
+                    if line is None:
+                        return
+                    state['pending'] = json.loads(line)
+                if state['pending'][0] != index:
+                    return
+                item = state['pending'][1]
+                state['pending'] = None
+                yield item
+
+        sections = {path: section_items(index) for index, path in enumerate(paths)}
+        yield from buffer_chunks(iter_json_chunks(header['doc'], sections, indent=2), chunk_size)
+
+    def list_sections(self, filename: str) -> Dict[str, int]:
+        entry = self._entry(filename)
+        if entry is None:
+            return super().list_sections(filename)
+        return dict(entry['sections'])
+
+    def iter_section(self, filename: str, section: str, offset: int = 0, limit: int = None) -> Iterator[Any]:
+        entry = self._entry(filename)
+        if entry is None:
+            yield from super().iter_section(filename, section, offset, limit)
+            return
+
+        # Section counts are recorded in storage order, so their position is the line tag
+        index = list(entry['sections']).index(section)
+        # Documents written before checkpoints existed are scanned from the start
+        position, start = 0, 0
+        for item_index, byte_offset in entry.get('checkpoints', {}).get(section, []):
+            if item_index > offset:
+                break
+            position, start = item_index, byte_offset
+
+        prefix = f"[{index},"
+        end = None if limit is None else offset + limit
+        for line in self._iter_lines(entry, start):
+            # Only lines inside the requested slice are parsed
+            if not line.startswith(prefix):
+                if position:
+                    return
+                continue
+            if end is not None and position >= end:
+                return
+            if position >= offset:
+                yield json.loads(line)[1]
+            position += 1
+
+    def list_documents(self) -> List[str]:
+        with self.lock:
+            self._refresh_manifest()
+            stored = set(self.manifest['documents'].keys())
+        return sorted(stored | set(super().list_documents()))
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_document_store() -> JsonFileStore:
+    """Return the configured store for scraper and batch result documents"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            if settings.storage_backend == 'segments':
+                _store = SegmentStore(
+                    'data',
+                    max_segment_bytes=int(settings.segment_max_mb * 1024 * 1024),
+                    codec=settings.segment_codec
+                )
+            else:
+                _store = JsonFileStore('data')
+        return _store
@@ -0,0 +1,40 @@
+import os
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Windows: locking only covers threads of this process
+    fcntl = None
+
+
+class FileLock:
+    """Exclusive lock shared by threads and processes, held on a lock file with flock
+
+    Re-entrant within a process, so code already holding it may call helpers
+    that take it again.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.local = threading.RLock()
+        self.depth = 0
+        self.fd = None
+
+    def __enter__(self):
+        self.local.acquire()
+        if self.depth == 0:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            self.fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            if fcntl:
+                fcntl.flock(self.fd, fcntl.LOCK_EX)
+        self.depth += 1
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.depth -= 1
+        if self.depth == 0:
+            if fcntl:
+                fcntl.flock(self.fd, fcntl.LOCK_UN)
+            os.close(self.fd)
+            self.fd = None
+        self.local.release()
@@ -0,0 +1,177 @@
+import base64
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Any, Tuple
+
+from storage.items import normalize_item
+
+
+class ItemStore:
+    """Indexed SQLite table of every scraped item, queryable without opening result files
+
+    Each source's items are reduced to the common columns of normalize_item
+    (created time, channel, author, title, score, comments) with the original
+    item kept as JSON.
+    """
+
+    # Sort name -> column; every sort is tie-broken by (source, item_id) for keyset paging
+    SORT_COLUMNS = {'created': 'created_ts', 'score': 'score', 'comments': 'comments'}
+    MAX_LIMIT = 500
+
+    def __init__(self, path: str = 'data/items.db'):
+        self.path = path
+        self.lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS items ('
+            ' source TEXT NOT NULL,'
+            ' item_id TEXT NOT NULL,'
+            ' created_ts REAL NOT NULL,'
+            ' channel TEXT COLLATE NOCASE,'
+            ' author TEXT,'
+            ' title TEXT,'
+            ' score INTEGER NOT NULL DEFAULT 0,'
+            ' comments INTEGER NOT NULL DEFAULT 0,'
+            ' url TEXT,'
+            ' filename TEXT,'
+            ' scraped_at REAL NOT NULL,'
+            ' data TEXT NOT NULL,'
+            ' PRIMARY KEY (source, item_id)'
+            ')'
+        )
+        for name, columns in (
+            ('source_created', 'source, created_ts, item_id'),
+            ('channel_created', 'channel, created_ts, source, item_id'),
+            ('created', 'created_ts, source, item_id'),
+            ('source_score', 'source, score, item_id'),
+            ('score', 'score, source, item_id'),
+            ('comments', 'comments, source, item_id')
+        ):
+            self.conn.execute(f'CREATE INDEX IF NOT EXISTS idx_items_{name} ON items ({columns})')
+        self.conn.commit()
+
+    @staticmethod
+    def _row(source: str, item: Dict[str, Any], filename: str, now: float) -> Tuple:
+        row = normalize_item(source, item)
+        created = row['created_ts']
+        return (
+            source, row['id'], created if created is not None else now, row['channel'], row['author'],
+            row['text'], row['score'], row['comments'], row['url'], filename, now,
+            json.dumps(item, default=str)
+        )
+
+    def add_items(self, source: str, items: List[Dict[str, Any]], filename: str = None) -> int:
+        """Insert or refresh items; engagement of re-scraped items is updated in place"""
+        now = time.time()
+        rows = [self._row(source, item, filename, now) for item in items if item.get('id') is not None]
+        with self.lock:
+            self.conn.executemany(
+                'INSERT INTO items VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) '
+                'ON CONFLICT (source, item_id) DO UPDATE SET '
+                ' score = excluded.score, comments = excluded.comments,'
+                ' filename = excluded.filename, scraped_at = excluded.scraped_at, data = excluded.data',
+                rows
+            )
+            self.conn.commit()
+        return len(rows)
+
+    @staticmethod
+    def encode_cursor(values: List[Any]) -> str:
+        return base64.urlsafe_b64encode(json.dumps(values).encode('utf-8')).decode('ascii').rstrip('=')
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> List[Any]:
+        try:
+            values = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        except ValueError:
+            raise ValueError('Invalid cursor')
+        if not isinstance(values, list) or len(values) != 3:
+            raise ValueError('Invalid cursor')
+        return values
+
+    def query(self, source: str = None, channel: str = None, author: str = None,
+              since: float = None, until: float = None, min_score: int = None, max_score: int = None,
+              min_comments: int = None, text: str = None, sort: str = 'created', order: str = 'desc',
+              limit: int = 50, cursor: str = None) -> Dict[str, Any]:
+        """Filtered, sorted page of items plus the cursor for the next page"""
+        if sort not in self.SORT_COLUMNS:
+            raise ValueError(f"sort must be one of {', '.join(self.SORT_COLUMNS)}")
+        if order not in ('asc', 'desc'):
+            raise ValueError("order must be 'asc' or 'desc'")
+        column = self.SORT_COLUMNS[sort]
+        limit = max(1, min(int(limit), self.MAX_LIMIT))
+
+        clauses, params = [], []
+        for condition, value in (
+            ('source = ?', source),
+            ('channel = ?', channel),
+            ('author = ?', author),
+            ('created_ts >= ?', since),
+            ('created_ts < ?', until),
+            ('score >= ?', min_score),
+            ('score <= ?', max_score),
+            ('comments >= ?', min_comments)
+        ):
+            if value is not None:
+                clauses.append(condition)
+                params.append(value)
+        if text:
+            clauses.append('title LIKE ?')
+            params.append(f"%{text}%")
+        if cursor:
+            # Row-value comparison continues strictly after the last row of the previous page
+            clauses.append(f"({column}, source, item_id) {'<' if order == 'desc' else '>'} (?, ?, ?)")
+            params.extend(self.decode_cursor(cursor))
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+        direction = order.upper()
+        sql = (
+            f'SELECT * FROM items {where} '
+            f'ORDER BY {column} {direction}, source {direction}, item_id {direction} LIMIT ?'
+        )
+
+        with self.lock:
+            rows = self.conn.execute(sql, [*params, limit + 1]).fetchall()
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        next_cursor = None
+        if has_more:
+            last = rows[-1]
+            next_cursor = self.encode_cursor([last[column], last['source'], last['item_id']])
+
+        return {
+            'items': [self._to_dict(row) for row in rows],
+            'count': len(rows),
+            'next_cursor': next_cursor
+        }
+
+    @staticmethod
+    def _to_dict(row: sqlite3.Row) -> Dict[str, Any]:
+        return {
+            'source': row['source'],
+            'id': row['item_id'],
+            'created_at': datetime.fromtimestamp(row['created_ts']).isoformat(),
+            'channel': row['channel'],
+            'author': row['author'],
+            'title': row['title'],
+            'score': row['score'],
+            'comments': row['comments'],
+            'url': row['url'],
+            'filename': row['filename'],
+            'data': json.loads(row['data'])
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self.lock:
+            rows = self.conn.execute('SELECT source, COUNT(*) FROM items GROUP BY source').fetchall()
+        return {'items': sum(row[1] for row in rows), 'by_source': {row[0]: row[1] for row in rows}}
@@ -0,0 +1,86 @@
+from datetime import datetime
+from typing import Dict, Any, Iterator, Optional, Tuple
+
+from storage.spool import ItemSpool
+
+
+def parse_timestamp(value: Any) -> Optional[float]:
+    """Unix seconds from an epoch number or an ISO string (Twitter's trailing Z included)"""
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str) and value:
+        try:
+            return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+        except ValueError:
+            return None
+    return None
+
+
+def normalize_item(source: str, item: Dict[str, Any]) -> Dict[str, Any]:
+    """Map one scraped item onto the columns shared by every source
+
+    ``channel`` is the subreddit for Reddit and the search query for Twitter.
+    ``score`` is a post's score, or a tweet's likes + retweets + quotes;
+    ``likes`` and ``retweets`` are None for sources without them.
+    """
+    if source == 'reddit':
+        return {
+            'source': source,
+            'id': str(item.get('id')),
+            'text': item.get('title'),
+            'author': item.get('author'),
+            'channel': item.get('subreddit'),
+            'created_ts': parse_timestamp(item.get('created_utc')),
+            'score': int(item.get('score') or 0),
+            'comments': int(item.get('num_comments') or 0),
+            'likes': None,
+            'retweets': None,
+            'url': item.get('permalink') or item.get('url')
+        }
+
+    if source == 'twitter':
+        metrics = item.get('public_metrics') or {}
+        likes = metrics.get('like_count', 0)
+        retweets = metrics.get('retweet_count', 0)
+        return {
+            'source': source,
+            'id': str(item.get('id')),
+            'text': item.get('text'),
+            'author': item.get('author_id'),
+            'channel': item.get('search_query'),
+            'created_ts': parse_timestamp(item.get('created_at')),
+            'score': int(likes + retweets + metrics.get('quote_count', 0)),
+            'comments': int(metrics.get('reply_count', 0)),
+            'likes': int(likes),
+            'retweets': int(retweets),
+            'url': f"https://twitter.com/i/web/status/{item.get('id')}"
+        }
+
+    return {
+        'source': source,
+        'id': str(item.get('id')),
+        'text': item.get('title') or item.get('text'),
+        'author': item.get('author'),
+        'channel': item.get('channel'),
+        'created_ts': parse_timestamp(item.get('created_utc') or item.get('created_at') or item.get('timestamp')),
+        'score': int(item.get('score') or 0),
+        'comments': int(item.get('comments') or 0),
+        'likes': item.get('likes'),
+        'retweets': item.get('retweets'),
+        'url': item.get('url')
+    }
+
+
+def iter_document_items(document: Dict[str, Any]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Yield (source, item) for every item in a scraper result or batch document"""
+    if 'chronological' in document:
+        for entry in document['chronological']:
+            yield entry['source'], entry['data']
+        return
+
+    source = document.get('source', 'unknown')
+    for key in ('posts', 'tweets', 'data'):
+        if isinstance(document.get(key), (list, ItemSpool)):
+            for item in document[key]:
+                yield source, item
+            return
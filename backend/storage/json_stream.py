@@ -0,0 +1,278 @@
+import codecs
+import json
+import re
+from typing import Dict, List, Any, Iterable, Iterator, Tuple, IO, BinaryIO
+
+SectionPath = Tuple[str, ...]
+
+
+def split_sections(document: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[SectionPath, List[Any]]]:
+    """Separate a document into a small skeleton and its item lists
+
+    Every non-empty list of objects reachable through object keys becomes a
+    section; the skeleton keeps an empty list in its place.
+    """
+    sections: Dict[SectionPath, List[Any]] = {}
+
+    def walk(node: Dict[str, Any], path: SectionPath) -> Dict[str, Any]:
+        skeleton = {}
+        for key, value in node.items():
+            if isinstance(value, dict):
+                skeleton[key] = walk(value, path + (key,))
+            elif isinstance(value, list) and value and all(isinstance(item, dict) for item in value):
+                sections[path + (key,)] = value
+                skeleton[key] = []
+            else:
+                skeleton[key] = value
+        return skeleton
+
+    return walk(document, ()), sections
+
+
+def section_order(skeleton: Dict[str, Any], paths: Iterable[SectionPath]) -> List[SectionPath]:
+    """Order section paths the way iter_json_chunks visits them"""
+    wanted = set(paths)
+    ordered = []
+
+    def walk(node: Dict[str, Any], path: SectionPath):
+        for key, value in node.items():
+            if path + (key,) in wanted:
+                ordered.append(path + (key,))
+            elif isinstance(value, dict):
+                walk(value, path + (key,))
+
+    walk(skeleton, ())
+    return ordered + [path for path in wanted if path not in ordered]
+
+
+def merge_sections(skeleton: Dict[str, Any], sections: Dict[SectionPath, List[Any]]) -> Dict[str, Any]:
+    """Inverse of split_sections; fills the skeleton in place and returns it"""
+    for path, items in sections.items():
+        node = skeleton
+        for key in path[:-1]:
+            node = node.setdefault(key, {})
+        node[path[-1]] = items
+    return skeleton
+
+
+def iter_json_chunks(skeleton: Any, sections: Dict[SectionPath, Iterable[Any]],
+                     indent: int = None, path: SectionPath = (), level: int = 0) -> Iterator[str]:
+    """Serialise a skeleton as JSON, streaming each section's items as they are produced"""
+    newline = '\n' + ' ' * (indent * (level + 1)) if indent else ''
+    closing = '\n' + ' ' * (indent * level) if indent else ''
+    colon = ': ' if indent else ':'
+
+    if path in sections:
+        yield '['
+        first = True
+        for item in sections[path]:
+            yield ('' if first else ',') + newline
+            yield _dumps(item, indent, level + 1)
+            first = False
+        yield (closing if not first else '') + ']'
+        return
+
+    if isinstance(skeleton, dict):
+        if not skeleton:
+            yield '{}'
+            return
+        yield '{'
+        first = True
+        for key, value in skeleton.items():
+            yield ('' if first else ',') + newline + json.dumps(str(key)) + colon
+            yield from iter_json_chunks(value, sections, indent, path + (key,), level + 1)
+            first = False
+        yield closing + '}'
+        return
+
+    yield _dumps(skeleton, indent, level)
+
+
+def _dumps(value: Any, indent: int, level: int) -> str:
+    separators = None if indent else (',', ':')
+    text = json.dumps(value, indent=indent, separators=separators, default=str, ensure_ascii=False)
+    if indent and level:
+        text = text.replace('\n', '\n' + ' ' * (indent * level))
+    return text
+
+
+def buffer_chunks(chunks: Iterable[str], chunk_size: int = 65536) -> Iterator[bytes]:
+    """Join small serialiser chunks into UTF-8 blocks of roughly chunk_size bytes"""
+    buffer = []
+    buffered = 0
+    for chunk in chunks:
+        buffer.append(chunk)
+        buffered += len(chunk)
+        if buffered >= chunk_size:
+            yield ''.join(buffer).encode('utf-8')
+            buffer, buffered = [], 0
+    if buffer:
+        yield ''.join(buffer).encode('utf-8')
+
+
+def write_json(fp: IO[str], skeleton: Dict[str, Any], sections: Dict[SectionPath, Iterable[Any]],
+               indent: int = None):
+    for chunk in iter_json_chunks(skeleton, sections, indent):
+        fp.write(chunk)
+
+
+_STRUCTURAL = re.compile(rb'["{}\[\],:]')
+_STRING_END = re.compile(rb'["\\]')
+_NESTING = re.compile(rb'["{}\[\]]')  # Inside items only nesting and strings matter
+_NON_WHITESPACE = re.compile(rb'[^ \t\r\n]')
+
+
+class _Frame:
+    __slots__ = ('is_object', 'path', 'expect_key', 'count', 'all_objects', 'checkpoints')
+
+    def __init__(self, is_object: bool, path: SectionPath = None):
+        self.is_object = is_object
+        self.path = path  # None below the first array: nested lists are not sections
+        self.expect_key = is_object
+        self.count = 0
+        self.all_objects = True
+        self.checkpoints = []
+
+
+def index_json_arrays(fp: BinaryIO, checkpoint_every: int = 1000,
+                      chunk_size: int = 1 << 20) -> Dict[SectionPath, Dict[str, Any]]:
+    """Scan a JSON file once, without parsing values, and locate its sections
+
+    Returns ``{path: {'count': n, 'checkpoints': [[item_index, byte_offset], ...]}}``
+    for every non-empty list of objects reachable through object keys (the
+    same lists split_sections treats as sections). A checkpoint is recorded
+    every ``checkpoint_every`` items so a slice can be read by seeking.
+    """
+    sections: Dict[SectionPath, Dict[str, Any]] = {}
+    stack: List[_Frame] = []
+    key = None
+    key_parts = None
+    in_string = escaped = expect_item = False
+    base = 0
+
+    buf = fp.read(chunk_size)
+    while buf:
+        pos, size = 0, len(buf)
+        while pos < size:
+            if in_string:
+                if escaped:
+                    if key_parts is not None:
+                        key_parts.append(buf[pos:pos + 1])
+                    escaped = False
+                    pos += 1
+                    continue
+                match = _STRING_END.search(buf, pos)
+                end = match.start() if match else size
+                if key_parts is not None:
+                    key_parts.append(buf[pos:end])
+                if not match:
+                    break
+                pos = match.end()
+                if match.group() == b'\\':
+                    if key_parts is not None:
+                        key_parts.append(b'\\')
+                    escaped = True
+                    continue
+                in_string = False
+                if key_parts is not None:
+                    key = json.loads(b'"' + b''.join(key_parts) + b'"')
+                    key_parts = None
+                continue
+
+            if expect_item:
+                match = _NON_WHITESPACE.search(buf, pos)
+                if not match:
+                    break
+                pos = match.start()
+                expect_item = False
+                if buf[pos:pos + 1] != b']':
+                    frame = stack[-1]
+                    if frame.count % checkpoint_every == 0:
+                        frame.checkpoints.append([frame.count, base + pos])
+                    frame.count += 1
+                    frame.all_objects = frame.all_objects and buf[pos:pos + 1] == b'{'
+
+            top = stack[-1] if stack else None
+            match = (_STRUCTURAL if top is None or top.path is not None else _NESTING).search(buf, pos)
+            if not match:
+                break
+            char = match.group()
+            pos = match.end()
+
+            if char == b'"':
+                in_string = True
+                if top and top.is_object and top.expect_key:
+                    top.expect_key = False
+                    key_parts = [] if top.path is not None else None
+            elif char in b'{[':
+                if top is None:
+                    path = ()
+                elif top.is_object and top.path is not None:
+                    path = top.path + (key,)
+                else:
+                    path = None
+                frame = _Frame(char == b'{', path if char == b'{' or path is not None else None)
+                stack.append(frame)
+                expect_item = char == b'[' and path is not None
+            elif char in b'}]':
+                frame = stack.pop()
+                if not frame.is_object and frame.path is not None and frame.count and frame.all_objects:
+                    sections[frame.path] = {'count': frame.count, 'checkpoints': frame.checkpoints}
+            elif char == b',' and top:
+                if top.is_object:
+                    top.expect_key = True
+                elif top.path is not None:
+                    expect_item = True
+
+        base += size
+        buf = fp.read(chunk_size)
+
+    return sections
+
+
+def iter_json_array(fp: BinaryIO, chunk_size: int = 65536) -> Iterator[Any]:
+    """Decode array items one by one, starting at an item (or separator) offset in a file
+
+    Stops at the closing bracket, so only the bytes of the items consumed are read.
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder('utf-8')()
+    text = ''
+    index = 0
+    eof = False
+
+    while True:
+        # Skip separators between items
+        while True:
+            while index < len(text) and text[index] in ' \t\r\n,[':
+                index += 1
+            if index < len(text) or eof:
+                break
+            chunk = fp.read(chunk_size)
+            text, index = utf8.decode(chunk, final=not chunk), 0
+            eof = not chunk
+        if index >= len(text) or text[index] == ']':
+            return
+
+        try:
+            item, end = decoder.raw_decode(text, index)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            # The item continues past the buffer
+            chunk = fp.read(chunk_size)
+            eof = not chunk
+            text = text[index:] + utf8.decode(chunk, final=eof)
+            index = 0
+            continue
+
+        # A number at the buffer edge may be cut short; make sure a delimiter follows
+        if end == len(text) and not eof:
+            chunk = fp.read(chunk_size)
+            eof = not chunk
+            text = text[index:] + utf8.decode(chunk, final=eof)
+            index = 0
+            continue
+
+        yield item
+        index = end
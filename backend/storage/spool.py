@@ -0,0 +1,49 @@
+import json
+import os
+import tempfile
+from typing import Dict, Any, Iterable, Iterator
+
+
+class ItemSpool:
+    """Items spilled to a temporary NDJSON file, so a run's output never has to fit in memory
+
+    Behaves like a read-only sequence of the appended items: ``len()`` and
+    repeated iteration (each pass re-reads the file). The file is removed on
+    ``close()`` or when the ``with`` block ends.
+    """
+
+    def __init__(self, directory: str = 'data'):
+        os.makedirs(directory, exist_ok=True)
+        handle, self.path = tempfile.mkstemp(prefix='.spool-', suffix='.ndjson', dir=directory)
+        self.file = os.fdopen(handle, 'wb')
+        self.count = 0
+
+    def append(self, item: Dict[str, Any]):
+        self.file.write(json.dumps(item, separators=(',', ':'), default=str, ensure_ascii=False).encode('utf-8'))
+        self.file.write(b'\n')
+        self.count += 1
+
+    def extend(self, items: Iterable[Dict[str, Any]]):
+        for item in items:
+            self.append(item)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        self.file.flush()
+        with open(self.path, 'rb') as f:
+            for line in f:
+                yield json.loads(line)
+
+    def close(self):
+        if not self.file.closed:
+            self.file.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def __enter__(self) -> 'ItemSpool':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,277 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Any, Optional
+
+
+class StateStore:
+    """SQLite state shared by the API process and scrape workers
+
+    Holds what a single process used to keep in memory or in JSON files:
+    key/value state (runtime scraper config, scheduler switch, status
+    snapshots), the recent results history, the background job queue,
+    leases for work only one worker may do (running the scheduler), and a
+    short log of events that the API relays to its /api/events clients.
+    Every write is one transaction, so concurrent processes never see or
+    produce half-updated state.
+    """
+
+    EVENT_RETENTION = 1000
+
+    def __init__(self, path: str = 'data/state.db'):
+        self.path = path
+        self.lock = threading.Lock()
+        self.event_writes = 0
+
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        # Autocommit mode; multi-statement writes open their own IMMEDIATE transaction
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        for statement in (
+            'CREATE TABLE IF NOT EXISTS state (key TEXT PRIMARY KEY, value TEXT NOT NULL, updated_at REAL NOT NULL)',
+            'CREATE TABLE IF NOT EXISTS results (id INTEGER PRIMARY KEY AUTOINCREMENT, data TEXT NOT NULL)',
+            'CREATE TABLE IF NOT EXISTS jobs ('
+            ' id TEXT PRIMARY KEY, kind TEXT NOT NULL, target TEXT NOT NULL, params TEXT NOT NULL,'
+            ' status TEXT NOT NULL, created_at TEXT NOT NULL, started_at TEXT, finished_at TEXT,'
+            ' progress TEXT NOT NULL, stages TEXT NOT NULL, result TEXT, error TEXT,'
+            ' worker TEXT, heartbeat_at REAL)',
+            'CREATE INDEX IF NOT EXISTS idx_jobs_status_created ON jobs (status, created_at)',
+            'CREATE INDEX IF NOT EXISTS idx_jobs_kind_target ON jobs (kind, target, status)',
+            'CREATE TABLE IF NOT EXISTS leases (name TEXT PRIMARY KEY, owner TEXT NOT NULL, expires_at REAL NOT NULL)',
+            'CREATE TABLE IF NOT EXISTS events ('
+            ' id INTEGER PRIMARY KEY AUTOINCREMENT, type TEXT NOT NULL, data TEXT NOT NULL, timestamp TEXT NOT NULL)'
+        ):
+            self.conn.execute(statement)
+
+    def _transaction(self):
+        """BEGIN IMMEDIATE takes the write lock up front, so read-then-write sequences can't interleave"""
+        store = self
+
+        class Transaction:
+            def __enter__(self):
+                store.lock.acquire()
+                store.conn.execute('BEGIN IMMEDIATE')
+                return store.conn
+
+            def __exit__(self, exc_type, exc, tb):
+                try:
+                    store.conn.execute('ROLLBACK' if exc_type else 'COMMIT')
+                finally:
+                    store.lock.release()
+
+        return Transaction()
+
+    # Key/value state
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self.lock:
+            row = self.conn.execute('SELECT value FROM state WHERE key = ?', (key,)).fetchone()
+        return json.loads(row['value']) if row else default
+
+    def get_with_time(self, key: str) -> Optional[Dict[str, Any]]:
+        with self.lock:
+            row = self.conn.execute('SELECT value, updated_at FROM state WHERE key = ?', (key,)).fetchone()
+        return {'value': json.loads(row['value']), 'updated_at': row['updated_at']} if row else None
+
+    def set(self, key: str, value: Any):
+        with self.lock:
+            self.conn.execute(
+                'INSERT INTO state VALUES (?, ?, ?) '
+                'ON CONFLICT (key) DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at',
+                (key, json.dumps(value, default=str), time.time())
+            )
+
+    def get_prefix(self, prefix: str) -> Dict[str, Dict[str, Any]]:
+        """Every key starting with ``prefix``, as key -> {value, updated_at}"""
+        with self.lock:
+            rows = self.conn.execute("SELECT key, value, updated_at FROM state WHERE key LIKE ? ESCAPE '\\'",
+                                     (prefix.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%',)).fetchall()
+        return {row['key']: {'value': json.loads(row['value']), 'updated_at': row['updated_at']} for row in rows}
+
+    def increment(self, key: str) -> int:
+        with self._transaction() as conn:
+            row = conn.execute('SELECT value FROM state WHERE key = ?', (key,)).fetchone()
+            value = (json.loads(row['value']) if row else 0) + 1
+            conn.execute(
+                'INSERT INTO state VALUES (?, ?, ?) '
+                'ON CONFLICT (key) DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at',
+                (key, json.dumps(value), time.time())
+            )
+        return value
+
+    # Results history
+
+    def append_results(self, entries: List[Dict[str, Any]], keep: int = 15) -> List[Dict[str, Any]]:
+        """Add result entries and return the ``keep`` most recent, oldest first"""
+        with self._transaction() as conn:
+            conn.executemany('INSERT INTO results (data) VALUES (?)',
+                             [(json.dumps(entry, default=str),) for entry in entries])
+            conn.execute('DELETE FROM results WHERE id NOT IN (SELECT id FROM results ORDER BY id DESC LIMIT ?)', (keep,))
+            rows = conn.execute('SELECT data FROM results ORDER BY id').fetchall()
+        return [json.loads(row['data']) for row in rows]
+
+    def get_results(self) -> List[Dict[str, Any]]:
+        with self.lock:
+            rows = self.conn.execute('SELECT data FROM results ORDER BY id').fetchall()
+        return [json.loads(row['data']) for row in rows]
+
+    def replace_results(self, entries: List[Dict[str, Any]]):
+        with self._transaction() as conn:
+            conn.execute('DELETE FROM results')
+            conn.executemany('INSERT INTO results (data) VALUES (?)',
+                             [(json.dumps(entry, default=str),) for entry in entries])
+
+    # Jobs
+
+    JSON_JOB_FIELDS = ('params', 'progress', 'stages', 'result')
+
+    def _job_from_row(self, row: sqlite3.Row) -> Dict[str, Any]:
+        job = dict(row)
+        for field in self.JSON_JOB_FIELDS:
+            job[field] = json.loads(job[field]) if job[field] is not None else None
+        return job
+
+    def insert_job(self, job: Dict[str, Any], max_queued: int = None) -> Dict[str, Any]:
+        """Insert a queued job, or return the active job for the same kind and target instead
+
+        Raises OverflowError when ``max_queued`` jobs are already waiting.
+        """
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT * FROM jobs WHERE kind = ? AND target = ? AND status IN ('queued', 'running')",
+                (job['kind'], job['target'])
+            ).fetchone()
+            if row:
+                return self._job_from_row(row)
+            if max_queued is not None:
+                queued = conn.execute("SELECT COUNT(*) FROM jobs WHERE status = 'queued'").fetchone()[0]
+                if queued >= max_queued:
+                    raise OverflowError(f"{queued} jobs are already waiting")
+            conn.execute(
+                'INSERT INTO jobs (id, kind, target, params, status, created_at, progress, stages) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (job['id'], job['kind'], job['target'], json.dumps(job['params']), job['status'],
+                 job['created_at'], json.dumps(job['progress']), json.dumps(job['stages']))
+            )
+        return job
+
+    def claim_job(self, worker: str, kinds: List[str] = None) -> Optional[Dict[str, Any]]:
+        """Atomically move the oldest queued job to running for ``worker``"""
+        with self._transaction() as conn:
+            sql = "SELECT * FROM jobs WHERE status = 'queued'"
+            params: List[Any] = []
+            if kinds:
+                sql += f" AND kind IN ({','.join('?' * len(kinds))})"
+                params.extend(kinds)
+            row = conn.execute(f"{sql} ORDER BY created_at LIMIT 1", params).fetchone()
+            if row is None:
+                return None
+            started_at = datetime.now().isoformat()
+            conn.execute(
+                "UPDATE jobs SET status = 'running', worker = ?, started_at = ?, heartbeat_at = ? WHERE id = ?",
+                (worker, started_at, time.time(), row['id'])
+            )
+        job = self._job_from_row(row)
+        job.update(status='running', worker=worker, started_at=started_at)
+        return job
+
+    def update_job(self, job_id: str, **fields):
+        if not fields:
+            return
+        values = [json.dumps(value, default=str) if key in self.JSON_JOB_FIELDS else value
+                  for key, value in fields.items()]
+        assignments = ', '.join(f"{key} = ?" for key in fields)
+        with self.lock:
+            self.conn.execute(f'UPDATE jobs SET {assignments}, heartbeat_at = ? WHERE id = ?',
+                              [*values, time.time(), job_id])
+
+    def fail_stale_jobs(self, timeout: float) -> int:
+        """Fail running jobs whose worker stopped sending heartbeats (crashed or killed)"""
+        with self.lock:
+            return self.conn.execute(
+                "UPDATE jobs SET status = 'failed', error = 'Worker stopped responding', finished_at = ? "
+                "WHERE status = 'running' AND heartbeat_at < ?",
+                (datetime.now().isoformat(), time.time() - timeout)
+            ).rowcount
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self.lock:
+            row = self.conn.execute('SELECT * FROM jobs WHERE id = ?', (job_id,)).fetchone()
+        return self._job_from_row(row) if row else None
+
+    def list_jobs(self, status: str = None, limit: int = 200) -> List[Dict[str, Any]]:
+        sql = 'SELECT * FROM jobs'
+        params: List[Any] = []
+        if status:
+            sql += ' WHERE status = ?'
+            params.append(status)
+        with self.lock:
+            rows = self.conn.execute(f'{sql} ORDER BY created_at DESC LIMIT ?', [*params, limit]).fetchall()
+        return [self._job_from_row(row) for row in rows]
+
+    def prune_jobs(self, keep: int = 200):
+        with self.lock:
+            self.conn.execute(
+                "DELETE FROM jobs WHERE status NOT IN ('queued', 'running') AND id NOT IN "
+                "(SELECT id FROM jobs ORDER BY created_at DESC LIMIT ?)", (keep,)
+            )
+
+    # Leases
+
+    def acquire_lease(self, name: str, owner: str, ttl: float) -> bool:
+        """Take or renew a named lease; only one owner holds it until it expires unrenewed"""
+        now = time.time()
+        with self._transaction() as conn:
+            row = conn.execute('SELECT owner, expires_at FROM leases WHERE name = ?', (name,)).fetchone()
+            if row and row['owner'] != owner and row['expires_at'] > now:
+                return False
+            conn.execute(
+                'INSERT INTO leases VALUES (?, ?, ?) '
+                'ON CONFLICT (name) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at',
+                (name, owner, now + ttl)
+            )
+        return True
+
+    def release_lease(self, name: str, owner: str):
+        with self.lock:
+            self.conn.execute('DELETE FROM leases WHERE name = ? AND owner = ?', (name, owner))
+
+    # Events
+
+    def add_event(self, event_type: str, data: Dict[str, Any], timestamp: str):
+        with self.lock:
+            self.conn.execute('INSERT INTO events (type, data, timestamp) VALUES (?, ?, ?)',
+                              (event_type, json.dumps(data, default=str), timestamp))
+            self.event_writes += 1
+            if self.event_writes % 100 == 0:
+                self.conn.execute('DELETE FROM events WHERE id <= (SELECT MAX(id) FROM events) - ?',
+                                  (self.EVENT_RETENTION,))
+
+    def events_after(self, event_id: int, limit: int = 500) -> List[Dict[str, Any]]:
+        with self.lock:
+            rows = self.conn.execute('SELECT * FROM events WHERE id > ? ORDER BY id LIMIT ?',
+                                     (event_id, limit)).fetchall()
+        return [{'id': row['id'], 'type': row['type'], 'data': json.loads(row['data']),
+                 'timestamp': row['timestamp']} for row in rows]
+
+    def last_event_id(self) -> int:
+        with self.lock:
+            return self.conn.execute('SELECT COALESCE(MAX(id), 0) FROM events').fetchone()[0]
+
+
+_state_store = None
+_state_store_lock = threading.Lock()
+
+
+def get_state_store() -> StateStore:
+    """Return the process-wide handle on the shared state database"""
+    global _state_store
+    with _state_store_lock:
+        if _state_store is None:
+            _state_store = StateStore('data/state.db')
+        return _state_store
@@ -0,0 +1,65 @@
+"""Tests for the segment document store (run from backend/: python -m pytest storage)"""
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+from storage.document_store import SegmentStore
+
+
+class SmallCheckpointStore(SegmentStore):
+    CHECKPOINT_ITEMS = 3
+
+
+class SegmentStoreTests(unittest.TestCase):
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp(prefix='datasky-test-')
+        self.store = SmallCheckpointStore(self.data_dir, codec='gzip')
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir, ignore_errors=True)
+
+    def test_round_trip_and_pages(self):
+        items = [{'id': i} for i in range(10)]
+        self.store.write_stream('a.json', {'source': 'a', 'data': []}, {('data',): iter(items)})
+        self.store.write_stream('b.json', {'source': 'b', 'data': []}, {('data',): iter(items[:2])})
+
+        self.assertEqual(self.store.read('a.json'), {'source': 'a', 'data': items})
+        self.assertEqual(self.store.read('b.json'), {'source': 'b', 'data': items[:2]})
+        self.assertEqual(self.store.list_sections('a.json'), {'data': 10})
+        for offset in (0, 2, 3, 4, 9):
+            with self.subTest(offset=offset):
+                self.assertEqual(list(self.store.iter_section('a.json', 'data', offset, 4)), items[offset:offset + 4])
+        # Only the segments themselves and the manifest are left behind
+        self.assertFalse([name for name in os.listdir(self.store.segment_dir) if name.endswith('.tmp')])
+
+    def test_readers_are_not_blocked_by_a_slow_writer(self):
+        self.store.write_stream('a.json', {'data': []}, {('data',): iter([{'id': 1}])})
+        read_during_write = []
+
+        def slow_items():
+            yield {'id': 'first'}
+            # Another thread reads the store while this write is still producing items
+            reader = threading.Thread(target=lambda: read_during_write.append(self.store.read('a.json')))
+            reader.start()
+            reader.join(timeout=5)
+            yield {'id': 'last'}
+
+        self.store.write_stream('b.json', {'data': []}, {('data',): slow_items()})
+        self.assertEqual(read_during_write, [{'data': [{'id': 1}]}])
+        self.assertEqual(self.store.read('b.json'), {'data': [{'id': 'first'}, {'id': 'last'}]})
+
+    def test_failed_write_leaves_no_document(self):
+        def failing_items():
+            yield {'id': 1}
+            raise RuntimeError('source failed')
+
+        with self.assertRaises(RuntimeError):
+            self.store.write_stream('a.json', {'data': []}, {('data',): failing_items()})
+        self.assertFalse(self.store.exists('a.json'))
+        self.assertFalse([name for name in os.listdir(self.store.segment_dir) if name.endswith('.tmp')])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+"""Tests for the JSON section offset index (run from backend/: python -m pytest storage)"""
+import io
+import json
+import unittest
+from itertools import islice
+
+from storage.json_stream import index_json_arrays, iter_json_array, iter_json_chunks, split_sections
+
+CHECKPOINT_EVERY = 4
+
+
+def make_document(posts: int = 11, tweets: int = 9):
+    # Strings full of structural characters and escapes must not be mistaken for JSON syntax
+    return {
+        'metadata': {'source': 'test', 'tags': ['a', 'b'], 'note': 'brackets ] } [ { and "quotes", commas'},
+        'by_source': {
+            'reddit': {
+                'data': [{'id': f"p{i}", 'title': f"post {i} \"quoted\" \\ [x], {{y}}: é ✓",
+                          'comments': [{'body': f"c{j}"} for j in range(i % 3)]} for i in range(posts)],
+                'empty': []
+            },
+            'twitter': {'tweets': [{'id': str(i), 'text': f"tweet {i}\nline, two"} for i in range(tweets)]}
+        },
+        'numbers': [1, 2, 3],
+        'chronological': [{'n': i, 'nested': [[i], {'k': [i]}]} for i in range(CHECKPOINT_EVERY * 3)]
+    }
+
+
+def encodings(document):
+    """The same document serialised the ways result files are written"""
+    skeleton, sections = split_sections(document)
+    return {
+        'compact': json.dumps(document, separators=(',', ':'), ensure_ascii=False).encode('utf-8'),
+        'indent=2': json.dumps(document, indent=2, ensure_ascii=False).encode('utf-8'),
+        'ascii indent=2': json.dumps(document, indent=2).encode('utf-8'),
+        'streamed compact': ''.join(iter_json_chunks(skeleton, sections)).encode('utf-8'),
+        'streamed indent=2': ''.join(iter_json_chunks(skeleton, sections, indent=2)).encode('utf-8')
+    }
+
+
+class IndexJsonArraysTests(unittest.TestCase):
+    def setUp(self):
+        self.document = make_document()
+        self.expected = split_sections(self.document)[1]
+
+    def index(self, raw: bytes, chunk_size: int = 1 << 20):
+        return index_json_arrays(io.BytesIO(raw), CHECKPOINT_EVERY, chunk_size)
+
+    def read_slice(self, raw: bytes, info, offset: int, limit: int):
+        """Seek to the checkpoint at or before offset and decode from there, as JsonFileStore.iter_section does"""
+        start_index, start_offset = 0, 0
+        for index, byte_offset in info['checkpoints']:
+            if index > offset:
+                break
+            start_index, start_offset = index, byte_offset
+        fp = io.BytesIO(raw)
+        fp.seek(start_offset)
+        return list(islice(iter_json_array(fp, chunk_size=16), offset - start_index, offset - start_index + limit))
+
+    def test_sections_and_counts(self):
+        for name, raw in encodings(self.document).items():
+            with self.subTest(encoding=name):
+                index = self.index(raw)
+                # Empty lists and lists of scalars are not sections; nested lists inside items are not either
+                self.assertEqual(set(index), set(self.expected))
+                for path, items in self.expected.items():
+                    self.assertEqual(index[path]['count'], len(items))
+
+    def test_checkpoints_point_at_items(self):
+        for name, raw in encodings(self.document).items():
+            for path, items in self.expected.items():
+                with self.subTest(encoding=name, section=path):
+                    checkpoints = self.index(raw)[path]['checkpoints']
+                    self.assertEqual([index for index, _ in checkpoints],
+                                     list(range(0, len(items), CHECKPOINT_EVERY)))
+                    for index, byte_offset in checkpoints:
+                        self.assertEqual(raw[byte_offset:byte_offset + 1], b'{')
+                        fp = io.BytesIO(raw)
+                        fp.seek(byte_offset)
+                        self.assertEqual(next(iter_json_array(fp)), items[index])
+
+    def test_slices_around_checkpoint_boundaries(self):
+        for name, raw in encodings(self.document).items():
+            index = self.index(raw)
+            for path, items in self.expected.items():
+                for boundary in range(0, len(items) + 1, CHECKPOINT_EVERY):
+                    for offset in (boundary - 1, boundary, boundary + 1):
+                        if offset < 0:
+                            continue
+                        with self.subTest(encoding=name, section=path, offset=offset):
+                            self.assertEqual(self.read_slice(raw, index[path], offset, CHECKPOINT_EVERY + 1),
+                                             items[offset:offset + CHECKPOINT_EVERY + 1])
+
+    def test_index_does_not_depend_on_read_chunk_size(self):
+        # Tiny chunks split keys, strings, escapes and multi-byte characters across reads
+        for name, raw in encodings(self.document).items():
+            with self.subTest(encoding=name):
+                expected = self.index(raw)
+                for chunk_size in (1, 2, 3, 7, 64):
+                    self.assertEqual(self.index(raw, chunk_size), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+"""Scrape/analysis worker for PROCESS_ROLE=api deployments
+
+Run one or more next to the API process (``PROCESS_ROLE=api python app.py``):
+
+    python worker.py
+
+Workers claim queued jobs from data/state.db, publish their progress there
+for the API's /api/events stream, and one of them at a time (whichever
+holds the 'scheduler' lease) runs the schedule.
+"""
+import os
+import signal
+import socket
+import time
+from datetime import datetime
+
+from api.events import get_event_bus, persist_events
+from api.jobs import JobWorker, build_job_actions
+from api.metrics import get_metrics
+from analysis.ai_analyzer import AIAnalyzer
+from config.settings import settings
+from scrapers.registry import register_default_scrapers
+from scrapers.scraper_manager import ScraperManager
+from storage.state_store import get_state_store
+
+POLL_INTERVAL = 1.0
+SCHEDULER_LEASE_TTL = 30
+METRICS_INTERVAL = 10  # Seconds between metrics snapshots published for the API's /api/metrics
+
+
+def main():
+    os.makedirs('data', exist_ok=True)
+    os.makedirs('analysis', exist_ok=True)
+
+    store = get_state_store()
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    persist_events(get_event_bus(), store)
+
+    scraper_manager = ScraperManager(store, role='worker')
+    register_default_scrapers(scraper_manager)
+    ai_analyzer = AIAnalyzer()
+    if settings.analysis_warmup:
+        ai_analyzer.warm_up()
+    job_worker = JobWorker(store, get_event_bus(), build_job_actions(scraper_manager, ai_analyzer), worker_id,
+                           concurrency=settings.job_workers, heartbeat_timeout=settings.worker_heartbeat_timeout)
+
+    stopping = []
+    signal.signal(signal.SIGTERM, lambda signum, frame: stopping.append(signum))
+    print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Worker {worker_id} started")
+
+    metrics_published = 0.0
+    try:
+        while not stopping:
+            scraper_manager.sync_shared_state()
+
+            # Only the lease holder schedules, so a run is never started by two workers
+            leader = store.acquire_lease('scheduler', worker_id, SCHEDULER_LEASE_TTL)
+            wanted = leader and store.get('scheduler_enabled', False)
+            if wanted and not scraper_manager.is_running:
+                scraper_manager.start_scheduler()
+            elif not wanted and scraper_manager.is_running:
+                scraper_manager.stop_scheduler()
+
+            job_worker.poll()
+
+            if time.time() - metrics_published >= METRICS_INTERVAL:
+                store.set(f"metrics:{worker_id}", get_metrics().snapshot())
+                metrics_published = time.time()
+            time.sleep(POLL_INTERVAL)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Worker {worker_id} stopping, finishing running jobs")
+        if scraper_manager.is_running:
+            scraper_manager.stop_scheduler()
+        store.release_lease('scheduler', worker_id)
+        job_worker.shutdown()
+        store.set(f"metrics:{worker_id}", get_metrics().snapshot())
+
+
+if __name__ == '__main__':
+    main()
@@ -6,7 +6,8 @@ import Header from './components/Header';
 import ServerControl from './components/ServerControl';
 import Dashboard from './components/Dashboard';
 import SettingsModal from './components/SettingsModal';
-import { serverAPI } from './services/api';
+import { serverAPI, waitForJob } from './services/api';
+import { subscribeToEvents } from './services/events';
 
 function App() {
   const [isOnline, setIsOnline] = useState(false);
@@ -15,6 +16,7 @@ function App() {
   const [status, setStatus] = useState(null);
   const [notification, setNotification] = useState({ open: false, message: '', severity: 'info' });
   const [latestAnalysis, setLatestAnalysis] = useState(null);
+  const [progress, setProgress] = useState({ scrapers: {}, analysis: {} });
   
   const fetchStatus = async () => {
     try {
@@ -30,8 +32,73 @@ function App() {
   useEffect(() => {
     fetchStatus();
     
-    const interval = setInterval(fetchStatus, 5000);
-    return () => clearInterval(interval);
+    // Live updates come over the event stream; poll only while it is down
+    let pollInterval = null;
+    let refreshTimeout = null;
+    const startPolling = () => {
+      if (!pollInterval) pollInterval = setInterval(fetchStatus, 5000);
+    };
+    const stopPolling = () => {
+      clearInterval(pollInterval);
+      pollInterval = null;
+    };
+    // Bursts of changes collapse into one (conditional) status request
+    const scheduleRefresh = () => {
+      clearTimeout(refreshTimeout);
+      refreshTimeout = setTimeout(fetchStatus, 250);
+    };
+    
+    const handleEvent = (type, data) => {
+      switch (type) {
+        case 'status':
+          scheduleRefresh();
+          break;
+        case 'scraper_started':
+          setProgress(prev => ({ ...prev, scrapers: { ...prev.scrapers, [data.scraper]: { new_count: 0, skipped_count: 0 } } }));
+          break;
+        case 'scraper_progress':
+          setProgress(prev => ({ ...prev, scrapers: { ...prev.scrapers, [data.scraper]: { new_count: data.new_count, skipped_count: data.skipped_count } } }));
+          break;
+        case 'scraper_finished':
+          setProgress(prev => {
+            const scrapers = { ...prev.scrapers };
+            delete scrapers[data.result.scraper];
+            return { ...prev, scrapers };
+          });
+          break;
+        case 'analysis_started':
+          setProgress(prev => ({ ...prev, analysis: { ...prev.analysis, [data.filename]: 'load' } }));
+          break;
+        case 'analysis_stage':
+          setProgress(prev => ({ ...prev, analysis: { ...prev.analysis, [data.filename]: data.stage } }));
+          break;
+        case 'analysis_finished':
+        case 'analysis_failed':
+          setProgress(prev => {
+            const analysis = { ...prev.analysis };
+            delete analysis[data.filename];
+            return { ...prev, analysis };
+          });
+          break;
+        default:
+          break;
+      }
+    };
+    
+    const unsubscribe = subscribeToEvents(handleEvent, (connected) => {
+      if (connected) {
+        stopPolling();
+        fetchStatus();
+      } else {
+        startPolling();
+      }
+    });
+    
+    return () => {
+      unsubscribe();
+      stopPolling();
+      clearTimeout(refreshTimeout);
+    };
   }, []);
   
   const handleToggleServer = async () => {
@@ -57,6 +124,10 @@ function App() {
     setIsLoading(true);
     try {
       const response = await serverAPI.runNow();
+      const job = await waitForJob(response.data.job_id);
+      if (job.status === 'failed') {
+        throw new Error(job.error);
+      }
       setNotification({ open: true, message: 'Scraping completed', severity: 'success' });
       await fetchStatus();
     } catch (error) {
@@ -91,6 +162,7 @@ function App() {
             onToggle={handleToggleServer}
             onRunNow={handleRunNow}
             isLoading={isLoading}
+            schedule={status?.schedule}
           />
           
           <Dashboard 
@@ -98,6 +170,7 @@ function App() {
             onRefresh={fetchStatus} 
             onAnalysisComplete={handleAnalysisComplete}
             latestAnalysis={latestAnalysis}
+            progress={progress}
           />
         </Container>
         
@@ -4,13 +4,13 @@ import VisibilityOutlinedIcon from '@mui/icons-material/VisibilityOutlined';
 import DownloadOutlinedIcon from '@mui/icons-material/DownloadOutlined';
 import PsychologyIcon from '@mui/icons-material/Psychology';
 import StorageIcon from '@mui/icons-material/Storage';
-import api from '../services/api';
+import api, { waitForJob } from '../services/api';
 import ScraperCard from './ScraperCard';
 import ScraperConfigModal from './ScraperConfigModal';
 import ScraperIconDisplay from './ScraperIconDisplay';
 import AIInsights from './AIInsights';
 
-const Dashboard = ({ status, onRefresh, onAnalysisComplete, latestAnalysis }) => {
+const Dashboard = ({ status, onRefresh, onAnalysisComplete, latestAnalysis, progress }) => {
   const [configModalOpen, setConfigModalOpen] = useState(false);
   const [selectedScraper, setSelectedScraper] = useState(null);
   const [analyzingFiles, setAnalyzingFiles] = useState(new Set());
@@ -68,26 +68,25 @@ const Dashboard = ({ status, onRefresh, onAnalysisComplete, latestAnalysis }) =>
     setCurrentPage(value);
   };
   
-  // Check analysis status for current page items only (performance optimization)
+  // Check analysis status for current page items only, in one catalog request
   React.useEffect(() => {
     const checkAnalysisStatus = async () => {
-      if (!currentPageResults.length) return;
+      const filenames = currentPageResults
+        .filter(result => result.filename && (result.status === 'success' || result.status === 'partial_success'))
+        .map(result => result.filename)
+        .filter(filename => !analysisStatus.has(filename)); // Skip cached entries
+      if (!filenames.length) return;
       
       const newAnalysisStatus = new Map(analysisStatus); // Preserve existing cache
-      
-      for (const result of currentPageResults) {
-        if (result.filename && (result.status === 'success' || result.status === 'partial_success')) {
-          // Skip if already cached
-          if (newAnalysisStatus.has(result.filename)) continue;
-          
-          try {
-            const response = await api.get(`/analysis/status/${result.filename}`);
-            newAnalysisStatus.set(result.filename, response.data);
-          } catch (error) {
-            // If endpoint fails, assume no analysis exists
-            newAnalysisStatus.set(result.filename, { exists: false });
-          }
+      try {
+        const response = await api.get('/catalog', { params: { files: filenames.join(',') } });
+        for (const filename of filenames) {
+          const analysis = response.data.files[filename]?.analysis;
+          newAnalysisStatus.set(filename, analysis ? { exists: true, ...analysis } : { exists: false });
         }
+      } catch (error) {
+        // If endpoint fails, assume no analysis exists
+        filenames.forEach(filename => newAnalysisStatus.set(filename, { exists: false }));
       }
       
       setAnalysisStatus(newAnalysisStatus);
@@ -127,9 +126,11 @@ const Dashboard = ({ status, onRefresh, onAnalysisComplete, latestAnalysis }) =>
       // Get selected model from localStorage or use default
       const selectedModel = localStorage.getItem('data_sky_ai_model') || 'qwen2.5:14b';
       
-      const response = await api.post(`/analyze/${filename}`, {
+      const queued = await api.post(`/analyze/${filename}`, {
         model: selectedModel
       });
+      const job = await waitForJob(queued.data.job_id);
+      const response = { data: job.result || { success: false, error: job.error } };
       
       if (response.data.success) {
         // Update analysis status cache
@@ -190,6 +191,11 @@ const Dashboard = ({ status, onRefresh, onAnalysisComplete, latestAnalysis }) =>
                     }}
                     onRefresh={onRefresh}
                   />
+                  {progress?.scrapers?.[scraper.name] && (
+                    <Typography variant="caption" color="text.secondary" sx={{ display: 'block', mt: 0.5 }}>
+                      Running: {progress.scrapers[scraper.name].new_count} new, {progress.scrapers[scraper.name].skipped_count} already seen
+                    </Typography>
+                  )}
                 </Grid>
               ))}
             </Grid>
@@ -216,14 +222,16 @@ const Dashboard = ({ status, onRefresh, onAnalysisComplete, latestAnalysis }) =>
                     {getScraperIcon(result)}
                     <ListItemText 
                       primary={result.scraper}
-                      secondary={`${result.data_count || 0} items • ${formatTime(result.timestamp)}`}
+                      secondary={`${result.data_count || 0} items${result.skipped_count ? ` (${result.skipped_count} already seen)` : ''}${result.duration != null ? ` in ${result.duration.toFixed(1)}s` : ''} • ${formatTime(result.timestamp)}`}
                     />
                     
                     {/* Action buttons - show for successful and partial success scrapes */}
                     {(result.status === 'success' || result.status === 'partial_success') && result.filename && (
                       <Box sx={{ display: 'flex', gap: 0.5, mr: 1 }}>
                         <Tooltip title={
-                          analysisStatus.get(result.filename)?.exists 
+                          progress?.analysis?.[result.filename]
+                            ? `Analyzing (${progress.analysis[result.filename]})...`
+                            : analysisStatus.get(result.filename)?.exists 
                             ? "View AI Analysis (cached)" 
                             : "Analyze with AI"
                         }>
@@ -281,11 +289,15 @@ const Dashboard = ({ status, onRefresh, onAnalysisComplete, latestAnalysis }) =>
                     )}
                     
                     <Chip 
-                      label={result.status === 'partial_success' ? 'partial' : result.status} 
+                      label={
+                        result.status === 'partial_success' ? 'partial' :
+                        result.status === 'no_new_data' ? 'no new data' : result.status
+                      } 
                       size="small" 
                       color={
                         result.status === 'success' ? 'success' : 
-                        result.status === 'partial_success' ? 'warning' : 'error'
+                        result.status === 'partial_success' ? 'warning' :
+                        result.status === 'no_new_data' ? 'default' : 'error'
                       }
                       variant="outlined"
                     />
@@ -16,7 +16,7 @@ import PlayArrowIcon from '@mui/icons-material/PlayArrow';
 import RedditIcon from '@mui/icons-material/Reddit';
 import TwitterIcon from '@mui/icons-material/Twitter';
 import PublicIcon from '@mui/icons-material/Public';
-import { serverAPI } from '../services/api';
+import { serverAPI, waitForJob } from '../services/api';
 
 const ScraperCard = ({ scraper, onConfigClick, onRefresh }) => {
   const [enabled, setEnabled] = useState(scraper.enabled);
@@ -51,7 +51,8 @@ const ScraperCard = ({ scraper, onConfigClick, onRefresh }) => {
     setRunning(true);
     try {
       const response = await serverAPI.runScraper(scraper.name);
-      if (response.data.status === 'success') {
+      const job = await waitForJob(response.data.job_id);
+      if (job.result?.status === 'success') {
         onRefresh();
       }
     } catch (error) {
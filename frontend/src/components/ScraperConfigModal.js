@@ -66,7 +66,7 @@ const ScraperConfigModal = ({ open, onClose, scraperName, onSave }) => {
       onSave();
       onClose();
     } catch (error) {
-      setError('Failed to save configuration');
+      setError(error.response?.data?.error || 'Failed to save configuration');
       console.error('Failed to save config:', error);
     } finally {
       setLoading(false);
@@ -374,6 +374,18 @@ const ScraperConfigModal = ({ open, onClose, scraperName, onSave }) => {
           )}
         </Box>
         
+        <Box sx={{ mb: 2 }}>
+          <TextField
+            size="small"
+            label="Schedule"
+            placeholder="Default (0 12 * * *)"
+            helperText="Interval like 'every 15m' or a cron expression; empty uses the server default"
+            value={config.schedule || ''}
+            onChange={(e) => setConfig({ ...config, schedule: e.target.value })}
+            fullWidth
+          />
+        </Box>
+        
         <Box sx={{ display: 'flex', gap: 1, flexWrap: 'wrap' }}>
           {scraperName === 'reddit' ? (
             <>
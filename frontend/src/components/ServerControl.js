@@ -2,7 +2,13 @@ import React from 'react';
 import { Paper, Box, Typography, Switch, Button, CircularProgress } from '@mui/material';
 import PlayArrowIcon from '@mui/icons-material/PlayArrow';
 
-const ServerControl = ({ isRunning, onToggle, onRunNow, isLoading }) => {
+const ServerControl = ({ isRunning, onToggle, onRunNow, isLoading, schedule }) => {
+  // Earliest upcoming scheduled run across all jobs
+  const nextJob = (schedule || [])
+    .filter(job => job.next_run)
+    .sort((a, b) => new Date(a.next_run) - new Date(b.next_run))[0];
+  
+
   return (
     <Paper sx={{ p: 3, mb: 3 }}>
       <Box sx={{ display: 'flex', alignItems: 'center', justifyContent: 'space-between', mb: 2 }}>
@@ -45,7 +51,11 @@ const ServerControl = ({ isRunning, onToggle, onRunNow, isLoading }) => {
         </Button>
         
         <Typography variant="body2" color="text.secondary" sx={{ display: 'flex', alignItems: 'center' }}>
-          {isRunning ? 'Automatic scraping scheduled daily at 12:00 PM' : 'Automatic scraping disabled'}
+          {!isRunning
+            ? 'Automatic scraping disabled'
+            : nextJob
+              ? `Next scheduled run: ${nextJob.name === 'default' ? 'all scrapers' : nextJob.name} at ${new Date(nextJob.next_run).toLocaleString()}`
+              : 'Automatic scraping enabled'}
         </Typography>
       </Box>
     </Paper>
@@ -1,12 +1,58 @@
 import axios from 'axios';
 
-const API_BASE_URL = 'http://localhost:8937/api';
+export const API_BASE_URL = 'http://localhost:8937/api';
 
 const api = axios.create({
   baseURL: API_BASE_URL,
   headers: {
     'Content-Type': 'application/json',
   },
+  // 304 means "use the copy you already have"
+  validateStatus: (status) => (status >= 200 && status < 300) || status === 304,
+});
+
+// Last ETag and body per GET url, so polling sends conditional requests
+const etagCache = new Map();
+const ETAG_CACHE_LIMIT = 200;
+
+const cacheKey = (config) => `${config.url}?${new URLSearchParams(config.params || {}).toString()}`;
+
+api.interceptors.request.use((config) => {
+  if ((config.method || 'get').toLowerCase() === 'get') {
+    const cached = etagCache.get(cacheKey(config));
+    if (cached) {
+      config.headers['If-None-Match'] = cached.etag;
+    }
+  }
+  return config;
+});
+
+api.interceptors.response.use((response) => {
+  const { config } = response;
+  if ((config.method || 'get').toLowerCase() !== 'get') {
+    return response;
+  }
+
+  const key = cacheKey(config);
+  if (response.status === 304) {
+    const cached = etagCache.get(key);
+    if (cached) {
+      return { ...response, status: 200, data: cached.data, notModified: true };
+    }
+    // Nothing cached to reuse (evicted meanwhile): ask again unconditionally
+    delete config.headers['If-None-Match'];
+    return api.request({ ...config, headers: { ...config.headers, 'Cache-Control': 'no-cache' } });
+  }
+
+  const etag = response.headers.etag;
+  if (etag) {
+    etagCache.delete(key);
+    etagCache.set(key, { etag, data: response.data });
+    if (etagCache.size > ETAG_CACHE_LIMIT) {
+      etagCache.delete(etagCache.keys().next().value);
+    }
+  }
+  return response;
 });
 
 export const serverAPI = {
@@ -23,6 +69,22 @@ export const serverAPI = {
   runScraper: (name) => api.post(`/scrapers/${name}/run`),
   toggleScraper: (name, enabled) => api.post(`/scrapers/${name}/toggle`, { enabled }),
   getScraperStats: (name) => api.get(`/scrapers/${name}/stats`),
+  
+  // Background jobs
+  getJob: (id) => api.get(`/jobs/${id}`),
+};
+
+// Long-running requests (run-now, scraper runs, analyses) answer 202 with a job id;
+// poll the job until it finishes and resolve with the finished job
+export const waitForJob = async (jobId, intervalMs = 1000) => {
+  for (;;) {
+    const response = await serverAPI.getJob(jobId);
+    const job = response.data;
+    if (job.status === 'succeeded' || job.status === 'failed') {
+      return job;
+    }
+    await new Promise(resolve => setTimeout(resolve, intervalMs));
+  }
 };
 
 export default api;
\ No newline at end of file
@@ -0,0 +1,40 @@
+import { API_BASE_URL } from './api';
+
+const EVENT_TYPES = [
+  'status',
+  'run_started',
+  'run_finished',
+  'scraper_started',
+  'scraper_progress',
+  'scraper_finished',
+  'file_written',
+  'analysis_started',
+  'analysis_stage',
+  'analysis_finished',
+  'analysis_failed',
+];
+
+// Subscribe to /api/events. onConnectionChange(true|false) reports whether the stream is live;
+// EventSource reconnects on its own (resuming from the last event id) after a drop.
+export const subscribeToEvents = (onEvent, onConnectionChange) => {
+  if (typeof EventSource === 'undefined') {
+    onConnectionChange(false);
+    return () => {};
+  }
+
+  const source = new EventSource(`${API_BASE_URL}/events`);
+  source.onopen = () => onConnectionChange(true);
+  source.onerror = () => onConnectionChange(false);
+
+  EVENT_TYPES.forEach((type) => {
+    source.addEventListener(type, (event) => {
+      try {
+        onEvent(type, JSON.parse(event.data));
+      } catch (error) {
+        console.error('Malformed server event:', error);
+      }
+    });
+  });
+
+  return () => source.close();
+};